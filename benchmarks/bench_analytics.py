@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark local aggregation over the analytics column tables.
+
+Papers and meetings generated by ``mock_oparl.py`` are loaded into an
+``AnalyticsEngine`` and aggregated with a few typical queries. For each
+query the benchmark reports the median time and the JSON size of its
+result, next to the size of the objects a client would otherwise have to
+read to compute the same answer.
+
+Usage:
+    python benchmarks/bench_analytics.py --papers 50000 --meetings 5000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mock_oparl import Dataset, MockOParlAPI
+
+from oparl_mcp.analytics import AnalyticsEngine
+from oparl_mcp.codec import dumps
+
+
+def time_call(fn: Callable[[], Any], runs: int) -> float:
+    """Get the median duration of a call in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=50000)
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    api = MockOParlAPI("https://oparl.example.org", Dataset())
+    papers = [api.generate("Paper", f"1-{n}", "1") for n in range(args.papers)]
+    meetings = [api.generate("Meeting", f"1-{n}", "1") for n in range(args.meetings)]
+    raw_bytes = {
+        "Paper": sum(len(dumps(obj)) for obj in papers),
+        "Meeting": sum(len(dumps(obj)) for obj in meetings),
+    }
+
+    engine = AnalyticsEngine()
+    start = time.perf_counter()
+    engine.add_many(papers)
+    engine.add_many(meetings)
+    load_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    queries: Dict[str, Dict[str, Any]] = {
+        "papers_per_month": {"object_type": "Paper", "bucket": "month"},
+        "papers_per_body_and_year": {
+            "object_type": "Paper",
+            "group_by": ["body"],
+            "bucket": "year",
+        },
+        "meetings_per_organization": {
+            "object_type": "Meeting",
+            "group_by": ["organization"],
+        },
+        "meetings_per_week_2023": {
+            "object_type": "Meeting",
+            "bucket": "week",
+            "start_date": "2023-01-01",
+            "end_date": "2023-12-31",
+            "order": "key",
+        },
+    }
+
+    results = {}
+    for name, query in queries.items():
+        result = engine.aggregate(**query)
+        results[name] = {
+            "aggregate_ms": time_call(lambda: engine.aggregate(**query), args.runs),
+            "groups": result["total_groups"],
+            "result_bytes": len(json.dumps(result)),
+            "objects_bytes": raw_bytes[query["object_type"]],
+        }
+
+    print(
+        json.dumps(
+            {
+                "papers": args.papers,
+                "meetings": args.meetings,
+                "load_ms": load_ms,
+                "queries": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark of MCP calls against a local mock OParl API.
+
+Starts the stand-in API from ``mock_oparl.py`` and drives a fresh
+``OParlMCPServer`` per scenario through an in-memory MCP client session:
+
+* ``resource``: reads of a fixed resource (``resource://getSystem``)
+* ``template``: reads of templated resources (``resource://getPaper/{id}``)
+  spread over the dataset
+* ``pagination``: full collection walks with the ``fetch_collection`` tool
+
+Results are printed as JSON and can be saved and compared between runs.
+
+Usage:
+    python benchmarks/bench_e2e.py --requests 500 --concurrency 20
+    python benchmarks/bench_e2e.py --output base.json
+    python benchmarks/bench_e2e.py --compare base.json --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fastmcp import Client
+from mock_oparl import Dataset, start_server
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.server import OParlMCPServer
+
+SCENARIOS = ("resource", "template", "pagination")
+
+Call = Callable[[Client, int], Awaitable[Any]]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Get a nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def current_rss_mb() -> float:
+    """Get the resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        # Peak instead of current RSS where /proc is unavailable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def scenario_call(name: str, dataset: Dataset) -> Call:
+    """Build the MCP call issued by a scenario."""
+    rng = random.Random(42)
+
+    async def read_system(client: Client, _: int) -> Any:
+        return await client.read_resource("resource://getSystem")
+
+    async def read_paper(client: Client, _: int) -> Any:
+        body = rng.randint(1, dataset.bodies)
+        paper = rng.randint(1, dataset.papers)
+        return await client.read_resource(f"resource://getPaper/{body}-{paper}")
+
+    async def walk_papers(client: Client, n: int) -> Any:
+        result = await client.call_tool(
+            "fetch_collection",
+            {
+                "path": f"/body/{n % dataset.bodies + 1}/paper",
+                "max_items": dataset.papers,
+                "max_bytes": 2**31,
+            },
+        )
+        if result.data["count"] != dataset.papers:
+            raise RuntimeError(f"Incomplete walk: {result.data['count']} items")
+        return result
+
+    return {
+        "resource": read_system,
+        "template": read_paper,
+        "pagination": walk_papers,
+    }[name]
+
+
+async def run_scenario(
+    name: str,
+    config: OParlConfig,
+    dataset: Dataset,
+    requests: int,
+    concurrency: int,
+    trace_memory: bool,
+    upstream: Any,
+) -> Dict[str, Any]:
+    """Run one scenario against a fresh server.
+
+    Returns:
+        Latency percentiles, throughput and memory figures.
+    """
+    server = OParlMCPServer(config)
+    call = scenario_call(name, dataset)
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+    upstream_before = upstream.requests
+
+    if trace_memory:
+        tracemalloc.start()
+
+    async with Client(server.mcp) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            for n in counter:
+                start = time.perf_counter()
+                try:
+                    await call(client, n)
+                except Exception as e:
+                    errors += 1
+                    logging.getLogger(__name__).warning(f"{name} call failed: {e}")
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    result: Dict[str, Any] = {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "upstream_requests": upstream.requests - upstream_before,
+        "rss_mb": round(current_rss_mb(), 1),
+    }
+    latencies.sort()
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        result[f"{label}_ms"] = round(percentile(latencies, fraction) * 1000, 2)
+
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["heap_peak_mb"] = round(peak / 2**20, 1)
+
+    return result
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare scenario results with a baseline run.
+
+    Returns:
+        Ratio current/baseline per metric; above 1 means slower for latency
+        and faster for throughput.
+    """
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        comparison[name] = {
+            metric: round(current[metric] / previous[metric], 3)
+            for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+            if previous.get(metric)
+        }
+    return comparison
+
+
+def git_revision() -> Optional[str]:
+    """Get the current git commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--walks", type=int, default=5, help="Pagination runs")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--bodies", type=int, default=2)
+    parser.add_argument("--papers", type=int, default=1000)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--output", type=Path, help="Write results to a file")
+    parser.add_argument("--compare", type=Path, help="Baseline results file")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    logging.disable(logging.INFO)
+
+    dataset = Dataset(bodies=args.bodies, papers=args.papers)
+    base_url, upstream = start_server(dataset, args.latency, args.page_size)
+    config = OParlConfig(base_url=base_url, cache_enabled=not args.no_cache)
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        requests = args.walks if name == "pagination" else args.requests
+        results[name] = asyncio.run(
+            run_scenario(
+                name,
+                config,
+                dataset,
+                requests,
+                min(args.concurrency, requests),
+                args.trace_memory,
+                upstream,
+            )
+        )
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "parameters": {
+                key: str(value) if isinstance(value, Path) else value
+                for key, value in vars(args).items()
+            },
+        },
+        "results": results,
+    }
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        report["comparison"] = compare(results, baseline)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Benchmark memory and traversal speed of the reference graph.
+
+Objects generated by ``mock_oparl.py`` from the bundled specification, with
+two consultations embedded in each paper as OParl servers serve them, are
+held once as decoded JSON dictionaries and once in an ``EntityGraph``. The
+benchmark reports the memory of both, measured with ``tracemalloc``, and
+the median time of a few traversals.
+
+Usage:
+    python benchmarks/bench_graph.py --papers 20000 --meetings 2000
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mock_oparl import OPARL_TYPE, Dataset, MockOParlAPI
+
+from oparl_mcp.codec import dumps, loads
+from oparl_mcp.graph import EntityGraph
+from oparl_mcp.schema import OParlSchema
+
+BASE_URL = "https://oparl.example.org"
+SPEC_PATH = Path(__file__).parent.parent / "oparl_openapi.json"
+
+
+def time_call(fn: Callable[[], Any], runs: int) -> float:
+    """Get the median duration of a call in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def generate(args: argparse.Namespace) -> List[bytes]:
+    """Generate the objects, encoded as JSON."""
+    dataset = Dataset(organizations=args.organizations, meetings=args.meetings)
+    api = MockOParlAPI(BASE_URL, dataset)
+    counts = {
+        "Organization": args.organizations,
+        "Person": args.persons,
+        "Meeting": args.meetings,
+        "Paper": args.papers,
+    }
+    meetings = max(args.meetings, 1)
+    encoded = []
+    for schema_name, count in counts.items():
+        for n in range(count):
+            obj = api.generate(schema_name, f"1-{n}", "1")
+            if schema_name == "Paper":
+                obj["consultation"] = [
+                    {
+                        "id": f"{BASE_URL}/consultation/1-{n}-{i}",
+                        "type": OPARL_TYPE.format("Consultation"),
+                        "meeting": f"{BASE_URL}/meeting/1-{(n + i) % meetings}",
+                        "role": "Vorberatung" if i else "Entscheidung",
+                    }
+                    for i in range(2)
+                ]
+            encoded.append(dumps(obj))
+    return encoded
+
+
+def traced(build: Callable[[], Any]) -> int:
+    """Get the memory in bytes retained by the result of a call."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=20000)
+    parser.add_argument("--meetings", type=int, default=2000)
+    parser.add_argument("--persons", type=int, default=500)
+    parser.add_argument("--organizations", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    encoded = generate(args)
+    schema = OParlSchema.from_spec(json.loads(SPEC_PATH.read_text(encoding="utf-8")))
+
+    def build_dicts() -> List[Dict[str, Any]]:
+        return [loads(data) for data in encoded]
+
+    def build_graph() -> EntityGraph:
+        graph = EntityGraph(schema)
+        for data in encoded:
+            graph.add(loads(data))
+        return graph
+
+    dict_bytes = traced(build_dicts)
+    graph_bytes = traced(build_graph)
+
+    graph = build_graph()
+    organization = [f"{BASE_URL}/organization/1-1"]
+    queries: Dict[str, List[str]] = {
+        "meetings_of_organization": ["<-Meeting.organization"],
+        "papers_consulted_in_meetings_of_organization": [
+            "<-Meeting.organization",
+            "<-Consultation.meeting",
+            "paper",
+        ],
+        "originators_of_papers_of_organization": [
+            "<-Paper.originatorOrganization",
+            "originatorPerson",
+        ],
+    }
+
+    results = {}
+    for name, path in queries.items():
+        results[name] = {
+            "traverse_ms": time_call(
+                lambda: graph.traverse(organization, path), args.runs
+            ),
+            "objects": len(graph.traverse(organization, path)),
+        }
+
+    print(
+        json.dumps(
+            {
+                "objects": len(graph),
+                "nodes": graph.node_count,
+                "dict_bytes": dict_bytes,
+                "graph_bytes": graph_bytes,
+                "reduction": round(dict_bytes / graph_bytes, 2),
+                "queries": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark upstream throughput for different connection pool settings.
+
+Simulates concurrent MCP sessions, each issuing sequential reads through the
+HTTP client built by ``OParlMCPServer``. By default a local stand-in API is
+started; pass ``--url`` to measure against a real OParl server (HTTP/2 only
+makes a difference there, since the local server speaks HTTP/1.1).
+
+Usage:
+    python benchmarks/bench_http_pool.py --sessions 50 --requests 20
+    python benchmarks/bench_http_pool.py --url https://oparl.example.org --http2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mock_oparl import start_server
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.server import OParlMCPServer
+
+POOL_PROFILES: Dict[str, Dict[str, Any]] = {
+    "small-pool": {"max_connections": 10, "max_keepalive_connections": 2},
+    "default": {},
+    "tuned": {
+        "max_connections": 200,
+        "max_keepalive_connections": 200,
+        "keepalive_expiry": 30.0,
+    },
+}
+
+
+async def run_profile(
+    base_url: str, overrides: Dict[str, Any], sessions: int, requests: int
+) -> Dict[str, Any]:
+    """Run the load for one pool profile.
+
+    Returns:
+        Throughput and latency figures for the profile.
+    """
+    config = OParlConfig(
+        base_url=base_url, cache_enabled=False, coalesce_requests=False, **overrides
+    )
+    client = OParlMCPServer(config)._create_http_client()
+    latencies: List[float] = []
+
+    async def session() -> None:
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get("/system")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Benchmark a real OParl server")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--http2", action="store_true", help="Add HTTP/2 profile")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    base_url = args.url or start_server(latency=args.latency)[0]
+    profiles = dict(POOL_PROFILES)
+    if args.http2:
+        profiles["tuned-http2"] = {**POOL_PROFILES["tuned"], "http2": True}
+
+    results = {
+        name: asyncio.run(
+            run_profile(base_url, overrides, args.sessions, args.requests)
+        )
+        for name, overrides in profiles.items()
+    }
+    print(json.dumps({"base_url": base_url, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
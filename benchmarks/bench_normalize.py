@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of OParl response normalization.
+
+Compares ``format_oparl_response`` with the implementation it replaced on
+a collection page and a single object generated by ``mock_oparl.py``. The
+previous implementation only handled top-level fields, so it is applied to
+every item of the page; it also modified its input, so it is given a fresh
+copy of the data for every call and the time of the copy is subtracted.
+
+Usage:
+    python benchmarks/bench_normalize.py --items 1000 --runs 50
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mock_oparl import Dataset, MockOParlAPI
+
+from oparl_mcp.utils import format_oparl_response
+
+
+def legacy_format_oparl_response(data: Any) -> Any:
+    """Previous implementation: top-level fields only, mutates its input."""
+    if isinstance(data, dict):
+        if "_meta" not in data:
+            data["_meta"] = {
+                "oparl_version": "1.1",
+                "formatted_at": datetime.now().isoformat(),
+                "source": "oparl-mcp-server",
+            }
+        for key, value in data.items():
+            if isinstance(value, str) and key.endswith(
+                ("Date", "Time", "created", "modified")
+            ):
+                try:
+                    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+                    data[key] = parsed.isoformat()
+                except (ValueError, AttributeError):
+                    pass
+    return data
+
+
+def time_call(fn: Callable[[], Any], runs: int) -> float:
+    """Get the median duration of a call in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000, help="Items per page")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    api = MockOParlAPI("https://oparl.example.org", Dataset(papers=args.items))
+    inputs: Dict[str, Any] = {
+        "paper_page": api.list_objects(
+            "/body/1/paper", "Paper", {"bodyId": "1"}, {"limit": str(args.items)}
+        ),
+        "meeting": api.generate("Meeting", "1-1", "1"),
+    }
+
+    results = {}
+    for name, data in inputs.items():
+        copy_ms = time_call(lambda: copy.deepcopy(data), args.runs)
+
+        def legacy() -> None:
+            fresh = copy.deepcopy(data)
+            # Applied per item, since it ignores nested objects
+            for item in fresh.get("data", [fresh]):
+                legacy_format_oparl_response(item)
+
+        results[name] = {
+            "legacy_ms": round(time_call(legacy, args.runs) - copy_ms, 3),
+            "current_ms": time_call(lambda: format_oparl_response(data), args.runs),
+        }
+        results[name]["speedup"] = round(
+            results[name]["legacy_ms"] / results[name]["current_ms"], 2
+        )
+
+    print(json.dumps({"items": args.items, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark the payload size of the projection profiles per object type.
+
+Objects are generated with the mock OParl API from ``mock_oparl.py`` and
+projected with each profile. For every type the benchmark reports the JSON
+size, an estimate of the LLM tokens, and the time to project and serialize
+an object, together with the savings relative to the full objects.
+
+Tokens are counted with ``tiktoken`` (``cl100k_base``) when it is installed
+and estimated as a quarter of the bytes otherwise.
+
+Usage:
+    python benchmarks/bench_projection.py --objects 200
+    python benchmarks/bench_projection.py --array-items 20 --max-items 5
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mock_oparl import Dataset, MockOParlAPI
+
+from oparl_mcp.projection import PROFILES, project
+
+TYPES = ("Body", "Organization", "Person", "Meeting", "AgendaItem", "Paper")
+
+
+def token_counter() -> Callable[[str], int]:
+    """Get a function counting the tokens of a text."""
+    try:
+        import tiktoken
+    except ImportError:
+        return lambda text: len(text.encode("utf-8")) // 4
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text))
+
+
+def generate(api: MockOParlAPI, schema_name: str, count: int) -> List[Dict[str, Any]]:
+    """Generate objects of a type."""
+    if schema_name == "Body":
+        return [api.generate("Body", str(n), str(n)) for n in range(1, count + 1)]
+    if schema_name == "AgendaItem":
+        return [api.generate(schema_name, f"1-1.{n}", "1") for n in range(count)]
+    return [api.generate(schema_name, f"1-{n}", "1") for n in range(1, count + 1)]
+
+
+def measure(
+    objects: List[Dict[str, Any]],
+    profile: str,
+    max_items: int,
+    count_tokens: Callable[[str], int],
+) -> Dict[str, float]:
+    """Measure the projected size of objects.
+
+    Returns:
+        Mean bytes, tokens and microseconds per object.
+    """
+    start = time.perf_counter()
+    texts = [json.dumps(project(obj, profile, max_items=max_items)) for obj in objects]
+    elapsed = time.perf_counter() - start
+    return {
+        "bytes": round(sum(len(text.encode("utf-8")) for text in texts) / len(texts)),
+        "tokens": round(sum(count_tokens(text) for text in texts) / len(texts)),
+        "us_per_object": round(elapsed / len(objects) * 1e6, 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100, help="Objects per type")
+    parser.add_argument("--array-items", type=int, default=10)
+    parser.add_argument("--max-items", type=int, default=5)
+    args = parser.parse_args()
+
+    api = MockOParlAPI(
+        "https://oparl.example.org",
+        Dataset(bodies=args.objects, array_items=args.array_items),
+    )
+    count_tokens = token_counter()
+
+    results: Dict[str, Any] = {}
+    for schema_name in TYPES:
+        objects = generate(api, schema_name, args.objects)
+        sizes = {
+            profile: measure(objects, profile, args.max_items, count_tokens)
+            for profile in PROFILES
+        }
+        full = sizes["full"]
+        for profile, size in sizes.items():
+            size["bytes_saved"] = round(1 - size["bytes"] / full["bytes"], 3)
+            size["tokens_saved"] = round(1 - size["tokens"] / full["tokens"], 3)
+        results[schema_name] = sizes
+
+    print(
+        json.dumps(
+            {
+                "objects": args.objects,
+                "array_items": args.array_items,
+                "max_items": args.max_items,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark server cold start up to the first tool listing.
+
+Every run starts a fresh interpreter, imports the server, builds it from the
+OpenAPI specification and lists its tools over an in-memory MCP session,
+which is what a client waits for after a scaled-to-zero server is started.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --systems 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SRC = Path(__file__).parent.parent / "src"
+
+CHILD = """
+import time
+start = time.perf_counter()
+
+import asyncio
+import json
+import logging
+import warnings
+
+warnings.simplefilter("ignore")
+logging.disable(logging.INFO)
+
+from fastmcp import Client
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.server import OParlMCPServer
+
+imported = time.perf_counter()
+systems = {f"system{i}": f"https://oparl{i}.example.org" for i in range(SYSTEMS)}
+server = OParlMCPServer(OParlConfig(systems=systems))
+constructed = time.perf_counter()
+
+
+async def list_tools():
+    async with Client(server.mcp) as client:
+        return await client.list_tools()
+
+
+tools = asyncio.run(list_tools())
+listed = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "construct": constructed - imported,
+    "first_listing": listed - constructed,
+    "tools": len(tools),
+}))
+"""
+
+
+def run_once(systems: int) -> Dict[str, float]:
+    """Start one server process and time its phases.
+
+    Returns:
+        Seconds per phase, including interpreter start-up in ``total``.
+    """
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.replace("SYSTEMS", str(systems))],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    ).stdout
+    phases = json.loads(output.strip().splitlines()[-1])
+    phases["total"] = time.perf_counter() - start
+    return phases
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize timings in milliseconds."""
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--systems", type=int, default=0, help="Federated systems")
+    args = parser.parse_args()
+
+    runs = [run_once(args.systems) for _ in range(args.runs)]
+    results = {
+        phase: summarize([run[phase] for run in runs])
+        for phase in ("import", "construct", "first_listing", "total")
+    }
+    print(
+        json.dumps(
+            {
+                "runs": args.runs,
+                "systems": args.systems,
+                "tools": runs[0]["tools"],
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
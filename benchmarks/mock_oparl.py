@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""Local stand-in OParl API generated from ``oparl_openapi.json``.
+
+Routes and object fields are derived from the OpenAPI specification, so the
+mock follows the spec as it changes. Objects are generated deterministically
+on request, which keeps memory flat for large datasets.
+
+Usage:
+    python benchmarks/mock_oparl.py --port 8080 --papers 5000 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+SPEC_PATH = Path(__file__).parent.parent / "oparl_openapi.json"
+
+OPARL_TYPE = "https://schema.oparl.org/1.1/{}"
+
+# Targets of reference fields whose name does not match an endpoint.
+REFERENCE_TARGETS = {
+    "member": "person",
+    "participant": "person",
+    "originatorPerson": "person",
+    "underDirectionOf": "person",
+    "affiliation": "organization",
+    "originatorOrganization": "organization",
+    "relatedPaper": "paper",
+    "superordinatePaper": "paper",
+    "subordinatePaper": "paper",
+}
+
+_WORDS = (
+    "Haushalt Verkehr Schule Radweg Klimaschutz Bebauungsplan Kita Sanierung "
+    "Antrag Anfrage Spielplatz Wohnungsbau Digitalisierung Friedhof Feuerwehr"
+).split()
+
+_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Dataset:
+    """Size of the generated dataset, per body."""
+
+    bodies: int = 2
+    organizations: int = 20
+    persons: int = 100
+    meetings: int = 200
+    papers: int = 1000
+    agenda_items: int = 10
+    array_items: int = 2
+
+    def count(self, collection: str) -> int:
+        """Get the number of objects of a collection."""
+        return {
+            "body": self.bodies,
+            "organization": self.organizations,
+            "person": self.persons,
+            "meeting": self.meetings,
+            "paper": self.papers,
+            "agendaItem": self.agenda_items,
+        }[collection]
+
+
+class MockOParlAPI:
+    """ASGI application serving generated OParl objects."""
+
+    def __init__(
+        self,
+        base_url: str,
+        dataset: Optional[Dataset] = None,
+        latency: float = 0.0,
+        page_size: int = 100,
+        spec_path: Path = SPEC_PATH,
+    ):
+        """Build the routes from the OpenAPI specification.
+
+        Args:
+            base_url: Public base URL used in object IDs and links.
+            dataset: Dataset size. If None, uses the defaults.
+            latency: Artificial latency per request in seconds.
+            page_size: Page size used when the client sends no ``limit``.
+            spec_path: OpenAPI specification to serve.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.dataset = dataset or Dataset()
+        self.latency = latency
+        self.page_size = page_size
+        self.requests = 0
+
+        spec = json.loads(spec_path.read_text(encoding="utf-8"))
+        self.schemas: Dict[str, Dict[str, Any]] = spec["components"]["schemas"]
+        self.routes: List[Tuple[re.Pattern, str, bool]] = []
+        for path, operations in spec["paths"].items():
+            schema = operations["get"]["responses"]["200"]["content"][
+                "application/json"
+            ]["schema"]
+            is_list = "$ref" not in schema
+            item = schema["properties"]["data"]["items"] if is_list else schema
+            name = item["$ref"].rsplit("/", 1)[-1]
+            pattern = re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path)
+            self.routes.append((re.compile(f"^{pattern}/?$"), name, is_list))
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            return
+
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        query = dict(parse_qsl(scope["query_string"].decode()))
+        status, body = self.handle(scope["path"], query)
+        payload = json.dumps(body).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+    def handle(self, path: str, query: Dict[str, str]) -> Tuple[int, Any]:
+        """Resolve a request path to a response.
+
+        Returns:
+            Status code and JSON body.
+        """
+        for pattern, schema_name, is_list in self.routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            params = match.groupdict()
+            if is_list:
+                return 200, self.list_objects(path, schema_name, params, query)
+            obj = self.get_object(schema_name, params)
+            if obj is None:
+                return 404, {"error": "Not found"}
+            return 200, obj
+        return 404, {"error": "Not found"}
+
+    def get_object(
+        self, schema_name: str, params: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single object by its path parameters."""
+        if schema_name == "System":
+            return self.generate("System", "", None)
+
+        object_id = next(iter(params.values()))
+        collection = schema_name[0].lower() + schema_name[1:]
+        body_id, _, index = object_id.partition("-")
+        if schema_name == "Body":
+            body_id, index = object_id, object_id
+        try:
+            number = int(index)
+            body_number = int(body_id)
+        except ValueError:
+            return None
+        if not 1 <= body_number <= self.dataset.bodies:
+            return None
+        if not 1 <= number <= self.dataset.count(collection):
+            return None
+        return self.generate(schema_name, object_id, body_id)
+
+    def list_objects(
+        self,
+        path: str,
+        schema_name: str,
+        params: Dict[str, str],
+        query: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """Get a page of a collection."""
+        collection = schema_name[0].lower() + schema_name[1:]
+        if "bodyId" in params:
+            body_id = params["bodyId"]
+            ids = [
+                f"{body_id}-{i}" for i in range(1, self.dataset.count(collection) + 1)
+            ]
+        elif "meetingId" in params:
+            body_id = params["meetingId"].partition("-")[0]
+            ids = [
+                f"{params['meetingId']}.{i}"
+                for i in range(1, self.dataset.agenda_items + 1)
+            ]
+        else:
+            body_id = None
+            ids = [str(i) for i in range(1, self.dataset.bodies + 1)]
+
+        limit = min(int(query.get("limit", self.page_size)), 1000)
+        offset = int(query.get("offset", 0))
+
+        if any(query.get(name) for name in ("search", "start", "end")):
+            items = [
+                obj
+                for obj in (self.generate(schema_name, i, body_id) for i in ids)
+                if _matches(obj, query)
+            ]
+            total = len(items)
+            page = items[offset : offset + limit]
+        else:
+            # Only generate the requested page
+            total = len(ids)
+            page = [
+                self.generate(schema_name, object_id, body_id)
+                for object_id in ids[offset : offset + limit]
+            ]
+        has_next = offset + limit < total
+
+        result: Dict[str, Any] = {
+            "data": page,
+            "pagination": {
+                "totalElements": total,
+                "totalPages": -(-total // limit),
+                "currentPage": offset // limit + 1,
+                "pageSize": limit,
+                "hasNext": has_next,
+                "hasPrevious": offset > 0,
+            },
+        }
+        if has_next:
+            next_query = dict(query, limit=str(limit), offset=str(offset + limit))
+            result["links"] = {"next": f"{self.base_url}{path}?{urlencode(next_query)}"}
+        return result
+
+    def generate(
+        self, schema_name: str, object_id: str, body_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Generate an object from its schema.
+
+        Args:
+            schema_name: Name of the component schema.
+            object_id: Identifier of the object.
+            body_id: Identifier of the owning body.
+
+        Returns:
+            Object with every property of the schema filled in.
+        """
+        seed = sum(ord(c) * (i + 1) for i, c in enumerate(f"{schema_name}{object_id}"))
+        collection = schema_name[0].lower() + schema_name[1:]
+        obj: Dict[str, Any] = {}
+
+        for field, prop in self.schemas[schema_name]["properties"].items():
+            if field == "id":
+                obj["id"] = self._object_url(collection, object_id)
+            elif field == "type":
+                obj["type"] = OPARL_TYPE.format(schema_name)
+            elif prop.get("type") == "array":
+                items = prop.get("items", {})
+                obj[field] = [
+                    self._value(field, items, seed + n, object_id, body_id)
+                    for n in range(self.dataset.array_items)
+                ]
+            else:
+                obj[field] = self._value(field, prop, seed, object_id, body_id)
+
+        if schema_name == "Meeting":
+            obj["end"] = _timestamp(seed, hours=2)
+        return obj
+
+    def _value(
+        self,
+        field: str,
+        prop: Dict[str, Any],
+        seed: int,
+        object_id: str,
+        body_id: Optional[str],
+    ) -> Any:
+        if "$ref" in prop:
+            schema_name = prop["$ref"].rsplit("/", 1)[-1]
+            return self.generate(schema_name, f"{object_id}.{seed % 10}", body_id)
+
+        kind, fmt = prop.get("type"), prop.get("format")
+        if kind == "integer":
+            return seed % 100
+        if kind == "boolean":
+            return seed % 2 == 0
+        if fmt == "date-time":
+            return _timestamp(seed)
+        if fmt == "date":
+            return (date(2020, 1, 1) + timedelta(days=seed % 1500)).isoformat()
+        if fmt == "email":
+            return f"{field}{seed % 1000}@example.org"
+        if fmt == "uri":
+            return self._reference(field, seed, object_id, body_id)
+        words = " ".join(_WORDS[(seed + n * 7) % len(_WORDS)] for n in range(3))
+        return f"{words} {object_id}".strip()
+
+    def _reference(
+        self, field: str, seed: int, object_id: str, body_id: Optional[str]
+    ) -> str:
+        body = body_id or "1"
+        if field == "system":
+            return f"{self.base_url}/system"
+        if field == "body":
+            return f"{self.base_url}/body/{body}"
+        if field == "agendaItem":
+            return f"{self.base_url}/meeting/{object_id}/agendaItem"
+        if field == "meeting" and "." in object_id:
+            return self._object_url("meeting", object_id.rpartition(".")[0])
+        if field in ("organization", "person", "meeting", "paper") and not (
+            "-" in object_id
+        ):
+            return f"{self.base_url}/body/{body}/{field}"
+
+        collection = REFERENCE_TARGETS.get(field, field)
+        try:
+            count = self.dataset.count(collection)
+        except KeyError:
+            return f"{self.base_url}/{field}/{object_id}"
+        return self._object_url(collection, f"{body}-{seed % count + 1}")
+
+    def _object_url(self, collection: str, object_id: str) -> str:
+        if collection == "system":
+            return f"{self.base_url}/system"
+        if collection == "agendaItem":
+            meeting_id = object_id.rpartition(".")[0]
+            return f"{self.base_url}/meeting/{meeting_id}/agendaItem/{object_id}"
+        return f"{self.base_url}/{collection}/{object_id}"
+
+
+def _matches(obj: Dict[str, Any], query: Dict[str, str]) -> bool:
+    if query.get("search") and query["search"].lower() not in obj["name"].lower():
+        return False
+    if query.get("start") and obj.get("start", "") < query["start"]:
+        return False
+    if query.get("end") and obj.get("start", "")[:10] > query["end"]:
+        return False
+    return True
+
+
+def _timestamp(seed: int, hours: int = 0) -> str:
+    moment = _EPOCH + timedelta(days=seed % 1500, hours=8 + seed % 10 + hours)
+    return moment.isoformat()
+
+
+def start_server(
+    dataset: Optional[Dataset] = None,
+    latency: float = 0.0,
+    page_size: int = 100,
+    port: int = 0,
+) -> Tuple[str, MockOParlAPI]:
+    """Start the mock API in a background thread.
+
+    Args:
+        dataset: Dataset size.
+        latency: Artificial latency per request in seconds.
+        page_size: Default page size of collections.
+        port: Port to listen on. If 0, picks a free port.
+
+    Returns:
+        Base URL and the application, whose ``requests`` counts hits.
+    """
+    import uvicorn
+
+    if not port:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+    base_url = f"http://127.0.0.1:{port}"
+    app = MockOParlAPI(base_url, dataset, latency, page_size)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return base_url, app
+
+
+def main() -> None:
+    """Serve the mock API in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--bodies", type=int, default=Dataset.bodies)
+    parser.add_argument("--papers", type=int, default=Dataset.papers)
+    parser.add_argument("--meetings", type=int, default=Dataset.meetings)
+    parser.add_argument("--persons", type=int, default=Dataset.persons)
+    args = parser.parse_args()
+
+    dataset = Dataset(
+        bodies=args.bodies,
+        papers=args.papers,
+        meetings=args.meetings,
+        persons=args.persons,
+    )
+    base_url, _ = start_server(dataset, args.latency, args.page_size, args.port)
+    print(f"Mock OParl API listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 """OParl MCP Server - A Model Context Protocol server for OParl APIs."""
 
-from .auth import OParlAuthenticator
+from importlib import import_module
+from typing import Any
+
 from .config import OParlConfig
-from .server import OParlMCPServer
 from .utils import (
     build_query_params,
     create_oparl_summary,
@@ -10,6 +11,7 @@ from .utils import (
     format_oparl_date,
     format_oparl_response,
     get_oparl_object_type,
+    iter_oparl_objects,
     validate_oparl_url,
 )
 
@@ -18,11 +20,34 @@ __all__ = [
     "OParlMCPServer",
     "OParlConfig",
     "OParlAuthenticator",
+    "CachingTransport",
+    "ResponseCache",
+    "ObjectStore",
     "format_oparl_date",
     "build_query_params",
     "validate_oparl_url",
     "extract_resource_id",
     "format_oparl_response",
     "get_oparl_object_type",
+    "iter_oparl_objects",
     "create_oparl_summary",
 ]
+
+# Exports imported on first access, so that importing the package for its
+# configuration or utilities does not load FastMCP and the HTTP stack
+_LAZY_EXPORTS = {
+    "OParlMCPServer": ".server",
+    "OParlAuthenticator": ".auth",
+    "CachingTransport": ".cache",
+    "ResponseCache": ".cache",
+    "ObjectStore": ".store",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,449 @@
+"""Local columnar analytics over fetched and harvested OParl objects.
+
+Papers, meetings, persons and agenda items are flattened into one column
+table per type as they flow through the server, so that counts grouped by
+field values and time buckets are computed locally instead of by pulling
+the objects into the model's context. Tables can be exported to Parquet
+with ``pyarrow`` (``pip install oparl-mcp-server[analytics]``) or to CSV.
+"""
+
+import csv
+import itertools
+import logging
+import sys
+from collections import Counter
+from datetime import date
+from operator import and_
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .store import oparl_type_name
+
+logger = logging.getLogger(__name__)
+
+# Columns per OParl type, besides ``id``.
+TABLE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "Paper": (
+        "body",
+        "name",
+        "reference",
+        "paperType",
+        "date",
+        "underDirectionOf",
+        "originatorPerson",
+        "originatorOrganization",
+        "modified",
+    ),
+    "Meeting": (
+        "name",
+        "meetingState",
+        "cancelled",
+        "start",
+        "end",
+        "organization",
+        "modified",
+    ),
+    "Person": (
+        "body",
+        "name",
+        "familyName",
+        "givenName",
+        "formOfAddress",
+        "gender",
+        "status",
+        "modified",
+    ),
+    "AgendaItem": (
+        "meeting",
+        "number",
+        "name",
+        "public",
+        "result",
+        "start",
+        "modified",
+    ),
+}
+
+# Columns holding lists of values; grouping by them counts each value.
+LIST_FIELDS = {
+    "underDirectionOf",
+    "originatorPerson",
+    "originatorOrganization",
+    "organization",
+    "status",
+}
+
+# Free-text columns, which are not interned.
+_TEXT_FIELDS = {"name", "reference", "familyName", "givenName"}
+
+# Date field used for bucketing and date ranges per OParl type.
+DEFAULT_TIME_FIELDS: Dict[str, str] = {
+    "Paper": "date",
+    "Meeting": "start",
+    "Person": "modified",
+    "AgendaItem": "start",
+}
+
+TIME_BUCKETS = ("day", "week", "month", "year")
+
+ORDERS = ("count", "key")
+
+
+def _cell(value: Any, field: str) -> Any:
+    """Convert an OParl field value into a column value."""
+    if isinstance(value, str):
+        return value if field in _TEXT_FIELDS else sys.intern(value)
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return _cell(value.get("id"), field)
+    if isinstance(value, list):
+        return tuple(_cell(item, field) for item in value)
+    return None
+
+
+def _bucket_function(bucket: str) -> Callable[[Any], Optional[str]]:
+    """Get a function mapping ISO dates and date-times to a time bucket."""
+    if bucket not in TIME_BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(TIME_BUCKETS)}")
+    if bucket != "week":
+        length = {"day": 10, "month": 7, "year": 4}[bucket]
+        return lambda value: value[:length] if isinstance(value, str) else None
+
+    weeks: Dict[str, Optional[str]] = {}
+
+    def week(value: Any) -> Optional[str]:
+        if not isinstance(value, str):
+            return None
+        day = value[:10]
+        if day not in weeks:
+            try:
+                year, number, _ = date.fromisoformat(day).isocalendar()
+                weeks[day] = f"{year}-W{number:02d}"
+            except ValueError:
+                weeks[day] = None
+        return weeks[day]
+
+    return week
+
+
+class ColumnTable:
+    """Rows of one OParl type stored as one list per column."""
+
+    def __init__(self, fields: Sequence[str]):
+        """Create an empty table.
+
+        Args:
+            fields: Column names besides ``id``.
+        """
+        self.fields = ("id", *fields)
+        self.columns: Dict[str, List[Any]] = {field: [] for field in self.fields}
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def upsert(self, url: str, obj: Dict[str, Any]) -> None:
+        """Insert an object as a row, replacing an earlier version.
+
+        Args:
+            url: ``id`` URL of the object.
+            obj: OParl object.
+        """
+        row = self._rows.get(url)
+        if row is None:
+            self._rows[url] = len(self._rows)
+            self.columns["id"].append(sys.intern(url))
+            for field in self.fields[1:]:
+                self.columns[field].append(_cell(obj.get(field), field))
+        else:
+            for field in self.fields[1:]:
+                self.columns[field][row] = _cell(obj.get(field), field)
+
+    def remove(self, url: str) -> bool:
+        """Remove the row of an object, moving the last row into its place.
+
+        Args:
+            url: ``id`` URL of the object.
+
+        Returns:
+            True if the object was in the table.
+        """
+        row = self._rows.pop(url, None)
+        if row is None:
+            return False
+
+        last = len(self._rows)
+        for column in self.columns.values():
+            column[row] = column[last]
+            column.pop()
+        if row != last:
+            self._rows[self.columns["id"][row]] = row
+        return True
+
+
+class AnalyticsEngine:
+    """Column tables of OParl objects with group-by aggregation."""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, ColumnTable] = {
+            obj_type: ColumnTable(fields) for obj_type, fields in TABLE_FIELDS.items()
+        }
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self.tables.values())
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of rows per OParl type."""
+        return {obj_type: len(table) for obj_type, table in self.tables.items()}
+
+    def add(self, obj: Dict[str, Any]) -> bool:
+        """Add or replace an object, or remove it if it is marked deleted.
+
+        Args:
+            obj: OParl object.
+
+        Returns:
+            True if the object is of a supported type.
+        """
+        table = self.tables.get(oparl_type_name(obj) or "")
+        url = obj.get("id")
+        if table is None or not isinstance(url, str):
+            return False
+
+        if obj.get("deleted") is True:
+            table.remove(url)
+            return True
+
+        table.upsert(url, obj)
+        # Agenda items are usually only served embedded in their meeting
+        for item in obj.get("agendaItem") or ():
+            if isinstance(item, dict):
+                self.add(item if "meeting" in item else {**item, "meeting": url})
+        return True
+
+    def add_many(self, objects: Iterable[Dict[str, Any]]) -> int:
+        """Add several objects.
+
+        Args:
+            objects: OParl objects; unsupported types are skipped.
+
+        Returns:
+            Number of objects added or removed.
+        """
+        return sum(1 for obj in objects if self.add(obj))
+
+    def table(self, object_type: str) -> ColumnTable:
+        """Get the table of an OParl type.
+
+        Raises:
+            ValueError: If the type has no table.
+        """
+        table = self.tables.get(object_type)
+        if table is None:
+            raise ValueError(
+                f"object_type must be one of {', '.join(self.tables)}, "
+                f"not {object_type!r}"
+            )
+        return table
+
+    def aggregate(
+        self,
+        object_type: str,
+        group_by: Sequence[str] = (),
+        time_field: Optional[str] = None,
+        bucket: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        url_prefix: Optional[str] = None,
+        order: str = "count",
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Count rows per group.
+
+        Args:
+            object_type: OParl type, e.g. ``Paper``.
+            group_by: Columns to group by. Rows are counted once for every
+                value of a list column such as ``organization``.
+            time_field: Date column for ``bucket`` and the date range. If
+                None, uses the default date column of the type.
+            bucket: Also group by the day, ISO week, month or year of
+                ``time_field``.
+            filters: Only count rows whose column equals the value, or
+                whose list column contains it.
+            start_date: Only count rows dated on or after this ISO date.
+            end_date: Only count rows dated on or before this ISO date.
+            url_prefix: Only count objects whose URL starts with this prefix.
+            order: Sort groups by descending ``count`` or ascending ``key``.
+            limit: Maximum number of groups returned.
+
+        Returns:
+            Dictionary with the groups, each with its key columns and
+            ``count``, the number of matching rows and the number of groups.
+
+        Raises:
+            ValueError: If a type, column, bucket or order is unknown.
+        """
+        table = self.table(object_type)
+        time_field = time_field or DEFAULT_TIME_FIELDS[object_type]
+        filters = filters or {}
+        for field in (*group_by, time_field, *filters):
+            if field not in table.columns:
+                raise ValueError(
+                    f"Unknown {object_type} field {field!r}; "
+                    f"available: {', '.join(table.fields)}"
+                )
+        if order not in ORDERS:
+            raise ValueError(f"order must be one of {', '.join(ORDERS)}")
+
+        # Filter with one mask per condition and count whole key columns at
+        # once, so that the per-row work happens inside built-in functions
+        columns = table.columns
+        mask: Optional[List[bool]] = None
+        if url_prefix:
+            mask = [url.startswith(url_prefix) for url in columns["id"]]
+        for field, value in filters.items():
+            if field in LIST_FIELDS:
+                matches = [value in (cell or ()) for cell in columns[field]]
+            else:
+                matches = [cell == value for cell in columns[field]]
+            mask = matches if mask is None else list(map(and_, mask, matches))
+        if start_date or end_date:
+            start = start_date[:10] if start_date else ""
+            end = end_date[:10] if end_date else "\uffff"
+            matches = [
+                isinstance(when, str) and start <= when[:10] <= end
+                for when in columns[time_field]
+            ]
+            mask = matches if mask is None else list(map(and_, mask, matches))
+
+        def selected(column: List[Any]) -> List[Any]:
+            return column if mask is None else list(itertools.compress(column, mask))
+
+        key_names = list(group_by)
+        key_columns = [selected(columns[field]) for field in group_by]
+        if bucket is not None:
+            bucket_of = _bucket_function(bucket)
+            key_names.append(bucket)
+            key_columns.append(selected(columns[time_field]))
+        matched = len(table) if mask is None else sum(mask)
+
+        # Count distinct raw keys first; bucketing and expanding list values
+        # then only touch each distinct key once
+        if len(key_columns) == 1:
+            # Avoid building a one-element tuple per row
+            counts = Counter(key_columns[0])
+            groups: Counter = Counter({(key,): n for key, n in counts.items()})
+        else:
+            groups = Counter(
+                zip(*key_columns) if key_columns else itertools.repeat((), matched)
+            )
+        if bucket is not None:
+            bucketed: Counter = Counter()
+            for key, count in groups.items():
+                bucketed[(*key[:-1], bucket_of(key[-1]))] += count
+            groups = bucketed
+        if any(field in LIST_FIELDS for field in group_by):
+            expanded: Counter = Counter()
+            for key, count in groups.items():
+                for combination in itertools.product(
+                    *(
+                        (value or (None,)) if isinstance(value, tuple) else (value,)
+                        for value in key
+                    )
+                ):
+                    expanded[combination] += count
+            groups = expanded
+
+        if order == "count":
+            ranked = sorted(
+                groups.items(), key=lambda item: (-item[1], _sort_key(item[0]))
+            )
+        else:
+            ranked = sorted(groups.items(), key=lambda item: _sort_key(item[0]))
+
+        return {
+            "object_type": object_type,
+            "group_by": key_names,
+            "groups": [
+                {**dict(zip(key_names, key)), "count": count}
+                for key, count in ranked[:limit]
+            ],
+            "matched": matched,
+            "total_groups": len(groups),
+            "truncated": len(groups) > limit,
+        }
+
+    def to_arrow(self, object_type: str) -> Any:
+        """Convert the table of an OParl type to a ``pyarrow.Table``.
+
+        Raises:
+            RuntimeError: If ``pyarrow`` is not installed.
+        """
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise RuntimeError(
+                "Arrow export requires pyarrow "
+                "(pip install oparl-mcp-server[analytics])"
+            ) from e
+
+        table = self.table(object_type)
+        return pyarrow.table(
+            {
+                field: [
+                    list(value) if isinstance(value, tuple) else value
+                    for value in column
+                ]
+                for field, column in table.columns.items()
+            }
+        )
+
+    def export(self, directory: Path, file_format: str = "parquet") -> List[Path]:
+        """Write one file per OParl type.
+
+        Args:
+            directory: Directory to write ``<Type>.parquet`` or ``<Type>.csv``
+                files to.
+            file_format: ``parquet`` (requires ``pyarrow``) or ``csv``, where
+                list values are joined with ``|``.
+
+        Returns:
+            Paths of the written files.
+
+        Raises:
+            ValueError: If the format is unknown.
+            RuntimeError: If Parquet is requested without ``pyarrow``.
+        """
+        if file_format not in ("parquet", "csv"):
+            raise ValueError("file_format must be 'parquet' or 'csv'")
+
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for object_type, table in self.tables.items():
+            path = directory / f"{object_type}.{file_format}"
+            if file_format == "parquet":
+                arrow_table = self.to_arrow(object_type)
+                import pyarrow.parquet
+
+                pyarrow.parquet.write_table(arrow_table, path)
+            else:
+                with open(path, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(table.fields)
+                    for row in zip(*table.columns.values()):
+                        writer.writerow(
+                            [
+                                "|".join(map(str, v)) if isinstance(v, tuple) else v
+                                for v in row
+                            ]
+                        )
+            paths.append(path)
+            logger.info(f"Exported {len(table)} {object_type} rows to {path}")
+        return paths
+
+
+def _sort_key(key: Tuple[Any, ...]) -> Tuple[Tuple[bool, str], ...]:
+    """Order group keys with missing values last and mixed types as text."""
+    return tuple((value is None, "" if value is None else str(value)) for value in key)
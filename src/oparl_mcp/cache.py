@@ -0,0 +1,659 @@
+"""Response caching for OParl MCP Server."""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Callable, Dict, List, Optional, Pattern, Sequence, Tuple
+
+import httpx
+
+from .codec import response_json
+from .refresh import RefreshScheduler
+from .store import ObjectStore
+from .utils import iter_oparl_objects, parse_oparl_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Per-path TTLs in seconds, matched against the end of the request path so
+# that base URLs with a path prefix (e.g. ``/oparl/v1``) work unchanged.
+DEFAULT_TTL_RULES: List[Tuple[str, float]] = [
+    (r"/system/?$", 3600.0),
+    (r"/body/?$", 3600.0),
+    (r"/body/[^/]+/?$", 3600.0),
+    (r"/body/[^/]+/meeting/?$", 60.0),
+]
+
+# Paths refreshed ahead of expiry once they have been requested: the entry
+# points every client starts from, and meeting lists, which are mostly read
+# for the current week.
+DEFAULT_HOT_RULES: List[str] = [
+    r"/system/?$",
+    r"/body/?$",
+    r"/body/[^/]+/?$",
+    r"/body/[^/]+/meeting/?$",
+]
+
+# Other entries become hot after this many cache hits within their TTL.
+HOT_MIN_HITS = 3
+
+# Upper bound of the hot requests remembered for proactive refreshes.
+MAX_HOT_KEYS = 256
+
+# Callback receiving OParl objects fetched from upstream.
+ObjectListener = Callable[[List[Dict[str, Any]]], Any]
+
+# Headers describing the wire encoding of the upstream body. Cached bodies are
+# stored decoded, so these must not be replayed.
+_ENCODING_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+@dataclass
+class CacheEntry:
+    """A cached upstream response."""
+
+    status_code: int
+    headers: List[Tuple[str, str]]
+    content: bytes
+    stored_at: float
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    hits: int = 0
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint of the entry in bytes."""
+        return len(self.content) + sum(len(k) + len(v) for k, v in self.headers)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Check whether the entry is still within its TTL."""
+        return (now if now is not None else time.monotonic()) < self.expires_at
+
+    def staleness(self, now: Optional[float] = None) -> float:
+        """Seconds since the entry expired, negative while it is fresh."""
+        return (now if now is not None else time.monotonic()) - self.expires_at
+
+    @property
+    def can_revalidate(self) -> bool:
+        """Whether the entry carries a validator for a conditional request."""
+        return bool(self.etag or self.last_modified)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    revalidations: int = 0
+    not_modified: int = 0
+    stale: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "stale": self.stale,
+        }
+
+
+@dataclass
+class ResponseCache:
+    """In-memory LRU cache of upstream responses with per-path TTLs."""
+
+    max_entries: int = 1024
+    max_bytes: int = 64 * 1024 * 1024
+    default_ttl: float = 300.0
+    ttl_rules: Sequence[Tuple[str, float]] = field(
+        default_factory=lambda: list(DEFAULT_TTL_RULES)
+    )
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def __post_init__(self) -> None:
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._compiled_rules: List[Tuple[Pattern[str], float]] = [
+            (re.compile(pattern), ttl) for pattern, ttl in self.ttl_rules
+        ]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def current_bytes(self) -> int:
+        """Total size of all cached entries in bytes."""
+        return self._bytes
+
+    def usage(self) -> Dict[str, int]:
+        """Get the number and total size of the cached entries.
+
+        Returns:
+            Dictionary with ``entries`` and ``bytes``.
+        """
+        return {"entries": len(self), "bytes": self.current_bytes}
+
+    def ttl_for_path(self, path: str) -> float:
+        """Get the TTL for a request path.
+
+        Args:
+            path: URL path of the request.
+
+        Returns:
+            TTL in seconds from the first matching rule, or the default TTL.
+        """
+        for pattern, ttl in self._compiled_rules:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up a fresh entry and mark it as most recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached entry, or None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or not entry.is_fresh():
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        entry.hits += 1
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry regardless of freshness without touching stats.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached entry, or None if missing.
+        """
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting least recently used entries if needed.
+
+        Args:
+            key: Cache key.
+            entry: Entry to store.
+        """
+        if entry.size > self.max_bytes:
+            return
+
+        self.delete(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self.stats.stores += 1
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats.evictions += 1
+
+    def peek_local(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry held in this process's memory, without any I/O.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached entry, or None if missing.
+        """
+        return self._entries.get(key)
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        """Look up a fresh entry without blocking the event loop.
+
+        Caches backed by a file override this to read it in a worker thread.
+        """
+        return self.get(key)
+
+    async def apeek(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry regardless of freshness without blocking."""
+        return self.peek(key)
+
+    async def aset(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry without blocking the event loop."""
+        self.set(key, entry)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+def cache_key(request: httpx.Request) -> str:
+    """Build the cache key for a request.
+
+    The authorization header is part of the key so that responses fetched with
+    different credentials are never shared.
+
+    Args:
+        request: Outgoing HTTP request.
+
+    Returns:
+        Cache key string.
+    """
+    auth = request.headers.get("authorization", "")
+    digest = hashlib.sha256(auth.encode()).hexdigest()[:16] if auth else ""
+    return f"{request.method} {request.url} {digest}"
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """HTTP transport that serves repeated GET requests from a response cache."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        cache: Optional[ResponseCache] = None,
+        revalidate: bool = True,
+        store: Optional[ObjectStore] = None,
+        stale_if_error: bool = True,
+        refresher: Optional[RefreshScheduler] = None,
+        max_stale: float = 3600.0,
+        refresh_ahead: float = 0.1,
+        hot_rules: Sequence[str] = DEFAULT_HOT_RULES,
+    ):
+        """Initialize the caching transport.
+
+        Args:
+            transport: Transport used for requests that miss the cache.
+            cache: Response cache. If None, a cache with default settings is used.
+            revalidate: Revalidate expired entries with conditional requests
+                instead of downloading them again.
+            store: Persistent object store. Fetched OParl objects are written
+                to it, and it is consulted before going upstream for URLs
+                that are not in the in-memory cache.
+            stale_if_error: Serve expired entries when the upstream request
+                fails, times out or is answered with 429 or a server error.
+            refresher: Background refresh workers. If given, entries that
+                expired less than ``max_stale`` seconds ago are served at
+                once and refreshed in the background (stale-while-revalidate),
+                and hot entries are refreshed before they expire.
+            max_stale: Seconds after expiry during which an entry may still
+                be served while it is refreshed.
+            refresh_ahead: Fraction of the TTL before expiry during which a
+                cache hit on a hot entry triggers a background refresh.
+            hot_rules: Path patterns that are hot from their first request.
+        """
+        self._transport = transport
+        self.cache = cache if cache is not None else ResponseCache()
+        self.revalidate = revalidate
+        self.store = store
+        self.stale_if_error = stale_if_error
+        self.refresher = refresher
+        self.max_stale = max_stale
+        self.refresh_ahead = refresh_ahead
+        self._hot_rules = [re.compile(pattern) for pattern in hot_rules]
+        self._hot: "OrderedDict[str, httpx.Request]" = OrderedDict()
+        self._listeners: List[ObjectListener] = []
+
+    def add_listener(self, listener: "ObjectListener") -> None:
+        """Register a callback for OParl objects fetched from upstream.
+
+        Listeners are called with the objects of every successful upstream
+        response, e.g. to keep a local index up to date.
+
+        Args:
+            listener: Callable receiving a list of OParl objects.
+        """
+        self._listeners.append(listener)
+
+    async def _publish(self, objects: List[Dict[str, Any]]) -> None:
+        if self.store is not None:
+            await asyncio.to_thread(self.store.put_many, objects)
+        for listener in self._listeners:
+            try:
+                listener(objects)
+            except Exception as e:
+                logger.error(f"Object listener failed: {e}")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Serve the request from cache or forward it upstream."""
+        if not _is_cacheable_request(request):
+            return await self._transport.handle_async_request(request)
+
+        key = cache_key(request)
+        no_cache = _has_no_cache(request.headers)
+        entry = None if no_cache else await self.cache.aget(key)
+        if entry is not None:
+            logger.debug(f"Cache hit for {request.url}")
+            if self.refresher is not None and self._is_hot(key, request, entry):
+                remaining = entry.expires_at - time.monotonic()
+                if (
+                    remaining
+                    < (entry.expires_at - entry.stored_at) * self.refresh_ahead
+                ):
+                    self._schedule_refresh(key, request)
+            return _build_response(entry, request)
+
+        # Requests marked no-cache are always validated upstream
+        stale = await self.cache.apeek(key)
+        if (
+            stale is not None
+            and self.refresher is not None
+            and not no_cache
+            and stale.staleness() < self.max_stale
+        ):
+            logger.debug(f"Serving stale {request.url} while refreshing it")
+            self._is_hot(key, request, stale)
+            self._schedule_refresh(key, request)
+            self.cache.stats.stale += 1
+            return _build_response(stale, request, stale=True)
+
+        if (
+            stale is None
+            and not no_cache
+            and self.store is not None
+            and not request.url.query
+        ):
+            stale = await self._load_from_store(key, request)
+            if stale is not None and stale.is_fresh():
+                return _build_response(stale, request)
+
+        # Requests marked no-cache want the upstream answer, even an error
+        fallback = stale if self.stale_if_error and not no_cache else None
+        if self.revalidate and stale is not None and stale.can_revalidate:
+            _add_conditional_headers(request, stale)
+            self.cache.stats.revalidations += 1
+        else:
+            stale = None
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.TransportError as e:
+            if fallback is None:
+                raise
+            logger.warning(f"Serving stale {request.url} after upstream error: {e}")
+            self.cache.stats.stale += 1
+            return _build_response(fallback, request, stale=True)
+
+        if fallback is not None and (
+            response.status_code == 429 or response.status_code >= 500
+        ):
+            await response.aclose()
+            logger.warning(
+                f"Serving stale {request.url} after upstream status "
+                f"{response.status_code}"
+            )
+            self.cache.stats.stale += 1
+            return _build_response(fallback, request, stale=True)
+
+        if response.status_code == 304 and stale is not None:
+            await response.aclose()
+            logger.debug(f"Cache revalidated {request.url}")
+            self.cache.stats.not_modified += 1
+            entry = self._refresh_entry(stale, response.headers, request.url.path)
+            await self.cache.aset(key, entry)
+            return _build_response(entry, request)
+
+        if response.status_code != 200 or _has_no_store(response.headers):
+            return response
+
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+
+        data = _json_body(response)
+        entry = self._create_entry(response, request.url.path, data)
+        await self.cache.aset(key, entry)
+        # Harvesters and refreshes send no-cache requests, which are not a
+        # sign of interest in the entry
+        if self.refresher is not None and not no_cache:
+            self._is_hot(key, request, entry)
+
+        if data is not None and (self.store is not None or self._listeners):
+            objects = list(iter_oparl_objects(data))
+            if objects:
+                await self._publish(objects)
+
+        return _build_response(entry, request)
+
+    def _is_hot(self, key: str, request: httpx.Request, entry: CacheEntry) -> bool:
+        """Check whether an entry is hot, remembering its request if so."""
+        if key in self._hot:
+            self._hot.move_to_end(key)
+            return True
+        if entry.hits < HOT_MIN_HITS and not any(
+            pattern.search(request.url.path) for pattern in self._hot_rules
+        ):
+            return False
+
+        self._hot[key] = _refresh_request(request)
+        if len(self._hot) > MAX_HOT_KEYS:
+            self._hot.popitem(last=False)
+        return True
+
+    def _schedule_refresh(self, key: str, request: httpx.Request) -> bool:
+        assert self.refresher is not None
+        refresh_request = _refresh_request(request)
+
+        async def refresh() -> None:
+            response = await self.handle_async_request(refresh_request)
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+            if response.status_code not in (200, 304):
+                raise httpx.HTTPStatusError(
+                    f"Upstream answered {response.status_code}",
+                    request=refresh_request,
+                    response=response,
+                )
+
+        return self.refresher.schedule(key, refresh)
+
+    def refresh_expiring(self, within: float) -> int:
+        """Schedule background refreshes of hot entries about to expire.
+
+        Args:
+            within: Refresh entries expiring in fewer than this many seconds,
+                and expired entries that may still be served stale.
+
+        Returns:
+            Number of refreshes scheduled.
+        """
+        if self.refresher is None:
+            return 0
+
+        now = time.monotonic()
+        scheduled = 0
+        for key, request in list(self._hot.items()):
+            # Hot entries were served by this process, so its memory holds them
+            entry = self.cache.peek_local(key)
+            if entry is None or entry.staleness(now) >= self.max_stale:
+                # Evicted or too old: wait until it is requested again
+                del self._hot[key]
+            elif entry.expires_at - now < within:
+                scheduled += self._schedule_refresh(key, request)
+        return scheduled
+
+    async def _load_from_store(
+        self, key: str, request: httpx.Request
+    ) -> Optional[CacheEntry]:
+        assert self.store is not None
+        stored = await asyncio.to_thread(self.store.get, str(request.url))
+        if stored is None:
+            return None
+
+        age = max(time.time() - stored.stored_at, 0.0)
+        ttl = self.cache.ttl_for_path(request.url.path)
+        now = time.monotonic()
+        entry = CacheEntry(
+            status_code=200,
+            headers=[("content-type", "application/json")],
+            content=stored.data,
+            stored_at=now - age,
+            expires_at=now - age + ttl,
+            last_modified=_http_date(parse_oparl_timestamp(stored.modified)),
+        )
+        await self.cache.aset(key, entry)
+        return entry
+
+    def _create_entry(
+        self, response: httpx.Response, path: str, data: Any = None
+    ) -> CacheEntry:
+        now = time.monotonic()
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+
+        # Without HTTP validators, fall back to the OParl ``modified`` field so
+        # that servers honouring If-Modified-Since can still answer with 304.
+        if self.revalidate and not etag and not last_modified:
+            last_modified = _last_modified_from_data(data)
+
+        return CacheEntry(
+            status_code=response.status_code,
+            headers=replayable_headers(response.headers),
+            content=response.content,
+            stored_at=now,
+            expires_at=now + self.cache.ttl_for_path(path),
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def _refresh_entry(
+        self, entry: CacheEntry, headers: httpx.Headers, path: str
+    ) -> CacheEntry:
+        now = time.monotonic()
+        return CacheEntry(
+            status_code=entry.status_code,
+            headers=entry.headers,
+            content=entry.content,
+            stored_at=now,
+            expires_at=now + self.cache.ttl_for_path(path),
+            etag=headers.get("etag", entry.etag),
+            last_modified=headers.get("last-modified", entry.last_modified),
+        )
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
+
+
+def _is_cacheable_request(request: httpx.Request) -> bool:
+    return (
+        request.method == "GET"
+        and not _has_no_store(request.headers)
+        and "if-none-match" not in request.headers
+        and "if-modified-since" not in request.headers
+    )
+
+
+def _refresh_request(request: httpx.Request) -> httpx.Request:
+    """Copy a request so that it revalidates its cache entry upstream."""
+    headers = [
+        (k, v)
+        for k, v in request.headers.items()
+        if k.lower() not in ("cache-control", "if-none-match", "if-modified-since")
+    ]
+    headers.append(("cache-control", "no-cache"))
+    return httpx.Request(request.method, request.url, headers=headers)
+
+
+def _add_conditional_headers(request: httpx.Request, entry: CacheEntry) -> None:
+    if entry.etag:
+        request.headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        request.headers["If-Modified-Since"] = entry.last_modified
+
+
+def _json_body(response: httpx.Response) -> Any:
+    if "json" not in response.headers.get("content-type", ""):
+        return None
+    try:
+        return response_json(response)
+    except ValueError:
+        return None
+
+
+def _last_modified_from_data(data: Any) -> Optional[str]:
+    """Derive an HTTP date from the ``modified`` field of an OParl response.
+
+    Single objects use their own ``modified`` timestamp; collection pages use
+    the newest ``modified`` timestamp of their items.
+    """
+    if not isinstance(data, dict):
+        return None
+
+    candidates: List[Any] = [data.get("modified")]
+    items = data.get("data")
+    if isinstance(items, list):
+        candidates.extend(i.get("modified") for i in items if isinstance(i, dict))
+
+    newest: Optional[datetime] = None
+    for value in candidates:
+        parsed = parse_oparl_timestamp(value)
+        if parsed is not None and (newest is None or parsed > newest):
+            newest = parsed
+
+    return _http_date(newest)
+
+
+def _http_date(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _has_no_store(headers: httpx.Headers) -> bool:
+    return "no-store" in headers.get("cache-control", "").lower()
+
+
+def _has_no_cache(headers: httpx.Headers) -> bool:
+    return "no-cache" in headers.get("cache-control", "").lower()
+
+
+def replayable_headers(headers: httpx.Headers) -> List[Tuple[str, str]]:
+    """Get the headers of a decoded response that can be replayed.
+
+    Args:
+        headers: Headers of an upstream response.
+
+    Returns:
+        Headers without content encoding and length, which no longer match
+        the decoded body.
+    """
+    return [(k, v) for k, v in headers.items() if k.lower() not in _ENCODING_HEADERS]
+
+
+def _build_response(
+    entry: CacheEntry, request: httpx.Request, stale: bool = False
+) -> httpx.Response:
+    headers = entry.headers
+    if stale:
+        headers = [*headers, ("warning", '110 - "Response is Stale"')]
+    return httpx.Response(
+        status_code=entry.status_code,
+        headers=headers,
+        content=entry.content,
+        request=request,
+    )
@@ -0,0 +1,112 @@
+"""Coalescing of identical concurrent upstream requests."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .cache import cache_key, replayable_headers
+
+logger = logging.getLogger(__name__)
+
+# Status code, replayable headers and decoded body of a shared response.
+_SharedResponse = Tuple[int, List[Tuple[str, str]], bytes]
+
+
+@dataclass
+class CoalescingStats:
+    """Counters for request coalescing."""
+
+    requests: int = 0
+    coalesced: int = 0
+    upstream: int = 0
+    max_waiters: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "upstream": self.upstream,
+            "max_waiters": self.max_waiters,
+        }
+
+
+class CoalescingTransport(httpx.AsyncBaseTransport):
+    """HTTP transport that lets identical concurrent GETs share one request.
+
+    Requests with the same method, URL and authorization header that arrive
+    while an identical request is in flight wait for its response instead of
+    going upstream. Each caller receives its own copy of the response.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        stats: Optional[CoalescingStats] = None,
+    ):
+        """Wrap a transport.
+
+        Args:
+            transport: Transport that performs the upstream requests.
+            stats: Counters to update. If None, creates new counters.
+        """
+        self._transport = transport
+        self.stats = stats or CoalescingStats()
+        self._in_flight: Dict[str, "asyncio.Task[_SharedResponse]"] = {}
+        self._waiters: Dict[str, int] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Join an identical in-flight request or start a new one."""
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+
+        self.stats.requests += 1
+        key = cache_key(request)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(request))
+            self._in_flight[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            logger.debug(f"Coalescing request for {request.url}")
+            self.stats.coalesced += 1
+            self._waiters[key] += 1
+            self.stats.max_waiters = max(self.stats.max_waiters, self._waiters[key])
+
+        # Shield the shared request so that one cancelled caller does not
+        # cancel it for everybody else
+        status_code, headers, content = await asyncio.shield(task)
+        return httpx.Response(
+            status_code=status_code,
+            headers=headers,
+            content=content,
+            request=request,
+        )
+
+    async def _fetch(self, request: httpx.Request) -> _SharedResponse:
+        self.stats.upstream += 1
+        response = await self._transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+        return (
+            response.status_code,
+            replayable_headers(response.headers),
+            response.content,
+        )
+
+    def _finish(self, key: str, task: "asyncio.Task[_SharedResponse]") -> None:
+        self._in_flight.pop(key, None)
+        self._waiters.pop(key, None)
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
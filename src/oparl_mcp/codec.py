@@ -0,0 +1,125 @@
+"""JSON encoding and decoding with the fastest available library.
+
+Uses ``orjson`` or ``msgspec`` when installed (``pip install
+oparl-mcp-server[fast]``) and the standard library otherwise. All three
+produce the same Python objects, so callers do not depend on the backend.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Tuple, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+Decoder = Callable[[Union[bytes, str]], Any]
+Encoder = Callable[[Any], bytes]
+
+
+def _stdlib() -> Tuple[Decoder, Encoder]:
+    def encode(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    return json.loads, encode
+
+
+def _orjson() -> Tuple[Decoder, Encoder]:
+    import orjson
+
+    return orjson.loads, orjson.dumps
+
+
+def _msgspec() -> Tuple[Decoder, Encoder]:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def decode(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return decode, encoder.encode
+
+
+BACKENDS: Dict[str, Callable[[], Tuple[Decoder, Encoder]]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": _stdlib,
+}
+
+backend = "json"
+_decode, _encode = _stdlib()
+
+
+def use_backend(name: str) -> None:
+    """Select the JSON library.
+
+    Args:
+        name: One of ``orjson``, ``msgspec`` or ``json``.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the library is not installed.
+    """
+    global backend, _decode, _encode
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name!r}")
+    _decode, _encode = BACKENDS[name]()
+    backend = name
+    logger.debug(f"Using JSON backend {name}")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON.
+
+    Args:
+        data: JSON document, preferably as UTF-8 bytes.
+
+    Returns:
+        Decoded object.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    return _decode(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON.
+
+    Args:
+        obj: JSON-serializable object.
+
+    Returns:
+        Encoded document.
+    """
+    return _encode(obj)
+
+
+def response_json(response: httpx.Response) -> Any:
+    """Decode the JSON body of an HTTP response.
+
+    Equivalent to ``response.json()`` for the UTF-8 bodies served by OParl
+    APIs.
+
+    Args:
+        response: Read HTTP response.
+
+    Returns:
+        Decoded body.
+    """
+    return _decode(response.content)
+
+
+for _name in ("orjson", "msgspec"):
+    try:
+        use_backend(_name)
+        break
+    except ImportError:
+        continue
@@ -1,6 +1,6 @@
 """Configuration management for OParl MCP Server."""
 
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -13,10 +13,98 @@ class OParlConfig(BaseSettings):
     api_key: Optional[str] = None
     timeout: float = 30.0
 
+    # Additional OParl systems served by the same process, by namespace
+    systems: Dict[str, str] = {}
+
+    # HTTP connection pool
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+    coalesce_requests: bool = True
+
+    # Upstream rate limiting, retries and circuit breaking, per host
+    rate_limit: Optional[float] = 50.0
+    rate_limit_burst: int = 20
+    retry_max_attempts: int = 3
+    retry_backoff: float = 0.5
+    retry_max_backoff: float = 10.0
+    retry_deadline: float = 30.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+
+    # Response cache
+    cache_enabled: bool = True
+    cache_max_entries: int = 1024
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_default_ttl: float = 300.0
+    cache_revalidate: bool = True
+    cache_stale_if_error: bool = True
+    cache_stale_while_revalidate: bool = True
+    cache_max_stale: float = 3600.0
+    cache_refresh_workers: int = 4
+    cache_refresh_ahead: float = 0.1
+    cache_refresh_interval: Optional[float] = 30.0
+    cache_path: Optional[str] = None
+    cache_local_entries: int = 256
+
+    # Persistent object store
+    store_path: Optional[str] = None
+    store_max_bytes: int = 256 * 1024 * 1024
+
+    # Collection tools
+    collection_max_items: int = 1000
+    collection_max_bytes: int = 2 * 1024 * 1024
+    prefetch_pages: int = 4
+    max_concurrent_requests: int = 16
+    per_host_concurrency: int = 6
+    batch_max_urls: int = 200
+
+    # Representation of objects returned by the tools
+    response_profile: str = "standard"
+    projection_max_items: int = 5
+
+    # Reference expansion
+    expand_default_depth: int = 1
+    expand_max_depth: int = 2
+    expand_fan_out: int = 20
+    expand_max_objects: int = 200
+
+    # Local search index
+    search_enabled: bool = True
+
+    # Local column tables for the aggregation tool
+    analytics_enabled: bool = True
+
+    # Compact reference graph for the traversal tool
+    graph_enabled: bool = True
+
+    # Incremental harvester
+    harvest_interval: Optional[float] = None
+    harvest_bodies: List[str] = []
+    harvest_checkpoint_path: Optional[str] = None
+    harvest_page_size: int = 100
+    harvest_meeting_lookback_days: Optional[int] = 90
+
+    # Metrics
+    metrics_enabled: bool = True
+
     # MCP Configuration
     server_name: str = "OParl MCP Server"
     server_version: str = "0.1.0"
 
+    # MCP transport: stdio, or http (streamable HTTP) and sse served by uvicorn
+    transport: str = "stdio"
+    host: str = "127.0.0.1"
+    port: int = 8000
+    http_path: Optional[str] = None
+    workers: int = 1
+    stateless_http: bool = False
+    shutdown_timeout: float = 30.0
+
     # Logging
     log_level: str = "INFO"
 
@@ -0,0 +1,267 @@
+"""Resolution of the references between OParl objects.
+
+OParl objects refer to each other by URL: a meeting lists its organizations,
+participants and agenda items, a paper its consultations, originators and
+files. An agent reading a meeting would follow each of these one request at
+a time. The :class:`ReferenceExpander` follows them ahead of the agent,
+level by level and concurrently, so that a single call returns an object
+together with the objects it references.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Union
+from urllib.parse import urlparse
+
+import httpx
+
+from .codec import response_json
+from .pagination import is_collection_path
+from .schema import UPWARD_REFERENCES, OParlSchema
+from .store import oparl_type_name
+from .utils import validate_oparl_url
+
+logger = logging.getLogger(__name__)
+
+EXPANSION_MODES = ("bundle", "embedded")
+
+# An included reference is either an object or the items of a collection
+Included = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+@dataclass
+class Expansion:
+    """An OParl object together with the objects it references.
+
+    If the server answers with something other than a JSON object, ``object``
+    holds that body unchanged and nothing is included.
+    """
+
+    object: Any
+    included: Dict[str, Included] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    depth: int = 0
+    truncated: bool = False
+
+    def to_bundle(self) -> Dict[str, Any]:
+        """Get the object with the referenced objects keyed by URL.
+
+        Returns:
+            Dictionary with the unchanged object and the included objects.
+        """
+        return {
+            "object": self.object,
+            "included": self.included,
+            "errors": self.errors,
+            "truncated": self.truncated,
+        }
+
+    def to_embedded(self, schema: OParlSchema) -> Dict[str, Any]:
+        """Get the object with its references replaced by the objects.
+
+        References are replaced up to the expansion depth. References that
+        were not fetched, and references back to an object that is already
+        being embedded, are kept as URLs.
+
+        Args:
+            schema: Schema describing the reference fields of each type.
+
+        Returns:
+            Copy of the object with embedded references, or the bundle if
+            the body is not an object.
+        """
+        if not isinstance(self.object, dict):
+            return self.to_bundle()
+        embedded = self._embed(self.object, schema, self.depth, frozenset())
+        if self.errors:
+            embedded["expansionErrors"] = self.errors
+        if self.truncated:
+            embedded["expansionTruncated"] = True
+        return embedded
+
+    def _embed(
+        self,
+        obj: Dict[str, Any],
+        schema: OParlSchema,
+        depth: int,
+        ancestors: frozenset,
+    ) -> Dict[str, Any]:
+        result = dict(obj)
+        if depth <= 0:
+            return result
+
+        ancestors = ancestors | {obj.get("id")}
+        for name in schema.reference_fields.get(oparl_type_name(obj) or "", ()):
+            value = obj.get(name)
+            if isinstance(value, list):
+                result[name] = [
+                    self._embed_reference(url, schema, depth, ancestors)
+                    for url in value
+                ]
+            elif isinstance(value, str):
+                result[name] = self._embed_reference(value, schema, depth, ancestors)
+        return result
+
+    def _embed_reference(
+        self, url: Any, schema: OParlSchema, depth: int, ancestors: frozenset
+    ) -> Any:
+        target = self.included.get(url) if isinstance(url, str) else None
+        if target is None or url in ancestors:
+            return url
+        if isinstance(target, list):
+            return [
+                self._embed(item, schema, depth - 1, ancestors | {url})
+                for item in target
+            ]
+        return self._embed(target, schema, depth - 1, ancestors)
+
+
+class ReferenceExpander:
+    """Fetch the objects referenced by an OParl object, level by level.
+
+    References of all objects on one level are fetched concurrently and
+    deduplicated by URL, so an organization referenced by several agenda
+    items is fetched once. References to collections, such as the agenda
+    items of a meeting, are resolved to their first page. References back up
+    the hierarchy (``body``, ``system``) and URLs of other hosts are not
+    followed.
+
+    All requests go through the given client and therefore share its
+    response cache and request coalescing.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        schema: OParlSchema,
+        base_url: str,
+        fan_out: int = 20,
+        max_objects: int = 200,
+        max_concurrency: int = 16,
+    ):
+        """Initialize the expander.
+
+        Args:
+            client: HTTP client for the OParl API.
+            schema: Schema describing the reference fields of each type.
+            base_url: Base URL of the OParl API; other URLs are not followed.
+            fan_out: Maximum number of references followed per field, and
+                number of items fetched per referenced collection.
+            max_objects: Maximum number of references fetched per expansion.
+            max_concurrency: Maximum number of concurrent requests.
+        """
+        if fan_out < 1 or max_objects < 1:
+            raise ValueError("fan_out and max_objects must be at least 1")
+        self.client = client
+        self.schema = schema
+        self.base_url = base_url
+        self.fan_out = fan_out
+        self.max_objects = max_objects
+        self.max_concurrency = max_concurrency
+
+    async def expand(
+        self, url: str, depth: int = 1, fan_out: Optional[int] = None
+    ) -> Expansion:
+        """Fetch an object and the objects it references.
+
+        Args:
+            url: URL of the object, or its path relative to the client's
+                base URL.
+            depth: Number of reference levels to follow; 0 only fetches the
+                object itself.
+            fan_out: Override of the per-field reference limit.
+
+        Returns:
+            The expansion of the object.
+
+        Raises:
+            ValueError: If depth is negative.
+            httpx.HTTPStatusError: If the object itself cannot be fetched.
+        """
+        if depth < 0:
+            raise ValueError("depth must not be negative")
+        fan_out = self.fan_out if fan_out is None else max(1, fan_out)
+
+        response = await self.client.get(url)
+        response.raise_for_status()
+        root = response_json(response)
+        if not isinstance(root, dict):
+            return Expansion(object=root)
+        expansion = Expansion(object=root, depth=depth)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        seen: Set[str] = {root.get("id") or str(response.url)}
+        level = [root]
+
+        for _ in range(depth):
+            urls: List[str] = []
+            for obj in level:
+                for reference in self._references(obj, fan_out):
+                    if reference in seen:
+                        continue
+                    if len(seen) > self.max_objects:
+                        expansion.truncated = True
+                        break
+                    seen.add(reference)
+                    urls.append(reference)
+            if not urls:
+                break
+
+            results = await asyncio.gather(
+                *(self._fetch(reference, fan_out, semaphore) for reference in urls),
+                return_exceptions=True,
+            )
+
+            level = []
+            for reference, result in zip(urls, results):
+                if isinstance(result, BaseException):
+                    expansion.errors[reference] = str(result) or type(result).__name__
+                    continue
+                expansion.included[reference] = result
+                items = result if isinstance(result, list) else [result]
+                for item in items:
+                    # Collection items can be referenced by URL elsewhere
+                    item_id = item.get("id")
+                    if item_id and item_id != reference:
+                        seen.add(item_id)
+                        expansion.included.setdefault(item_id, item)
+                level.extend(items)
+
+        logger.debug(
+            f"Expanded {root.get('id')} to depth {depth}: "
+            f"{len(expansion.included)} included, {len(expansion.errors)} errors"
+        )
+        return expansion
+
+    def _references(self, obj: Dict[str, Any], fan_out: int) -> List[str]:
+        """Get the URLs referenced by an object that should be followed."""
+        references: List[str] = []
+        for name in self.schema.reference_fields.get(oparl_type_name(obj) or "", ()):
+            if name in UPWARD_REFERENCES:
+                continue
+            value = obj.get(name)
+            values = value[:fan_out] if isinstance(value, list) else [value]
+            references.extend(
+                url
+                for url in values
+                if isinstance(url, str) and validate_oparl_url(url, self.base_url)
+            )
+        return references
+
+    async def _fetch(
+        self, url: str, fan_out: int, semaphore: asyncio.Semaphore
+    ) -> Included:
+        # Only collections take a limit, objects keep their plain cache key
+        collection = is_collection_path(urlparse(url).path)
+        async with semaphore:
+            response = await self.client.get(
+                url, params={"limit": fan_out} if collection else None
+            )
+        response.raise_for_status()
+        data = response_json(response)
+        if isinstance(data, dict) and isinstance(data.get("data"), list):
+            return [item for item in data["data"][:fan_out] if isinstance(item, dict)]
+        if not isinstance(data, dict):
+            raise ValueError(f"{url} did not return an OParl object")
+        return data
@@ -0,0 +1,554 @@
+"""Compact in-memory graph of OParl objects and their references.
+
+Objects are kept as instances of slotted record classes generated from the
+``components/schemas`` of the OpenAPI specification instead of as parsed JSON
+dictionaries. Every URL is stored once and replaced by an integer node ID,
+and the references of a record are packed into a single ``array`` of node
+IDs, so that references are followed without touching any strings. A
+reverse index per relation, such as ``Meeting.organization``, answers which
+objects reference a given one without scanning.
+"""
+
+import sys
+from array import array
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from .schema import UPWARD_REFERENCES, OParlSchema
+from .store import oparl_type_name
+
+# OParl 1.1 types that servers embed in other objects, such as the
+# consultations of a paper or the memberships of a person, but that the
+# bundled specification does not define: (reference fields, scalar fields).
+EMBEDDED_TYPES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "Consultation": (
+        ("paper", "agendaItem", "meeting", "organization"),
+        ("role", "authoritative"),
+    ),
+    "Membership": (
+        ("person", "organization", "onBehalfOf"),
+        ("role", "votingRight", "startDate", "endDate"),
+    ),
+}
+
+# Fields not kept on records; the full objects stay in the cache and store.
+SKIPPED_FIELDS = frozenset({"created", "modified"})
+
+# Prefix of traversal steps that follow references backwards.
+REVERSE_PREFIX = "<-"
+
+# Named reverse relations per type, as traversal paths starting from an
+# object of that type, e.g. the meetings a paper was consulted in.
+NAMED_RELATIONS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "Paper": {
+        "consultedIn": ("<-Consultation.paper", "meeting"),
+        "subordinates": ("<-Paper.superordinatePaper",),
+    },
+    "Person": {
+        "papers": ("<-Paper.originatorPerson",),
+        "meetings": ("<-Meeting.participant",),
+        "organizations": ("<-Membership.person", "organization"),
+    },
+    "Organization": {
+        "papers": ("<-Paper.originatorOrganization",),
+        "meetings": ("<-Meeting.organization",),
+        "members": ("<-Membership.organization", "person"),
+    },
+    "Meeting": {
+        "agendaItems": ("<-AgendaItem.meeting",),
+        "consultations": ("<-Consultation.meeting",),
+    },
+}
+
+# Sources referencing a target in one relation: a single node ID, or an
+# array of node IDs once there are several.
+Sources = Union[int, array]
+
+# Strings up to this length are interned, so that repeated values such as
+# dates, states and paper types are stored once.
+_INTERN_LENGTH = 32
+
+
+class Record:
+    """Base class of the slotted record classes generated per OParl type.
+
+    ``refs`` holds the references of all reference fields of the type: one
+    running end offset per field, followed by the referenced node IDs.
+    """
+
+    __slots__ = ("node", "refs")
+
+    type_name: ClassVar[str] = ""
+    fields: ClassVar[Tuple[str, ...]] = ()
+    reference_fields: ClassVar[Tuple[str, ...]] = ()
+    reference_index: ClassVar[Dict[str, int]] = {}
+
+    def __init__(self, node: int, refs: array, values: Sequence[Any]):
+        self.node = node
+        self.refs = refs
+        for name, value in zip(self.fields, values):
+            setattr(self, name, value)
+
+    def targets(self, index: int) -> array:
+        """Get the node IDs referenced by the reference field at an index.
+
+        Args:
+            index: Position of the field in ``reference_fields``.
+
+        Returns:
+            Referenced node IDs.
+        """
+        refs = self.refs
+        count = len(self.reference_fields)
+        start = count + (refs[index - 1] if index else 0)
+        return refs[start : count + refs[index]]
+
+
+def make_record_class(
+    type_name: str, fields: Sequence[str], reference_fields: Sequence[str]
+) -> Type[Record]:
+    """Generate a slotted record class for an OParl type.
+
+    Args:
+        type_name: OParl type name such as ``Paper``.
+        fields: Scalar fields, stored as attributes.
+        reference_fields: Fields holding URLs of other objects.
+
+    Returns:
+        Record class.
+    """
+    fields = tuple(name for name in fields if name not in SKIPPED_FIELDS)
+    return type(
+        type_name,
+        (Record,),
+        {
+            "__slots__": fields,
+            "type_name": type_name,
+            "fields": fields,
+            "reference_fields": tuple(reference_fields),
+            "reference_index": {name: i for i, name in enumerate(reference_fields)},
+        },
+    )
+
+
+def _scalar(value: Any) -> Any:
+    """Convert an OParl field value into a compact record value."""
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= _INTERN_LENGTH else value
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return _scalar(value.get("id"))
+    if isinstance(value, list):
+        return tuple(_scalar(item) for item in value) or None
+    return None
+
+
+class EntityGraph:
+    """Records of OParl objects linked by node IDs, with traversal queries."""
+
+    def __init__(self, schema: OParlSchema):
+        """Create an empty graph.
+
+        Args:
+            schema: Schema the record classes are generated from.
+        """
+        self.record_types: Dict[str, Type[Record]] = {
+            name: make_record_class(
+                name, schema.scalar_fields.get(name, ()), reference_fields
+            )
+            for name, reference_fields in schema.reference_fields.items()
+        }
+        for name, (reference_fields, fields) in EMBEDDED_TYPES.items():
+            if name not in self.record_types:
+                self.record_types[name] = make_record_class(
+                    name, fields, reference_fields
+                )
+
+        # URLs are split after their last slash; each distinct prefix such as
+        # ``https://example.org/paper/`` is stored once, and nodes are
+        # looked up by their suffix in the table of their prefix
+        self._prefixes: List[str] = []
+        self._prefix_ids: Dict[str, int] = {}
+        self._suffix_ids: List[Dict[str, int]] = []
+        self._node_prefixes = array("i")
+        self._node_suffixes: List[str] = []
+        self._records: List[Optional[Record]] = []
+        self._count = 0
+
+        # Reverse index, one table per relation such as Meeting.organization,
+        # mapping target node IDs to the node IDs referencing them. The
+        # upward body and system references, which nearly every object
+        # has, are not indexed and found by scanning instead.
+        self._relation_ids: Dict[Tuple[str, str], int] = {}
+        self._reverse: List[Dict[int, Sources]] = []
+        self._type_relations: Dict[str, Tuple[Optional[int], ...]] = {}
+        for name, record_type in self.record_types.items():
+            relations: List[Optional[int]] = []
+            for field in record_type.reference_fields:
+                if field in UPWARD_REFERENCES:
+                    relations.append(None)
+                    continue
+                self._relation_ids[name, field] = len(self._reverse)
+                relations.append(len(self._reverse))
+                self._reverse.append({})
+            self._type_relations[name] = tuple(relations)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def node_count(self) -> int:
+        """Number of interned URLs, including objects only referenced."""
+        return len(self._node_suffixes)
+
+    def intern(self, url: str) -> int:
+        """Get the node ID of a URL, assigning a new one if needed.
+
+        Args:
+            url: Object URL.
+
+        Returns:
+            Node ID.
+        """
+        split = url.rfind("/") + 1
+        prefix = self._prefix_ids.get(url[:split])
+        if prefix is None:
+            prefix = self._prefix_ids[url[:split]] = len(self._prefixes)
+            self._prefixes.append(url[:split])
+            self._suffix_ids.append({})
+
+        suffix = sys.intern(url[split:])
+        node = self._suffix_ids[prefix].get(suffix)
+        if node is None:
+            node = self._suffix_ids[prefix][suffix] = len(self._node_suffixes)
+            self._node_prefixes.append(prefix)
+            self._node_suffixes.append(suffix)
+            self._records.append(None)
+        return node
+
+    def node(self, url: str) -> Optional[int]:
+        """Get the node ID of a URL, or None if it is unknown."""
+        split = url.rfind("/") + 1
+        prefix = self._prefix_ids.get(url[:split])
+        if prefix is None:
+            return None
+        return self._suffix_ids[prefix].get(url[split:])
+
+    def url(self, node: int) -> str:
+        """Get the URL of a node ID."""
+        return self._prefixes[self._node_prefixes[node]] + self._node_suffixes[node]
+
+    def get(self, url: str) -> Optional[Record]:
+        """Get the record of an object, or None if it was not added."""
+        node = self.node(url)
+        return None if node is None else self._records[node]
+
+    def add(self, obj: Dict[str, Any]) -> bool:
+        """Add or replace an object, or remove it if it is marked deleted.
+
+        Embedded objects, such as the agenda items of a meeting, are added
+        as records of their own; a missing reference back to the embedding
+        object, such as ``AgendaItem.meeting``, is filled in.
+
+        Args:
+            obj: OParl object.
+
+        Returns:
+            True if the object is of a supported type.
+        """
+        return self._add(obj, None, None)
+
+    def add_many(self, objects: Iterable[Dict[str, Any]]) -> int:
+        """Add several objects.
+
+        Args:
+            objects: OParl objects; unsupported types are skipped.
+
+        Returns:
+            Number of objects added or removed.
+        """
+        return sum(1 for obj in objects if self.add(obj))
+
+    def remove(self, url: str) -> bool:
+        """Remove the record of an object; its node ID stays assigned.
+
+        Returns:
+            True if the object had a record.
+        """
+        node = self.node(url)
+        return node is not None and self._remove(node)
+
+    def references(self, url: str, field: str) -> List[str]:
+        """Get the URLs an object references in a field.
+
+        Args:
+            url: Object URL.
+            field: Reference field such as ``organization``.
+
+        Returns:
+            Referenced URLs; empty if the object or field is unknown.
+        """
+        record = self.get(url)
+        if record is None or field not in record.reference_index:
+            return []
+        return [
+            self.url(node) for node in record.targets(record.reference_index[field])
+        ]
+
+    def referrers(self, url: str, relation: str) -> List[str]:
+        """Get the objects referencing an object in a relation.
+
+        Args:
+            url: Object URL.
+            relation: Relation written ``Type.field``, such as
+                ``Meeting.organization`` for the meetings of an
+                organization.
+
+        Returns:
+            URLs of the referencing objects, sorted.
+
+        Raises:
+            ValueError: If the relation is unknown.
+        """
+        return self.traverse([url], [REVERSE_PREFIX + relation])
+
+    def relations(self, url: str) -> Dict[str, List[str]]:
+        """Get all indexed references to an object, grouped by relation.
+
+        Args:
+            url: Object URL.
+
+        Returns:
+            URLs of the referencing objects, sorted, keyed by relations
+            such as ``Paper.originatorPerson``.
+        """
+        node = self.node(url)
+        if node is None:
+            return {}
+        result = {}
+        for (type_name, field), relation in self._relation_ids.items():
+            sources = self._reverse[relation].get(node)
+            if sources is not None:
+                result[f"{type_name}.{field}"] = sorted(
+                    map(self.url, _iter_sources(sources))
+                )
+        return result
+
+    def check_path(self, path: Sequence[str]) -> None:
+        """Check that all steps of a traversal path are known.
+
+        Raises:
+            ValueError: If a step names an unknown type or field.
+        """
+        for step in path:
+            self._parse_step(step)
+
+    def traverse(self, start: Iterable[str], path: Sequence[str]) -> List[str]:
+        """Follow a path of references from a set of objects.
+
+        Args:
+            start: URLs of the objects to start from.
+            path: Steps, each either a reference field such as
+                ``organization``, followed forward, or ``<-Type.field``
+                for the objects of ``Type`` whose ``field`` references the
+                current objects.
+
+        Returns:
+            URLs of the objects reached by the last step, sorted.
+
+        Raises:
+            ValueError: If a step names an unknown type or field.
+        """
+        steps = [self._parse_step(step) for step in path]
+        frontier = {node for node in map(self.node, start) if node is not None}
+        for record_type, field in steps:
+            if not frontier:
+                break
+            if record_type is None:
+                frontier = self._follow(frontier, field)
+            else:
+                frontier = self._referrers(frontier, record_type, field)
+        return sorted(map(self.url, frontier))
+
+    def summary(self, url: str) -> Dict[str, Any]:
+        """Describe an object by its URL, type and name, as far as known.
+
+        Args:
+            url: Object URL.
+
+        Returns:
+            Dictionary with ``id`` and, for added objects, ``type`` and
+            ``name``.
+        """
+        record = self.get(url)
+        if record is None:
+            return {"id": url}
+        result: Dict[str, Any] = {"id": url, "type": record.type_name}
+        name = getattr(record, "name", None)
+        if name is not None:
+            result["name"] = name
+        return result
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of records per OParl type."""
+        counts = dict.fromkeys(self.record_types, 0)
+        for record in self._records:
+            if record is not None:
+                counts[record.type_name] += 1
+        return {name: count for name, count in counts.items() if count}
+
+    def _add(
+        self, obj: Dict[str, Any], parent: Optional[int], back_field: Optional[str]
+    ) -> bool:
+        record_type = self.record_types.get(oparl_type_name(obj) or "")
+        url = obj.get("id")
+        if record_type is None or not isinstance(url, str):
+            return False
+
+        node = self.intern(url)
+        if obj.get("deleted") is True:
+            self._remove(node)
+            return True
+
+        # References of embedded objects back to this one, e.g. "meeting"
+        child_back_field = record_type.type_name[0].lower() + record_type.type_name[1:]
+        offsets: List[int] = []
+        targets: List[int] = []
+        for name in record_type.reference_fields:
+            value = obj.get(name)
+            if value is None and name == back_field and parent is not None:
+                targets.append(parent)
+            for item in value if isinstance(value, list) else (value,):
+                target = self._reference(item, node, child_back_field)
+                if target is not None:
+                    targets.append(target)
+            offsets.append(len(targets))
+
+        values = []
+        for name in record_type.fields:
+            value = obj.get(name)
+            # Embedded objects outside reference fields, e.g. legislative terms
+            for item in value if isinstance(value, list) else (value,):
+                if isinstance(item, dict):
+                    self._reference(item, node, child_back_field)
+            values.append(_scalar(value))
+
+        old = self._records[node]
+        record = record_type(node, array("i", offsets + targets), values)
+        if old is None:
+            self._count += 1
+        elif type(old) is not record_type:
+            self._reindex(node, old, None)
+            old = None
+        self._reindex(node, old, record)
+        self._records[node] = record
+        return True
+
+    def _reference(self, value: Any, parent: int, back_field: str) -> Optional[int]:
+        """Intern a referenced URL, adding the object if it is embedded."""
+        if isinstance(value, str):
+            return self.intern(value)
+        if isinstance(value, dict) and isinstance(value.get("id"), str):
+            self._add(value, parent, back_field)
+            return self.intern(value["id"])
+        return None
+
+    def _remove(self, node: int) -> bool:
+        record = self._records[node]
+        if record is None:
+            return False
+        self._reindex(node, record, None)
+        self._records[node] = None
+        self._count -= 1
+        return True
+
+    def _parse_step(self, step: str) -> Tuple[Optional[Type[Record]], str]:
+        if step.startswith(REVERSE_PREFIX):
+            type_name, _, field = step[len(REVERSE_PREFIX) :].partition(".")
+            record_type = self.record_types.get(type_name)
+            if record_type is None or field not in record_type.reference_index:
+                raise ValueError(
+                    f"Unknown step {step!r}; reverse steps are "
+                    f"{REVERSE_PREFIX}Type.field with a reference field of Type"
+                )
+            return record_type, field
+
+        if not any(
+            step in record_type.reference_index
+            for record_type in self.record_types.values()
+        ):
+            raise ValueError(f"Unknown reference field {step!r}")
+        return None, step
+
+    def _follow(self, frontier: Set[int], field: str) -> Set[int]:
+        reached: Set[int] = set()
+        for node in frontier:
+            record = self._records[node]
+            if record is not None and field in record.reference_index:
+                reached.update(record.targets(record.reference_index[field]))
+        return reached
+
+    def _referrers(
+        self, frontier: Set[int], record_type: Type[Record], field: str
+    ) -> Set[int]:
+        relation = self._relation_ids.get((record_type.type_name, field))
+        if relation is not None:
+            reverse = self._reverse[relation]
+            reached: Set[int] = set()
+            for node in frontier:
+                sources = reverse.get(node)
+                if sources is not None:
+                    reached.update(_iter_sources(sources))
+            return reached
+
+        index = record_type.reference_index[field]
+        return {
+            record.node
+            for record in self._records
+            if type(record) is record_type
+            and not frontier.isdisjoint(record.targets(index))
+        }
+
+    def _reindex(self, node: int, old: Optional[Record], new: Optional[Record]) -> None:
+        """Update the reverse index from one version of a record to the next."""
+        record = new if new is not None else old
+        assert record is not None
+        for index, relation in enumerate(self._type_relations[record.type_name]):
+            if relation is None:
+                continue
+            before = set(old.targets(index)) if old is not None else set()
+            after = set(new.targets(index)) if new is not None else set()
+            reverse = self._reverse[relation]
+            for target in before - after:
+                sources = reverse.get(target)
+                if isinstance(sources, int):
+                    del reverse[target]
+                elif sources is not None:
+                    sources.remove(node)
+                    if len(sources) == 1:
+                        reverse[target] = sources[0]
+            for target in after - before:
+                sources = reverse.get(target)
+                if sources is None:
+                    reverse[target] = node
+                elif isinstance(sources, int):
+                    reverse[target] = array("i", (sources, node))
+                else:
+                    sources.append(node)
+
+
+def _iter_sources(sources: Sources) -> Iterable[int]:
+    """Iterate over the node IDs of a reverse index entry."""
+    return (sources,) if isinstance(sources, int) else sources
@@ -0,0 +1,236 @@
+"""Incremental harvesting of OParl bodies."""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import httpx
+
+from .cache import ObjectListener
+from .pagination import PageFetcher, iter_collection
+from .utils import build_query_params, extract_resource_id, parse_oparl_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Collections of a body that are harvested, in dependency order.
+HARVESTED_COLLECTIONS = ("organization", "person", "meeting", "paper")
+
+# Collections whose endpoint accepts the ``start``/``end`` date filters.
+DATE_FILTERED_COLLECTIONS = {"meeting"}
+
+
+class CheckpointStore:
+    """High-water marks per collection, persisted as a JSON file."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Load checkpoints.
+
+        Args:
+            path: JSON file to persist checkpoints in. If None, checkpoints
+                only live in memory.
+        """
+        self.path = Path(path) if path else None
+        self._marks: Dict[str, str] = {}
+
+        if self.path is not None and self.path.exists():
+            try:
+                self._marks = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load harvest checkpoints: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the high-water mark of a collection."""
+        return self._marks.get(key)
+
+    def set(self, key: str, mark: str) -> None:
+        """Set the high-water mark of a collection and persist it."""
+        self._marks[key] = mark
+        self.save()
+
+    def save(self) -> None:
+        """Write checkpoints to disk atomically."""
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self._marks, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def as_dict(self) -> Dict[str, str]:
+        """Return all checkpoints."""
+        return dict(self._marks)
+
+
+class Harvester:
+    """Walks the collections of OParl bodies and fetches changed objects.
+
+    For every collection the newest ``modified`` (or ``created``) timestamp
+    seen is recorded. Later runs ask the server only for objects changed
+    since then with the OParl 1.1 ``modified_since`` filter, and meeting lists
+    are additionally narrowed with the ``start`` filter. Servers that ignore
+    the filters still work; unchanged objects are then skipped locally.
+
+    Fetched objects pass through the client's transport, so a caching
+    transport with an object store and listeners persists and indexes them.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        checkpoints: Optional[CheckpointStore] = None,
+        bodies: Optional[Iterable[str]] = None,
+        page_size: int = 100,
+        meeting_lookback_days: Optional[int] = 90,
+        fetcher: Optional[PageFetcher] = None,
+        on_objects: Optional[ObjectListener] = None,
+    ):
+        """Initialize the harvester.
+
+        Args:
+            client: HTTP client for the OParl API.
+            checkpoints: Checkpoint store. If None, checkpoints live in memory.
+            bodies: Body IDs to harvest. If None, all bodies are discovered.
+            page_size: Items requested per page.
+            meeting_lookback_days: On incremental runs, only fetch meetings
+                starting this many days before the checkpoint or later.
+                None disables the date filter.
+            fetcher: Page fetcher for concurrent page prefetching.
+            on_objects: Callback receiving changed objects of every page.
+        """
+        self.client = client
+        self.checkpoints = checkpoints or CheckpointStore()
+        self.bodies = list(bodies) if bodies else None
+        self.page_size = page_size
+        self.meeting_lookback_days = meeting_lookback_days
+        self.fetcher = fetcher or PageFetcher(client)
+        self.on_objects = on_objects
+
+    async def discover_bodies(self) -> List[str]:
+        """Get the IDs of all bodies of the OParl system.
+
+        Returns:
+            Body IDs.
+        """
+        bodies = []
+        async for body in iter_collection(
+            self.client, "/body", build_query_params(limit=self.page_size)
+        ):
+            body_id = extract_resource_id(body.get("id", ""))
+            if body_id:
+                bodies.append(body_id)
+        return bodies
+
+    async def run_once(self) -> Dict[str, int]:
+        """Harvest every configured body once.
+
+        Returns:
+            Number of changed objects per collection path.
+        """
+        bodies = self.bodies or await self.discover_bodies()
+        report: Dict[str, int] = {}
+        for body_id in bodies:
+            report.update(await self.harvest_body(body_id))
+        return report
+
+    async def harvest_body(self, body_id: str) -> Dict[str, int]:
+        """Harvest the collections of one body.
+
+        Args:
+            body_id: Body identifier.
+
+        Returns:
+            Number of changed objects per collection path.
+        """
+        report = {}
+        for collection in HARVESTED_COLLECTIONS:
+            path = f"/body/{body_id}/{collection}"
+            try:
+                report[path] = await self.harvest_collection(path, collection)
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to harvest {path}: {e}")
+        return report
+
+    async def harvest_collection(self, path: str, collection: str) -> int:
+        """Fetch the objects of a collection changed since its checkpoint.
+
+        Args:
+            path: Collection path.
+            collection: Collection name, e.g. ``paper``.
+
+        Returns:
+            Number of changed objects.
+        """
+        key = str(self.client.base_url).rstrip("/") + path
+        mark = self.checkpoints.get(key)
+        mark_time = parse_oparl_timestamp(mark)
+
+        params = build_query_params(
+            limit=self.page_size,
+            start_date=self._meeting_start(mark_time, collection),
+            modified_since=mark,
+        )
+
+        newest = mark_time
+        changed: List[Dict[str, Any]] = []
+        count = 0
+
+        async for item in iter_collection(
+            self.client, path, params, fetcher=self.fetcher
+        ):
+            stamp = parse_oparl_timestamp(item.get("modified") or item.get("created"))
+            if mark_time is not None and stamp is not None and stamp <= mark_time:
+                continue
+
+            count += 1
+            changed.append(item)
+            if stamp is not None and (newest is None or stamp > newest):
+                newest = stamp
+
+            if len(changed) >= self.page_size:
+                self._emit(changed)
+                changed = []
+
+        self._emit(changed)
+
+        if newest is not None and newest != mark_time:
+            self.checkpoints.set(key, newest.isoformat())
+
+        logger.info(f"Harvested {count} changed objects from {path}")
+        return count
+
+    async def run_forever(self, interval: float) -> None:
+        """Harvest repeatedly until cancelled.
+
+        Args:
+            interval: Seconds to wait between runs.
+        """
+        while True:
+            try:
+                report = await self.run_once()
+                logger.info(
+                    f"Harvest run finished, {sum(report.values())} changed objects"
+                )
+            except Exception as e:
+                logger.error(f"Harvest run failed: {e}")
+            await asyncio.sleep(interval)
+
+    def _meeting_start(
+        self, mark_time: Optional[datetime], collection: str
+    ) -> Optional[str]:
+        if (
+            collection not in DATE_FILTERED_COLLECTIONS
+            or mark_time is None
+            or self.meeting_lookback_days is None
+        ):
+            return None
+        start = mark_time - timedelta(days=self.meeting_lookback_days)
+        return start.date().isoformat()
+
+    def _emit(self, objects: List[Dict[str, Any]]) -> None:
+        if objects and self.on_objects is not None:
+            self.on_objects(objects)
@@ -0,0 +1,497 @@
+"""Prometheus-style metrics for upstream and MCP traffic."""
+
+import logging
+import re
+import time
+from bisect import bisect_left
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Tuple
+
+import httpx
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from cache hits to slow upstream pages.
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+Collector = Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase the counter for a label combination."""
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """Decrease the gauge for a label combination."""
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the gauge for a label combination."""
+        self.values[labels] = value
+
+
+class Histogram(_Metric):
+    """Histogram with fixed buckets and labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+        # Per label combination: non-cumulative bucket counts (last one is
+        # +Inf), sum and count
+        self.values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation for a label combination."""
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        names = self.labels + ("le",)
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(names, key + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {repr(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of the OParl MCP server.
+
+    Hot-path metrics are plain in-process counters updated without locking,
+    since the server runs on a single event loop. Values owned by other
+    components, such as cache statistics and pool usage, are read by
+    collectors only when metrics are rendered.
+    """
+
+    def __init__(self) -> None:
+        """Create the server's metrics."""
+        self.upstream_duration = Histogram(
+            "oparl_upstream_request_duration_seconds",
+            "Upstream request duration until the response body was read.",
+            ("system", "route", "method"),
+        )
+        self.upstream_responses = Counter(
+            "oparl_upstream_responses_total",
+            "Upstream responses by status code.",
+            ("system", "route", "status"),
+        )
+        self.upstream_errors = Counter(
+            "oparl_upstream_errors_total",
+            "Upstream requests that failed without a response.",
+            ("system", "route", "error"),
+        )
+        self.upstream_bytes = Counter(
+            "oparl_upstream_response_bytes_total",
+            "Bytes received from upstream.",
+            ("system", "route"),
+        )
+        self.upstream_in_flight = Gauge(
+            "oparl_upstream_requests_in_flight",
+            "Upstream requests currently in flight.",
+            ("system",),
+        )
+        self.mcp_duration = Histogram(
+            "oparl_mcp_request_duration_seconds",
+            "MCP request handling time.",
+            ("method", "name", "outcome"),
+        )
+        self._metrics: List[_Metric] = [
+            self.upstream_duration,
+            self.upstream_responses,
+            self.upstream_errors,
+            self.upstream_bytes,
+            self.upstream_in_flight,
+            self.mcp_duration,
+        ]
+        self._collectors: List[Collector] = []
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callback providing values when metrics are rendered.
+
+        Args:
+            collector: Callable returning ``(name, kind, help, labels, value)``
+                tuples.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text.
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        collected: Dict[str, List[Tuple[str, str, Dict[str, str], float]]] = {}
+        for collector in self._collectors:
+            try:
+                for name, kind, help_text, labels, value in collector():
+                    collected.setdefault(name, []).append(
+                        (kind, help_text, labels, value)
+                    )
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+
+        for name, samples in collected.items():
+            kind, help_text = samples[0][0], samples[0][1]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for _, _, labels, value in samples:
+                label_text = _format_labels(
+                    tuple(labels), tuple(str(v) for v in labels.values())
+                )
+                lines.append(f"{name}{label_text} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class RouteMatcher:
+    """Maps request paths to OpenAPI path templates for metric labels."""
+
+    def __init__(self, paths: Iterable[str]):
+        """Compile the path templates.
+
+        Args:
+            paths: OpenAPI paths such as ``/body/{bodyId}/paper``.
+        """
+        # Longer templates first so that more specific routes win
+        self._routes = [
+            (re.compile("^" + re.sub(r"\{[^/]+\}", "[^/]+", path) + "/?$"), path)
+            for path in sorted(paths, key=len, reverse=True)
+        ]
+
+    def match(self, path: str) -> str:
+        """Get the route template of a path.
+
+        Args:
+            path: Request path, relative to the API base.
+
+        Returns:
+            Matching template, or ``other`` for unknown paths so that label
+            cardinality stays bounded.
+        """
+        for pattern, template in self._routes:
+            if pattern.match(path):
+                return template
+        return "other"
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """Response stream recording duration and size once it is closed."""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_close: Callable[[int], None],
+    ):
+        self._stream = stream
+        self._on_close = on_close
+        self._bytes = 0
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close(self._bytes)
+
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """HTTP transport recording upstream request metrics per OpenAPI route."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        metrics: MetricsRegistry,
+        routes: RouteMatcher,
+        system: str = "default",
+        base_path: str = "",
+    ):
+        """Wrap a transport.
+
+        Args:
+            transport: Transport performing the upstream requests.
+            metrics: Registry to record into.
+            routes: Matcher for route labels.
+            system: Name of the OParl system, used as a label.
+            base_path: Path prefix of the API, stripped before matching.
+        """
+        self._transport = transport
+        self.metrics = metrics
+        self.routes = routes
+        self.system = system
+        self.base_path = base_path.rstrip("/")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Forward the request and record its metrics."""
+        metrics = self.metrics
+        path = request.url.path
+        if self.base_path and path.startswith(self.base_path):
+            path = path[len(self.base_path) :]
+        route = self.routes.match(path)
+        system = self.system
+
+        metrics.upstream_in_flight.inc(system)
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as e:
+            metrics.upstream_in_flight.dec(system)
+            metrics.upstream_errors.inc(system, route, type(e).__name__)
+            raise
+
+        def on_close(size: int) -> None:
+            metrics.upstream_in_flight.dec(system)
+            metrics.upstream_duration.observe(
+                time.perf_counter() - start, system, route, request.method
+            )
+            metrics.upstream_responses.inc(system, route, str(response.status_code))
+            metrics.upstream_bytes.inc(system, route, amount=size)
+
+        if response.is_closed:
+            # Responses with in-memory content are already read and closed
+            on_close(len(response.content))
+        else:
+            assert isinstance(response.stream, httpx.AsyncByteStream)
+            response.stream = _MeteredStream(response.stream, on_close)
+        return response
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
+
+
+class MetricsMiddleware(Middleware):
+    """FastMCP middleware recording MCP request handling time."""
+
+    def __init__(self, metrics: MetricsRegistry):
+        """Initialize the middleware.
+
+        Args:
+            metrics: Registry to record into.
+        """
+        self.metrics = metrics
+
+    async def on_request(self, context: MiddlewareContext, call_next: CallNext) -> Any:
+        """Time the request."""
+        method = context.method or "unknown"
+        # Tool names are bounded; resource URIs contain IDs and are not used
+        name = getattr(context.message, "name", "") if method == "tools/call" else ""
+
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call_next(context)
+            outcome = "ok"
+            return result
+        finally:
+            self.metrics.mcp_duration.observe(
+                time.perf_counter() - start, method, name, outcome
+            )
+
+
+def pool_collector(
+    transports: List[Tuple[str, httpx.AsyncBaseTransport]],
+) -> Collector:
+    """Create a collector reporting connection pool usage.
+
+    Args:
+        transports: HTTP transports with the name of their OParl system. The
+            list may grow after the collector is created.
+
+    Returns:
+        Collector for active and idle pooled connections per system.
+    """
+
+    def collect() -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+        usage: Dict[str, List[int]] = {}
+        for system, transport in transports:
+            pool = getattr(transport, "_pool", None)
+            if pool is None:
+                continue
+            connections = list(pool.connections)
+            idle = sum(1 for connection in connections if connection.is_idle())
+            totals = usage.setdefault(system, [0, 0, 0])
+            totals[0] += len(connections) - idle
+            totals[1] += idle
+            totals[2] += pool._max_connections
+
+        for system, (active, idle, limit) in usage.items():
+            for state, value in (("active", active), ("idle", idle)):
+                yield (
+                    "oparl_pool_connections",
+                    "gauge",
+                    "Pooled upstream connections.",
+                    {"system": system, "state": state},
+                    value,
+                )
+            yield (
+                "oparl_pool_max_connections",
+                "gauge",
+                "Maximum upstream connections.",
+                {"system": system},
+                limit,
+            )
+
+    return collect
+
+
+def stats_collector(
+    prefix: str,
+    help_text: str,
+    stats: Callable[[], Dict[str, Any]],
+    gauges: Iterable[str] = (),
+) -> Collector:
+    """Create a collector exposing a stats dictionary.
+
+    Args:
+        prefix: Metric name prefix, e.g. ``oparl_cache``.
+        help_text: Help text of the metrics.
+        stats: Callable returning values by name.
+        gauges: Names of values that are gauges rather than counters.
+
+    Returns:
+        Collector emitting ``<prefix>_<name>_total`` counters and
+        ``<prefix>_<name>`` gauges.
+    """
+    gauge_names = set(gauges)
+
+    def collect() -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+        for name, value in stats().items():
+            if name in gauge_names:
+                yield (f"{prefix}_{name}", "gauge", help_text, {}, value)
+            else:
+                yield (f"{prefix}_{name}_total", "counter", help_text, {}, value)
+
+    return collect
+
+
+def register_metrics(mcp: Any, metrics: MetricsRegistry) -> None:
+    """Expose metrics over MCP and HTTP.
+
+    Registers the ``resource://metrics`` resource for stdio clients, a
+    ``/metrics`` route served when running over an HTTP transport, and the
+    middleware timing MCP requests.
+
+    Args:
+        mcp: FastMCP server.
+        metrics: Registry to expose.
+    """
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    mcp.add_middleware(MetricsMiddleware(metrics))
+
+    @mcp.resource(
+        "resource://metrics",
+        name="metrics",
+        description="Server metrics in the Prometheus text format",
+        mime_type="text/plain",
+        tags={"oparl", "metrics"},
+    )
+    def metrics_resource() -> str:
+        return metrics.render()
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics_endpoint(request: Request) -> Response:
+        return Response(metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,193 @@
+"""Normalization of OParl responses.
+
+The :class:`ResponseNormalizer` brings the date and date-time fields of OParl
+objects into ISO 8601 form. It decides once per object type and field name
+whether a field holds a date, walks nested objects and lists in a single
+pass, and only copies the objects it changes, so the input stays untouched
+and may be shared with the response cache.
+"""
+
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Mapping, Optional, Set
+
+DATE = "date"
+DATE_TIME = "date-time"
+
+# Date fields of the OParl 1.1 object types, besides created and modified
+OPARL_DATE_FIELDS: Dict[str, Dict[str, str]] = {
+    "Body": {"licenseValidSince": DATE, "oparlSince": DATE_TIME},
+    "LegislativeTerm": {"startDate": DATE, "endDate": DATE},
+    "Organization": {"startDate": DATE, "endDate": DATE},
+    "Membership": {"startDate": DATE, "endDate": DATE},
+    "Meeting": {"start": DATE_TIME, "end": DATE_TIME},
+    "AgendaItem": {"start": DATE_TIME, "end": DATE_TIME},
+    "Paper": {"date": DATE},
+    "File": {"date": DATE, "fileModified": DATE_TIME},
+}
+
+COMMON_DATE_FIELDS = {"created": DATE_TIME, "modified": DATE_TIME}
+
+# Endings of field names treated as date-times if not listed for the type
+_DATE_SUFFIXES = ("Date", "Time", "created", "modified")
+
+# Values that already are in the form produced by ``isoformat()``
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_ISO_DATE_TIME = re.compile(
+    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{6})?([+-]\d{2}:\d{2})?"
+)
+
+_TYPE_PREFIX = "https://schema.oparl.org/"
+
+_CONTAINER_TYPES = (dict, list)
+
+# Bound on the number of distinct type values with a compiled plan
+_MAX_PLANS = 256
+
+
+class ResponseNormalizer:
+    """Normalize the dates of OParl responses.
+
+    The decisions which fields of a type are dates are compiled on first use
+    and reused for every further object of that type, so a page of a
+    thousand papers costs a thousand dictionary lookups per field rather
+    than a thousand suffix checks and parse attempts.
+    """
+
+    def __init__(self, date_fields: Optional[Mapping[str, Mapping[str, str]]] = None):
+        """Initialize the normalizer.
+
+        Args:
+            date_fields: Date fields per object type, mapping field names to
+                ``date`` or ``date-time``. If None, uses the OParl 1.1 fields.
+        """
+        self.date_fields = OPARL_DATE_FIELDS if date_fields is None else date_fields
+        self._plans: Dict[Any, _Plan] = {}
+
+    def normalize(self, data: Any, formatted_at: Optional[str] = None) -> Any:
+        """Normalize a response without modifying it.
+
+        Args:
+            data: Decoded response: an object, a collection page or a list.
+            formatted_at: Timestamp for the ``_meta`` block. If None, the
+                current time is used.
+
+        Returns:
+            The normalized response. Objects are copied only if they change;
+            a top-level object additionally gets a ``_meta`` block.
+        """
+        result = self._walk(data)
+        if isinstance(result, dict) and "_meta" not in result:
+            if result is data:
+                result = dict(data)
+            result["_meta"] = {
+                "oparl_version": "1.1",
+                "formatted_at": formatted_at or datetime.now().isoformat(),
+                "source": "oparl-mcp-server",
+            }
+        return result
+
+    def _plan(self, type_value: Any) -> "_Plan":
+        """Get the plan of an object type, by the value of its type field."""
+        plan = self._plans.get(type_value)
+        if plan is None:
+            dates = dict(COMMON_DATE_FIELDS)
+            if isinstance(type_value, str) and type_value.startswith(_TYPE_PREFIX):
+                dates.update(self.date_fields.get(type_value.rsplit("/", 1)[-1], {}))
+            plan = _Plan(dates)
+            if len(self._plans) < _MAX_PLANS:
+                self._plans[type_value] = plan
+        return plan
+
+    def _walk(self, value: Any) -> Any:
+        if type(value) is list:
+            # OParl arrays hold either references or objects, not both
+            if not value or type(value[0]) not in (dict, list):
+                return value
+            items = None
+            for i, item in enumerate(value):
+                normalized = self._walk(item)
+                if normalized is not item:
+                    if items is None:
+                        items = list(value)
+                    items[i] = normalized
+            return value if items is None else items
+
+        if type(value) is not dict:
+            return value
+
+        plan = self._plan(value.get("type"))
+        keys = value.keys()
+        plan.learn(value)
+
+        result = None
+        for key in plan.dates.keys() & keys:
+            field_value = value[key]
+            if type(field_value) is str:
+                normalized = _normalize_date(field_value, plan.dates[key])
+                if normalized is not field_value:
+                    if result is None:
+                        result = dict(value)
+                    result[key] = normalized
+
+        for key in plan.containers & keys:
+            field_value = value[key]
+            if type(field_value) is list and (
+                not field_value or type(field_value[0]) is str
+            ):
+                continue
+            normalized = self._walk(field_value)
+            if normalized is not field_value:
+                if result is None:
+                    result = dict(value)
+                result[key] = normalized
+
+        return value if result is None else result
+
+
+class _Plan:
+    """Date and nested fields of one object type, learned from its objects.
+
+    Date fields are classified when they are first seen, assuming that a
+    field holds the same kind of value in every object of a type, as OParl
+    prescribes. A field becomes a container once any object holds an array
+    or object in it, even if earlier objects held None or a scalar.
+    """
+
+    __slots__ = ("dates", "containers", "known")
+
+    def __init__(self, dates: Dict[str, str]):
+        self.dates = dates
+        self.containers: Set[str] = set()
+        self.known: Set[str] = set()
+
+    def learn(self, obj: Dict[str, Any]) -> None:
+        """Classify new fields, and fields now holding an array or object."""
+        containers = self.containers
+        known = self.known
+        for key, value in obj.items():
+            if key in containers:
+                continue
+            if type(value) in _CONTAINER_TYPES:
+                containers.add(key)
+            elif key in known:
+                continue
+            elif key not in self.dates and key.endswith(_DATE_SUFFIXES):
+                self.dates[key] = DATE_TIME
+            known.add(key)
+
+
+def _normalize_date(value: str, kind: str) -> str:
+    # Dates and date-times already in isoformat() form are the common case
+    if _ISO_DATE_TIME.fullmatch(value) or _ISO_DATE.fullmatch(value):
+        return value
+    try:
+        if kind == DATE and len(value) == 8:
+            # Basic format, e.g. 20240115
+            normalized = date.fromisoformat(value).isoformat()
+        else:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            normalized = parsed.isoformat()
+    except ValueError:
+        return value
+    return value if normalized == value else normalized
@@ -0,0 +1,438 @@
+"""Pagination engine for OParl collection endpoints."""
+
+import asyncio
+import logging
+import re
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from .codec import dumps, response_json
+
+logger = logging.getLogger(__name__)
+
+# Collection endpoints that return paginated ``data`` lists.
+COLLECTION_PATTERNS = [
+    re.compile(r"/body/?$"),
+    re.compile(r"/body/[^/]+/(organization|person|meeting|paper)/?$"),
+    re.compile(r"/meeting/[^/]+/agendaItem/?$"),
+]
+
+
+PageCallback = Callable[["CollectionResult"], Awaitable[None]]
+
+
+def is_collection_path(path: str) -> bool:
+    """Check whether a path points to a paginated OParl collection.
+
+    Args:
+        path: URL path, relative to the API base URL.
+
+    Returns:
+        True if the path is a collection endpoint.
+    """
+    return any(pattern.search(path) for pattern in COLLECTION_PATTERNS)
+
+
+@dataclass
+class Page:
+    """A single page of an OParl collection."""
+
+    url: str
+    items: List[Dict[str, Any]]
+    pagination: Dict[str, Any]
+    links: Dict[str, Any]
+    size: int
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        """Total number of pages, if reported by the server."""
+        value = self.pagination.get("totalPages")
+        return value if isinstance(value, int) else None
+
+    @property
+    def total_elements(self) -> Optional[int]:
+        """Total number of items, if reported by the server."""
+        value = self.pagination.get("totalElements")
+        return value if isinstance(value, int) else None
+
+
+@dataclass
+class CollectionResult:
+    """Items collected from a paginated collection."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    pages: int = 0
+    bytes: int = 0
+    total: Optional[int] = None
+    truncated: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON-serializable dictionary."""
+        return {
+            "items": self.items,
+            "count": len(self.items),
+            "pages": self.pages,
+            "total": self.total,
+            "truncated": self.truncated,
+        }
+
+
+def parse_page(url: str, response: httpx.Response) -> Page:
+    """Decode a collection response into a page.
+
+    Args:
+        url: URL the page was fetched from.
+        response: Successful HTTP response.
+
+    Returns:
+        Parsed page.
+    """
+    data = response_json(response)
+    if isinstance(data, list):
+        data = {"data": data}
+
+    items = data.get("data") or []
+    return Page(
+        url=url,
+        items=[item for item in items if isinstance(item, dict)],
+        pagination=data.get("pagination") or {},
+        links=data.get("links") or {},
+        size=len(response.content),
+    )
+
+
+def next_page_request(
+    page: Page, params: Dict[str, Any], base_url: Optional[str] = None
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Work out the request for the page following ``page``.
+
+    OParl 1.1 servers link the next page under ``links.next``. Servers that
+    only report a ``pagination`` object are paged with ``offset``. A next
+    link to another origin than the current page is not followed, so that
+    the client's credentials are only sent to the OParl server.
+
+    Args:
+        page: The current page.
+        params: Query parameters used for the current page.
+        base_url: Base URL of the client, the origin of relative page URLs.
+
+    Returns:
+        URL and query parameters of the next page, or None on the last page.
+    """
+    next_url = page.links.get("next")
+    if isinstance(next_url, str) and next_url:
+        if not _same_origin(next_url, page.url, base_url):
+            logger.warning(
+                f"Not following next link of {page.url} to another origin: "
+                f"{next_url}"
+            )
+            return None
+        return next_url, {}
+
+    if not page.items or not page.pagination.get("hasNext"):
+        return None
+
+    next_params = dict(params)
+    page_size = page.pagination.get("pageSize") or len(page.items)
+    next_params["offset"] = int(params.get("offset", 0)) + page_size
+    return page.url, next_params
+
+
+def _same_origin(url: str, page_url: str, base_url: Optional[str]) -> bool:
+    """Check whether a URL has the scheme, host and port of a page."""
+    target = httpx.URL(url)
+    if target.is_relative_url:
+        return True
+    current = httpx.URL(page_url)
+    if current.is_relative_url:
+        if base_url is None:
+            return False
+        current = httpx.URL(base_url)
+    return (target.scheme, target.host, target.port) == (
+        current.scheme,
+        current.host,
+        current.port,
+    )
+
+
+async def fetch_page(
+    client: httpx.AsyncClient, url: str, params: Optional[Dict[str, Any]] = None
+) -> Page:
+    """Fetch and parse a single collection page.
+
+    Args:
+        client: HTTP client for the OParl API.
+        url: Collection path or absolute page URL.
+        params: Query parameters.
+
+    Returns:
+        Parsed page.
+    """
+    response = await client.get(url, params=params or None)
+    response.raise_for_status()
+    return parse_page(url, response)
+
+
+async def iter_pages(
+    client: httpx.AsyncClient, path: str, params: Optional[Dict[str, Any]] = None
+) -> AsyncGenerator[Page, None]:
+    """Walk all pages of a collection in order.
+
+    Args:
+        client: HTTP client for the OParl API.
+        path: Collection path, relative to the client's base URL.
+        params: Query parameters for the first page.
+
+    Yields:
+        Each page of the collection.
+    """
+    request: Optional[Tuple[str, Dict[str, Any]]] = (path, dict(params or {}))
+    seen = set()
+
+    while request is not None:
+        url, page_params = request
+        marker = (url, tuple(sorted(page_params.items())))
+        if marker in seen:
+            logger.warning(f"Pagination loop detected at {url}, stopping")
+            return
+        seen.add(marker)
+
+        page = await fetch_page(client, url, page_params)
+        yield page
+        request = next_page_request(page, page_params, str(client.base_url))
+
+
+class PageFetcher:
+    """Fetches collection pages concurrently with bounded parallelism.
+
+    Once the first page of an offset-paginated collection reports
+    ``totalPages``, the following pages are requested ahead of time in a
+    sliding window and handed out in order. Concurrency is bounded both in
+    total and per upstream host; the limits are shared by every walk that
+    uses the same fetcher.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        prefetch: int = 4,
+        max_concurrency: int = 16,
+        per_host_limit: int = 6,
+    ):
+        """Initialize the page fetcher.
+
+        Args:
+            client: HTTP client for the OParl API.
+            prefetch: Number of pages requested ahead of the one being consumed.
+            max_concurrency: Maximum number of page requests in flight overall.
+            per_host_limit: Maximum number of page requests in flight per host.
+        """
+        self.client = client
+        self.prefetch = max(prefetch, 0)
+        self.per_host_limit = per_host_limit
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host or self.client.base_url.host
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def fetch(self, url: str, params: Optional[Dict[str, Any]] = None) -> Page:
+        """Fetch a single page within the concurrency limits.
+
+        Args:
+            url: Collection path or absolute page URL.
+            params: Query parameters.
+
+        Returns:
+            Parsed page.
+        """
+        async with self._semaphore, self._host_semaphore(url):
+            return await fetch_page(self.client, url, params)
+
+    async def iter_pages(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[Page, None]:
+        """Walk all pages of a collection, prefetching ahead where possible.
+
+        Args:
+            path: Collection path, relative to the client's base URL.
+            params: Query parameters for the first page.
+
+        Yields:
+            Each page of the collection, in order.
+        """
+        params = dict(params or {})
+        first = await self.fetch(path, params)
+        yield first
+
+        offsets = _remaining_offsets(first, params)
+        if offsets is None or self.prefetch == 0:
+            # Link-based pagination only reveals one page at a time.
+            base_url = str(self.client.base_url)
+            request = next_page_request(first, params, base_url)
+            while request is not None:
+                url, page_params = request
+                page = await self.fetch(url, page_params)
+                yield page
+                request = next_page_request(page, page_params, base_url)
+            return
+
+        pending: List["asyncio.Task[Page]"] = []
+        try:
+            for offset in offsets:
+                pending.append(
+                    asyncio.create_task(self.fetch(path, {**params, "offset": offset}))
+                )
+                if len(pending) > self.prefetch:
+                    page = await pending.pop(0)
+                    yield page
+                    if not page.items:
+                        return
+            while pending:
+                page = await pending.pop(0)
+                yield page
+                if not page.items:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _remaining_offsets(page: Page, params: Dict[str, Any]) -> Optional[List[int]]:
+    """Compute the offsets of the pages after ``page`` if they are predictable."""
+    if page.links.get("next") or not page.pagination.get("hasNext"):
+        return None
+
+    total_pages = page.total_pages
+    page_size = page.pagination.get("pageSize") or len(page.items)
+    if total_pages is None or not page_size:
+        return None
+
+    start = int(params.get("offset", 0))
+    current = start // page_size
+    return [start + i * page_size for i in range(1, total_pages - current)]
+
+
+async def iter_collection(
+    client: httpx.AsyncClient,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_items: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    fetcher: Optional[PageFetcher] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream the items of a collection across all of its pages.
+
+    Args:
+        client: HTTP client for the OParl API.
+        path: Collection path, relative to the client's base URL.
+        params: Query parameters for the first page.
+        max_items: Stop after this many items.
+        max_bytes: Stop before the JSON size of the yielded items exceeds this.
+        fetcher: Page fetcher used to prefetch pages concurrently. If None,
+            pages are fetched one after another.
+
+    Yields:
+        Collection items in server order.
+    """
+    result = CollectionResult()
+    async for item in _walk(
+        client, path, params, max_items, max_bytes, result, fetcher=fetcher
+    ):
+        yield item
+
+
+async def collect_collection(
+    client: httpx.AsyncClient,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_items: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    on_page: Optional[PageCallback] = None,
+    fetcher: Optional[PageFetcher] = None,
+) -> CollectionResult:
+    """Collect the items of a collection across all of its pages.
+
+    Args:
+        client: HTTP client for the OParl API.
+        path: Collection path, relative to the client's base URL.
+        params: Query parameters for the first page.
+        max_items: Stop after this many items.
+        max_bytes: Stop before the JSON size of the collected items exceeds this.
+        on_page: Optional async callback invoked with the running result after
+            every page, e.g. to report MCP progress.
+        fetcher: Page fetcher used to prefetch pages concurrently. If None,
+            pages are fetched one after another.
+
+    Returns:
+        Collected items and paging statistics.
+    """
+    result = CollectionResult()
+    async for item in _walk(
+        client, path, params, max_items, max_bytes, result, on_page, fetcher
+    ):
+        result.items.append(item)
+    return result
+
+
+async def _walk(
+    client: httpx.AsyncClient,
+    path: str,
+    params: Optional[Dict[str, Any]],
+    max_items: Optional[int],
+    max_bytes: Optional[int],
+    result: CollectionResult,
+    on_page: Optional[PageCallback] = None,
+    fetcher: Optional[PageFetcher] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    emitted = 0
+    pages = (
+        fetcher.iter_pages(path, params)
+        if fetcher is not None
+        else iter_pages(client, path, params)
+    )
+
+    # Close the page iterator on early exit so that prefetches are cancelled.
+    async with aclosing(pages):
+        async for page in pages:
+            result.pages += 1
+            if result.total is None:
+                result.total = page.total_elements
+
+            for item in page.items:
+                if max_items is not None and emitted >= max_items:
+                    result.truncated = True
+                    return
+
+                if max_bytes is not None:
+                    size = len(dumps(item))
+                    if result.bytes + size > max_bytes:
+                        result.truncated = True
+                        return
+                    result.bytes += size
+
+                emitted += 1
+                yield item
+
+            if on_page is not None:
+                await on_page(result)
@@ -0,0 +1,116 @@
+"""Projection of OParl objects to smaller representations.
+
+Full OParl objects carry metadata that rarely matters to a language model,
+such as timestamps, licenses and web links, and arrays of references or
+files that can grow long. Projection removes them before results are sent
+to the client, which saves tokens as well as serialization time.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .utils import create_oparl_summary
+
+PROFILES = ("summary", "standard", "full")
+
+# Fields dropped by the standard profile
+OMITTED_FIELDS = frozenset({"created", "modified", "license", "web"})
+
+# Fields kept by every projection
+IDENTITY_FIELDS = ("id", "type")
+
+
+def validate_profile(profile: str) -> None:
+    """Check that a projection profile exists.
+
+    Args:
+        profile: Profile name.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"profile must be one of {', '.join(PROFILES)}")
+
+
+def project(
+    obj: Dict[str, Any],
+    profile: str = "standard",
+    fields: Optional[Sequence[str]] = None,
+    max_items: int = 5,
+) -> Dict[str, Any]:
+    """Project an OParl object without modifying it.
+
+    Profiles:
+
+    * ``summary``: ``id``, ``type`` and a one-line summary from
+      :func:`create_oparl_summary`
+    * ``standard``: all fields except metadata such as ``created``,
+      ``modified``, ``license`` and ``web``, and without empty values.
+      Arrays longer than ``max_items`` are cut to their first items and
+      their length is added as ``<field>Count``. Nested objects are
+      projected the same way.
+    * ``full``: the unchanged object
+
+    Args:
+        obj: OParl object.
+        profile: Projection profile.
+        fields: Fields to keep instead of using a profile; ``id`` and
+            ``type`` are always kept.
+        max_items: Maximum array length in the standard profile.
+
+    Returns:
+        Projected object; the input object is returned for the full profile.
+    """
+    if fields:
+        return {
+            key: obj[key]
+            for key in dict.fromkeys([*IDENTITY_FIELDS, *fields])
+            if key in obj
+        }
+    if profile == "full":
+        return obj
+    if profile == "summary":
+        result = {key: obj[key] for key in IDENTITY_FIELDS if key in obj}
+        result["summary"] = create_oparl_summary(obj)
+        return result
+
+    result = {}
+    for key, value in obj.items():
+        if key in OMITTED_FIELDS or value is None or value == "" or value == []:
+            continue
+        if key == "deleted" and value is False:
+            continue
+        if isinstance(value, dict):
+            value = project(value, max_items=max_items)
+        elif isinstance(value, list):
+            if len(value) > max_items:
+                result[f"{key}Count"] = len(value)
+                value = value[:max_items]
+            value = [
+                project(item, max_items=max_items) if isinstance(item, dict) else item
+                for item in value
+            ]
+        result[key] = value
+    return result
+
+
+def project_all(
+    objects: List[Dict[str, Any]],
+    profile: str = "standard",
+    fields: Optional[Sequence[str]] = None,
+    max_items: int = 5,
+) -> List[Dict[str, Any]]:
+    """Project a list of OParl objects.
+
+    Args:
+        objects: OParl objects.
+        profile: Projection profile.
+        fields: Fields to keep instead of using a profile.
+        max_items: Maximum array length in the standard profile.
+
+    Returns:
+        Projected objects.
+    """
+    if profile == "full" and not fields:
+        return objects
+    return [project(obj, profile, fields, max_items) for obj in objects]
@@ -0,0 +1,143 @@
+"""Background refresh of cached upstream responses."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Coroutine function refreshing one cache entry.
+RefreshFn = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class RefreshStats:
+    """Counters for background refreshes."""
+
+    scheduled: int = 0
+    completed: int = 0
+    failed: int = 0
+    dropped: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return {
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+
+@dataclass
+class RefreshScheduler:
+    """Pool of asyncio workers refreshing cache entries in the background.
+
+    Each key is queued at most once at a time, and at most ``workers``
+    refreshes run concurrently. When ``queue_size`` refreshes are waiting,
+    further ones are dropped; the entry is then refreshed by the next
+    request that finds it stale. Workers are started on the first refresh,
+    in the event loop that schedules it.
+    """
+
+    workers: int = 4
+    queue_size: int = 256
+    stats: RefreshStats = field(default_factory=RefreshStats)
+
+    def __post_init__(self) -> None:
+        self._queue: Optional["asyncio.Queue[Tuple[str, RefreshFn]]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Set[str] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of refreshes that are queued or running."""
+        return len(self._pending)
+
+    def schedule(self, key: str, refresh: RefreshFn) -> bool:
+        """Queue a refresh unless one for the same key is pending.
+
+        Args:
+            key: Cache key of the entry.
+            refresh: Coroutine function performing the refresh.
+
+        Returns:
+            True if the refresh was queued.
+        """
+        if key in self._pending:
+            return False
+        try:
+            queue = self._start()
+        except RuntimeError:
+            # No running event loop to refresh in
+            return False
+        try:
+            queue.put_nowait((key, refresh))
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            return False
+
+        self._pending.add(key)
+        self.stats.scheduled += 1
+        return True
+
+    def _start(self) -> "asyncio.Queue[Tuple[str, RefreshFn]]":
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._pending.clear()
+            self._tasks = [
+                loop.create_task(self._work(self._queue))
+                for _ in range(max(self.workers, 1))
+            ]
+        return self._queue
+
+    async def _work(self, queue: "asyncio.Queue[Tuple[str, RefreshFn]]") -> None:
+        while True:
+            key, refresh = await queue.get()
+            try:
+                await refresh()
+                self.stats.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                logger.debug(f"Background refresh of {key} failed: {e}")
+            finally:
+                self._pending.discard(key)
+                queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until all queued refreshes have finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait for queued and running refreshes before shutting down.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            True if all refreshes finished in time.
+        """
+        if not self._pending:
+            return True
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def aclose(self) -> None:
+        """Stop the workers, abandoning queued refreshes."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+        self._pending.clear()
@@ -0,0 +1,360 @@
+"""Rate limiting, retries and circuit breaking for upstream OParl hosts.
+
+Municipal OParl servers are often small and answer bursts of traffic with
+``429 Too Many Requests`` or ``503 Service Unavailable``. The
+:class:`ResilientTransport` paces requests per host with an adaptive token
+bucket, retries idempotent requests with jittered exponential backoff, and
+stops sending requests to a host that keeps failing until it had time to
+recover. While a host's circuit is open, requests fail fast with
+:class:`UpstreamUnavailable`, which lets the response cache serve stale
+entries instead.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Methods that are safe to send again
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Statuses answered by overloaded or restarting servers
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class UpstreamUnavailable(httpx.TransportError):
+    """Raised without a request while the circuit of a host is open."""
+
+
+class TokenBucket:
+    """Token bucket whose rate adapts to throttling by the upstream server.
+
+    The rate grows additively with successful responses, by about one request
+    per second each second at full load, and is halved on every ``429``.
+    Requests reserve tokens ahead, so waiting callers are served in order
+    without a lock.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+    ):
+        """Initialize the bucket.
+
+        Args:
+            rate: Initial rate in requests per second.
+            burst: Number of requests that may be sent at once.
+            min_rate: Lower bound of the rate.
+            max_rate: Upper bound of the rate. If None, the initial rate.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token, possibly ahead of time.
+
+        Returns:
+            Seconds to wait before the token may be used.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        """Increase the rate after a successful response."""
+        self.rate = min(self.max_rate, self.rate + 1.0 / self.rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Halve the rate after a ``429``, pausing for ``Retry-After``.
+
+        Args:
+            retry_after: Seconds the server asked to wait, if any.
+        """
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+
+class CircuitBreaker:
+    """Circuit breaker that opens after consecutive failures.
+
+    After ``reset_timeout`` seconds one probe request is let through; its
+    success closes the circuit, its failure opens it again. A probe that
+    never completes is replaced after another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit;
+                0 disables the breaker.
+            reset_timeout: Seconds before a probe request is let through.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently rejected."""
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent.
+
+        Returns:
+            True if the circuit is closed, or if the request is the probe of
+            a circuit whose reset timeout has passed.
+        """
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return False
+        if self._probe_at is not None and now - self._probe_at < self.reset_timeout:
+            return False
+        self._probe_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a response from the server."""
+        self.failures = 0
+        self.opened_at = None
+        self._probe_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        if self.failure_threshold <= 0:
+            return
+        self.failures += 1
+        if self._probe_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    f"Opening circuit after {self.failures} consecutive failures"
+                )
+            self.opened_at = time.monotonic()
+            self._probe_at = None
+
+
+@dataclass
+class ResilienceStats:
+    """Counters of the resilience layer."""
+
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+    rejected: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return {
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+@dataclass
+class UpstreamGuard:
+    """Per-host rate limiters and circuit breakers with a retry policy.
+
+    One guard is shared by all HTTP clients of the server, so the MCP
+    clients and the harvester of the same host draw from the same budget.
+    """
+
+    rate_limit: Optional[float] = 50.0
+    burst: int = 20
+    min_rate: float = 0.5
+    max_attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+    deadline: float = 30.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    stats: ResilienceStats = field(default_factory=ResilienceStats)
+
+    def __post_init__(self) -> None:
+        self._hosts: Dict[str, Tuple[Optional[TokenBucket], CircuitBreaker]] = {}
+
+    def host(self, name: str) -> Tuple[Optional[TokenBucket], CircuitBreaker]:
+        """Get the rate limiter and circuit breaker of a host.
+
+        Args:
+            name: Host name, including a non-default port.
+
+        Returns:
+            Token bucket (None without a rate limit) and circuit breaker.
+        """
+        state = self._hosts.get(name)
+        if state is None:
+            bucket = (
+                TokenBucket(self.rate_limit, self.burst, self.min_rate)
+                if self.rate_limit
+                else None
+            )
+            state = (bucket, CircuitBreaker(self.failure_threshold, self.reset_timeout))
+            self._hosts[name] = state
+        return state
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Get a jittered exponential backoff delay.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 1.
+
+        Returns:
+            Random delay between 0 and the exponential backoff bound.
+        """
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+    def collect(self) -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+        """Report the rate and circuit state of each host as metrics."""
+        for name, (bucket, breaker) in self._hosts.items():
+            if bucket is not None:
+                yield (
+                    "oparl_upstream_rate_limit",
+                    "gauge",
+                    "Current request rate limit per upstream host.",
+                    {"host": name},
+                    bucket.rate,
+                )
+            yield (
+                "oparl_upstream_circuit_open",
+                "gauge",
+                "Whether the circuit breaker of an upstream host is open.",
+                {"host": name},
+                1.0 if breaker.is_open else 0.0,
+            )
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """HTTP transport applying an :class:`UpstreamGuard` to each request."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, guard: UpstreamGuard):
+        """Initialize the transport.
+
+        Args:
+            transport: Transport sending the requests.
+            guard: Rate limits, circuit breakers and retry policy.
+        """
+        self._transport = transport
+        self.guard = guard
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, pacing and retrying it as needed.
+
+        Raises:
+            UpstreamUnavailable: If the circuit of the host is open.
+            httpx.TransportError: If the last attempt failed to connect or
+                timed out.
+        """
+        guard = self.guard
+        bucket, breaker = guard.host(request.url.netloc.decode("ascii"))
+        attempts = guard.max_attempts if request.method in IDEMPOTENT_METHODS else 1
+        deadline = time.monotonic() + guard.deadline
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                guard.stats.rejected += 1
+                raise UpstreamUnavailable(
+                    f"Circuit open for {request.url.host}", request=request
+                )
+            if bucket is not None:
+                await bucket.acquire()
+
+            retry_after = None
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                breaker.record_failure()
+                guard.stats.failures += 1
+                delay = guard.backoff_delay(attempt)
+                if attempt >= attempts or time.monotonic() + delay > deadline:
+                    raise
+            else:
+                status = response.status_code
+                if status >= 500:
+                    breaker.record_failure()
+                    guard.stats.failures += 1
+                else:
+                    # Any other answer shows the server is up, even a 429
+                    breaker.record_success()
+                if status == 429:
+                    guard.stats.throttled += 1
+                    retry_after = _retry_after(response.headers)
+                    if bucket is not None:
+                        bucket.on_throttle(retry_after)
+                elif status < 500 and bucket is not None:
+                    bucket.on_success()
+
+                if status not in RETRY_STATUSES or attempt >= attempts:
+                    return response
+                delay = max(retry_after or 0.0, guard.backoff_delay(attempt))
+                if time.monotonic() + delay > deadline:
+                    return response
+                await response.aclose()
+
+            guard.stats.retries += 1
+            logger.debug(
+                f"Retrying {request.method} {request.url} in {delay:.2f}s "
+                f"(attempt {attempt + 1} of {attempts})"
+            )
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        """Close the underlying transport."""
+        await self._transport.aclose()
+
+
+def _retry_after(headers: httpx.Headers) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    value: Any = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
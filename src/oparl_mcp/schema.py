@@ -0,0 +1,90 @@
+"""OParl object schema information derived from the OpenAPI specification."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+# Reference fields that point back up the hierarchy and are not followed.
+UPWARD_REFERENCES = frozenset({"body", "system"})
+
+
+@dataclass
+class ObjectRoute:
+    """An OpenAPI route returning a single OParl object."""
+
+    operation_id: str
+    path: str
+    parameter: str
+    type: str
+
+
+@dataclass
+class OParlSchema:
+    """Field and route information of the OParl object types."""
+
+    reference_fields: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    scalar_fields: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    object_routes: List[ObjectRoute] = field(default_factory=list)
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "OParlSchema":
+        """Derive the schema information from an OpenAPI specification.
+
+        Args:
+            spec: OpenAPI specification as a dictionary.
+
+        Returns:
+            Schema information.
+        """
+        schemas = spec.get("components", {}).get("schemas", {})
+        reference_fields = {
+            name: tuple(
+                prop_name
+                for prop_name, prop in schema.get("properties", {}).items()
+                if prop_name != "id" and _is_uri(prop)
+            )
+            for name, schema in schemas.items()
+        }
+        scalar_fields = {
+            name: tuple(
+                prop_name
+                for prop_name, prop in schema.get("properties", {}).items()
+                if prop_name not in ("id", "type") and not _is_uri(prop)
+            )
+            for name, schema in schemas.items()
+        }
+
+        object_routes = []
+        for path, operations in spec.get("paths", {}).items():
+            operation = operations.get("get")
+            match = re.fullmatch(r"/[^{}]+/\{(\w+)\}", path)
+            if operation is None or match is None:
+                continue
+            response = operation.get("responses", {}).get("200", {})
+            ref = (
+                response.get("content", {})
+                .get("application/json", {})
+                .get("schema", {})
+                .get("$ref", "")
+            )
+            if ref and operation.get("operationId"):
+                object_routes.append(
+                    ObjectRoute(
+                        operation_id=operation["operationId"],
+                        path=path,
+                        parameter=match.group(1),
+                        type=ref.rsplit("/", 1)[-1],
+                    )
+                )
+
+        return cls(
+            reference_fields=reference_fields,
+            scalar_fields=scalar_fields,
+            object_routes=object_routes,
+        )
+
+
+def _is_uri(prop: Dict[str, Any]) -> bool:
+    if prop.get("format") == "uri":
+        return True
+    return prop.get("type") == "array" and prop.get("items", {}).get("format") == "uri"
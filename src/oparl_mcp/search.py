@@ -0,0 +1,331 @@
+"""Local full-text search over OParl papers and meetings."""
+
+import heapq
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from .store import oparl_type_name
+
+logger = logging.getLogger(__name__)
+
+# Fields indexed per OParl type.
+INDEXED_FIELDS: Dict[str, Sequence[str]] = {
+    "Paper": ("name", "reference", "paperType"),
+    "Meeting": ("name",),
+}
+
+# Field used for date filtering per OParl type.
+DATE_FIELDS: Dict[str, str] = {"Paper": "date", "Meeting": "start"}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case search terms.
+
+    Args:
+        text: Text to tokenize.
+
+    Returns:
+        List of terms.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def in_date_range(
+    value: Any, start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> bool:
+    """Check whether a date or date-time lies in a range of days.
+
+    Args:
+        value: ISO date or date-time of an object.
+        start_date: First day of the range, or None for no lower bound.
+        end_date: Last day of the range, or None for no upper bound.
+
+    Returns:
+        True if the value lies in the range. Values that are not strings
+        only match a range without bounds.
+    """
+    if not start_date and not end_date:
+        return True
+    if not isinstance(value, str):
+        return False
+    # Dates and date-times both compare correctly on their ISO prefix.
+    day = value[:10]
+    if start_date and day < start_date[:10]:
+        return False
+    if end_date and day > end_date[:10]:
+        return False
+    return True
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+
+    url: str
+    type: str
+    name: Optional[str]
+    reference: Optional[str]
+    date: Optional[str]
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the hit as a JSON-serializable dictionary."""
+        return {
+            "id": self.url,
+            "type": self.type,
+            "name": self.name,
+            "reference": self.reference,
+            "date": self.date,
+            "score": round(self.score, 4),
+        }
+
+
+class _Document:
+    __slots__ = ("url", "type", "name", "reference", "date", "body", "terms", "length")
+
+    def __init__(
+        self,
+        url: str,
+        obj_type: str,
+        obj: Dict[str, Any],
+        terms: Dict[str, int],
+    ):
+        self.url = url
+        self.type = obj_type
+        self.name = obj.get("name")
+        self.reference = obj.get("reference")
+        date = obj.get(DATE_FIELDS[obj_type])
+        # Dates and date-times both compare correctly on their ISO prefix.
+        self.date = date[:10] if isinstance(date, str) else None
+        self.body = obj.get("body")
+        self.terms = terms
+        self.length = sum(terms.values())
+
+
+class SearchIndex:
+    """Incremental in-memory BM25 index of OParl papers and meetings.
+
+    Objects are added as they flow through the server; adding an object that
+    is already indexed replaces it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialize an empty index.
+
+        Args:
+            k1: BM25 term frequency saturation.
+            b: BM25 document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, _Document] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._type_counts: Counter = Counter()
+        self._lengths: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def count(self, types: Optional[Iterable[str]] = None) -> int:
+        """Count indexed documents.
+
+        Args:
+            types: Only count these OParl types. If None, counts all.
+
+        Returns:
+            Number of indexed documents.
+        """
+        if types is None:
+            return len(self._docs)
+        return sum(self._type_counts[obj_type] for obj_type in set(types))
+
+    def has_documents(
+        self,
+        types: Optional[Iterable[str]] = None,
+        body: Optional[str] = None,
+        url_prefix: Optional[str] = None,
+    ) -> bool:
+        """Check whether any document lies in a scope.
+
+        Args:
+            types: Only consider these OParl types.
+            body: Only consider documents of the body with this URL or ID.
+            url_prefix: Only consider documents whose URL starts with this
+                prefix.
+
+        Returns:
+            True if at least one indexed document matches.
+        """
+        wanted = set(types) if types is not None else None
+        if not self.count(wanted):
+            return False
+        if body is None and url_prefix is None:
+            return True
+        return any(
+            self._matches(doc, wanted, None, None, body, url_prefix)
+            for doc in self._docs.values()
+        )
+
+    def add(self, obj: Dict[str, Any]) -> bool:
+        """Index a paper or meeting, or remove it if it is marked deleted.
+
+        Args:
+            obj: OParl object.
+
+        Returns:
+            True if the object was indexed or removed.
+        """
+        obj_type = oparl_type_name(obj)
+        url = obj.get("id")
+        if obj_type not in INDEXED_FIELDS or not isinstance(url, str):
+            return False
+
+        if obj.get("deleted") is True:
+            self.remove(url)
+            return True
+
+        text = " ".join(
+            str(obj[field]) for field in INDEXED_FIELDS[obj_type] if obj.get(field)
+        )
+        terms = Counter(tokenize(text))
+
+        self.remove(url)
+        doc = _Document(url, obj_type, obj, dict(terms))
+        self._docs[url] = doc
+        self._total_length += doc.length
+        self._type_counts[obj_type] += 1
+        self._lengths[url] = doc.length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[url] = frequency
+        return True
+
+    def add_many(self, objects: Iterable[Dict[str, Any]]) -> int:
+        """Index several objects.
+
+        Args:
+            objects: OParl objects; unsupported types are skipped.
+
+        Returns:
+            Number of objects indexed or removed.
+        """
+        return sum(1 for obj in objects if self.add(obj))
+
+    def remove(self, url: str) -> None:
+        """Remove a document from the index if present."""
+        doc = self._docs.pop(url, None)
+        if doc is None:
+            return
+
+        self._total_length -= doc.length
+        self._type_counts[doc.type] -= 1
+        del self._lengths[url]
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(url, None)
+                if not postings:
+                    del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        types: Optional[Iterable[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        body: Optional[str] = None,
+        url_prefix: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[SearchHit]:
+        """Rank indexed documents against a query.
+
+        Args:
+            query: Search terms.
+            types: Only return these OParl types.
+            start_date: Only return documents dated on or after this ISO date.
+            end_date: Only return documents dated on or before this ISO date.
+            body: Only return documents of the body with this URL or ID.
+            url_prefix: Only return documents whose URL starts with this prefix.
+            limit: Maximum number of results.
+
+        Returns:
+            Hits ordered by descending BM25 score.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._docs:
+            return []
+
+        wanted = set(types) if types is not None else None
+        total = len(self._docs)
+        average_length = self._total_length / total or 1.0
+        k1 = self.k1
+        base_norm = k1 * (1 - self.b)
+        length_norm = k1 * self.b / average_length
+        lengths = self._lengths
+        scores: Dict[str, float] = {}
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            weight = idf * (k1 + 1)
+            for url, frequency in postings.items():
+                scores[url] = scores.get(url, 0.0) + weight * frequency / (
+                    frequency + base_norm + length_norm * lengths[url]
+                )
+
+        filtered = wanted is not None or start_date or end_date or body or url_prefix
+        ranked = (
+            sorted(scores.items(), key=itemgetter(1), reverse=True)
+            if filtered
+            else heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        )
+
+        hits = []
+        for url, score in ranked:
+            doc = self._docs[url]
+            if not self._matches(doc, wanted, start_date, end_date, body, url_prefix):
+                continue
+            hits.append(
+                SearchHit(
+                    url=url,
+                    type=doc.type,
+                    name=doc.name,
+                    reference=doc.reference,
+                    date=doc.date,
+                    score=score,
+                )
+            )
+            if len(hits) >= limit:
+                break
+        return hits
+
+    @staticmethod
+    def _matches(
+        doc: _Document,
+        types: Optional[Set[str]],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        body: Optional[str],
+        url_prefix: Optional[str],
+    ) -> bool:
+        if types is not None and doc.type not in types:
+            return False
+        if not in_date_range(doc.date, start_date, end_date):
+            return False
+        if body and not (
+            isinstance(doc.body, str)
+            and (doc.body == body or doc.body.rstrip("/").endswith(f"/body/{body}"))
+        ):
+            return False
+        if url_prefix and not doc.url.startswith(url_prefix):
+            return False
+        return True
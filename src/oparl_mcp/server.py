@@ -1,15 +1,64 @@
 """Main MCP server implementation for OParl API."""
 
+import argparse
+import asyncio
+import importlib.util
 import json
 import logging
+import re
+import ssl
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+from urllib.parse import urlparse
 
 import httpx
 from fastmcp import FastMCP
+from fastmcp.resources import Resource, ResourceTemplate
 from fastmcp.server.openapi import MCPType, RouteMap
+from fastmcp.tools import Tool
 
+from .analytics import TABLE_FIELDS, AnalyticsEngine
+from .cache import CachingTransport, ResponseCache
+from .coalescing import CoalescingStats, CoalescingTransport
 from .config import OParlConfig
+from .graph import EntityGraph
+from .harvester import CheckpointStore, Harvester
+from .metrics import (
+    MetricsRegistry,
+    MetricsTransport,
+    RouteMatcher,
+    pool_collector,
+    register_metrics,
+    stats_collector,
+)
+from .pagination import PageFetcher
+from .refresh import RefreshScheduler
+from .resilience import ResilientTransport, UpstreamGuard
+from .schema import OParlSchema
+from .search import INDEXED_FIELDS, SearchIndex
+from .serving import (
+    APP_FACTORY,
+    DrainingTransport,
+    InFlightTracker,
+    Transport,
+    validate_transport,
+    worker_config,
+)
+from .shared_cache import SharedResponseCache
+from .store import ObjectStore
+from .tools import register_tools
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,7 +75,42 @@ class OParlMCPServer:
             config: Configuration object. If None, uses default configuration.
         """
         self.config = config or OParlConfig()
+        validate_transport(self.config)
         self.mcp: Optional[FastMCP] = None
+        self.cache: Optional[ResponseCache] = None
+        self.store: Optional[ObjectStore] = None
+        self.coalescing: Optional[CoalescingStats] = (
+            CoalescingStats() if self.config.coalesce_requests else None
+        )
+        self.resilience: Optional[UpstreamGuard] = self._create_guard()
+        self.refresher: Optional[RefreshScheduler] = (
+            RefreshScheduler(workers=self.config.cache_refresh_workers)
+            if self.config.cache_enabled and self.config.cache_stale_while_revalidate
+            else None
+        )
+        self._caching_transports: List[CachingTransport] = []
+        self.in_flight = InFlightTracker()
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self.metrics: Optional[MetricsRegistry] = (
+            MetricsRegistry() if self.config.metrics_enabled else None
+        )
+        self._routes = RouteMatcher([])
+        self.schema = OParlSchema()
+        self._http_transports: List[Tuple[str, httpx.AsyncBaseTransport]] = []
+        self._harvester_transports: Dict[
+            httpx.AsyncClient,
+            Tuple[List[Tuple[str, httpx.AsyncBaseTransport]], List[CachingTransport]],
+        ] = {}
+        self.search_index: Optional[SearchIndex] = (
+            SearchIndex() if self.config.search_enabled else None
+        )
+        self.analytics: Optional[AnalyticsEngine] = (
+            AnalyticsEngine() if self.config.analytics_enabled else None
+        )
+        # Record classes are generated from the specification, so the graph
+        # is created once it is loaded
+        self.graph: Optional[EntityGraph] = None
         self._setup_server()
 
     def _setup_server(self) -> None:
@@ -34,6 +118,10 @@ class OParlMCPServer:
         try:
             # Load OpenAPI specification
             openapi_spec = self._load_openapi_spec()
+            self._routes = RouteMatcher(openapi_spec.get("paths", {}))
+            self.schema = OParlSchema.from_spec(openapi_spec)
+            if self.config.graph_enabled:
+                self.graph = EntityGraph(self.schema)
 
             # Create HTTP client
             client = self._create_http_client()
@@ -41,15 +129,39 @@ class OParlMCPServer:
             # Define route mappings for OParl-specific behavior
             route_maps = self._create_route_maps()
 
-            # Create MCP server
+            # Create MCP server, keeping the generated components so that
+            # federated systems can reuse them instead of re-parsing the spec
+            components: List[Any] = []
             self.mcp = FastMCP.from_openapi(
                 openapi_spec=openapi_spec,
                 client=client,
                 name=self.config.server_name,
                 route_maps=route_maps,
                 tags={"oparl", "parliamentary-data", "government"},
+                lifespan=self._lifespan,
+                mcp_component_fn=lambda route, component: components.append(component),
+            )
+
+            self._load_from_store()
+
+            # Register tools that go beyond the plain OpenAPI routes
+            register_tools(
+                self.mcp,
+                client,
+                self.config,
+                self.search_index,
+                self.schema,
+                self.analytics,
+                self.graph,
             )
 
+            if self.metrics is not None:
+                self._register_metrics()
+
+            # Serve additional OParl systems under their own namespace
+            for namespace, base_url in self.config.systems.items():
+                self._mount_system(namespace, base_url, components)
+
             logger.info(
                 f"OParl MCP Server '{self.config.server_name}' initialized successfully"
             )
@@ -72,9 +184,362 @@ class OParlMCPServer:
         with open(spec_path, "r", encoding="utf-8") as f:
             return json.load(f)
 
-    def _create_http_client(self) -> httpx.AsyncClient:
+    def _mount_system(
+        self, namespace: str, base_url: str, components: List[Any]
+    ) -> None:
+        """Serve another OParl system under a namespace.
+
+        The OpenAPI components of the main server are copied with the
+        system's own HTTP client, so routes and the parsed specification are
+        shared and each system only adds a client and its connection pool.
+
+        Args:
+            namespace: Prefix for the system's tools and resource URIs.
+            base_url: Base URL of the system's OParl API.
+            components: Components generated from the OpenAPI specification.
+        """
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", namespace):
+            raise ValueError(f"Invalid OParl system namespace: {namespace!r}")
+
+        client = self._create_http_client(base_url, namespace)
+        self.clients[namespace] = client
+        system = FastMCP(name=f"{self.config.server_name} ({namespace})")
+
+        for component in components:
+            copy = component.model_copy()
+            copy._client = client
+            if isinstance(copy, ResourceTemplate):
+                system.add_template(copy)
+            elif isinstance(copy, Resource):
+                system.add_resource(copy)
+            elif isinstance(copy, Tool):
+                system.add_tool(copy)
+
+        register_tools(
+            system,
+            client,
+            self.config.model_copy(update={"base_url": base_url}),
+            self.search_index,
+            self.schema,
+            self.analytics,
+            self.graph,
+        )
+
+        assert self.mcp is not None
+        self.mcp.mount(system, prefix=namespace)
+        logger.info(f"Serving OParl system '{namespace}' from {base_url}")
+
+    def _load_from_store(self) -> None:
+        """Warm the local indexes from objects persisted by earlier runs.
+
+        The store is read and decoded once, and every object is handed to
+        the search index, the analytics tables and the reference graph.
+        """
+        if self.store is None:
+            return
+
+        consumers: List[Tuple[str, Callable[[Dict[str, Any]], bool]]] = []
+        types: Set[str] = set()
+        if self.search_index is not None:
+            consumers.append(("Search index", self.search_index.add))
+            types.update(INDEXED_FIELDS)
+        if self.analytics is not None:
+            consumers.append(("Analytics tables", self.analytics.add))
+            types.update(TABLE_FIELDS)
+        if self.graph is not None:
+            consumers.append(("Reference graph", self.graph.add))
+            types.update(self.graph.record_types)
+        if not consumers:
+            return
+
+        loaded = [0] * len(consumers)
+        for obj in self.store.iter_objects(types):
+            for i, (_, add) in enumerate(consumers):
+                if add(obj):
+                    loaded[i] += 1
+        for (name, _), count in zip(consumers, loaded):
+            logger.info(f"{name} loaded {count} objects from store")
+
+    def _register_metrics(self) -> None:
+        """Expose metrics and collect statistics of the server's components."""
+        assert self.metrics is not None and self.mcp is not None
+        register_metrics(self.mcp, self.metrics)
+
+        self.metrics.add_collector(pool_collector(self._http_transports))
+        if self.cache is not None:
+            cache = self.cache
+            self.metrics.add_collector(
+                stats_collector(
+                    "oparl_cache",
+                    "Response cache statistics.",
+                    lambda: {**cache.stats.as_dict(), **cache.usage()},
+                    gauges=("entries", "bytes"),
+                )
+            )
+        if self.refresher is not None:
+            self.metrics.add_collector(
+                stats_collector(
+                    "oparl_cache_refresh",
+                    "Background cache refresh statistics.",
+                    self.refresher.stats.as_dict,
+                )
+            )
+        if self.coalescing is not None:
+            self.metrics.add_collector(
+                stats_collector(
+                    "oparl_coalescing",
+                    "Request coalescing statistics.",
+                    self.coalescing.as_dict,
+                    gauges=("max_waiters",),
+                )
+            )
+        if self.resilience is not None:
+            self.metrics.add_collector(
+                stats_collector(
+                    "oparl_upstream_resilience",
+                    "Upstream retries, throttling and circuit breaker rejections.",
+                    self.resilience.stats.as_dict,
+                )
+            )
+            self.metrics.add_collector(self.resilience.collect)
+        if self.store is not None:
+            self.metrics.add_collector(
+                stats_collector(
+                    "oparl_store",
+                    "Object store statistics.",
+                    self.store.stats,
+                    gauges=("objects", "bytes"),
+                )
+            )
+
+    def create_harvesters(self, bodies: Optional[List[str]] = None) -> List[Harvester]:
+        """Create harvesters for the main OParl system and all mounted systems.
+
+        Harvesters get their own HTTP clients, so background crawling does
+        not compete with MCP requests for pooled connections. The clients
+        share the response cache, object store and search index, and mark
+        their requests ``no-cache`` so that cached pages are revalidated.
+
+        Args:
+            bodies: Body IDs to harvest on the main system. If None, uses the
+                configured bodies, or discovers all bodies.
+
+        Returns:
+            One harvester per OParl system. Close them with
+            :meth:`close_harvesters`.
+        """
+        checkpoint_path = self.config.harvest_checkpoint_path
+        if checkpoint_path is None and self.config.store_path:
+            checkpoint_path = f"{self.config.store_path}.harvest.json"
+        checkpoints = CheckpointStore(checkpoint_path)
+
+        systems = {"": self.config.base_url, **self.config.systems}
+        harvesters = []
+        for namespace, base_url in systems.items():
+            http_count = len(self._http_transports)
+            caching_count = len(self._caching_transports)
+            client = self._create_http_client(base_url, namespace or "default")
+            client.headers["Cache-Control"] = "no-cache"
+            self._harvester_transports[client] = (
+                self._http_transports[http_count:],
+                self._caching_transports[caching_count:],
+            )
+            harvesters.append(
+                Harvester(
+                    client,
+                    checkpoints,
+                    bodies=None if namespace else bodies or self.config.harvest_bodies,
+                    page_size=self.config.harvest_page_size,
+                    meeting_lookback_days=self.config.harvest_meeting_lookback_days,
+                    fetcher=PageFetcher(
+                        client,
+                        prefetch=self.config.prefetch_pages,
+                        max_concurrency=self.config.max_concurrent_requests,
+                        per_host_limit=self.config.per_host_concurrency,
+                    ),
+                )
+            )
+
+        return harvesters
+
+    async def close_harvesters(self, harvesters: List[Harvester]) -> None:
+        """Close the HTTP clients of harvesters and forget their transports.
+
+        Their connection pools then no longer show up in the metrics and
+        their caches are no longer refreshed.
+
+        Args:
+            harvesters: Harvesters created by :meth:`create_harvesters`.
+        """
+        for harvester in harvesters:
+            await harvester.client.aclose()
+            http, caching = self._harvester_transports.pop(harvester.client, ([], []))
+            # The pool collector holds on to the list, so update it in place
+            self._http_transports[:] = [
+                entry for entry in self._http_transports if entry not in http
+            ]
+            self._caching_transports[:] = [
+                transport
+                for transport in self._caching_transports
+                if transport not in caching
+            ]
+
+    async def harvest(
+        self, bodies: Optional[List[str]] = None, interval: Optional[float] = None
+    ) -> Dict[str, int]:
+        """Harvest all OParl systems.
+
+        Args:
+            bodies: Body IDs to harvest on the main system.
+            interval: If set, keep harvesting with this many seconds between
+                runs instead of returning after one run.
+
+        Returns:
+            Number of changed objects per collection URL.
+        """
+        harvesters = self.create_harvesters(bodies)
+        try:
+            if interval:
+                await asyncio.gather(*(h.run_forever(interval) for h in harvesters))
+
+            report: Dict[str, int] = {}
+            for harvester in harvesters:
+                base_url = str(harvester.client.base_url).rstrip("/")
+                for path, count in (await harvester.run_once()).items():
+                    report[f"{base_url}{path}"] = count
+            return report
+        finally:
+            await self.close_harvesters(harvesters)
+
+    @asynccontextmanager
+    async def _lifespan(self, mcp: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+        """Run the harvester and cache refreshes while the MCP server is up."""
+        tasks: List[asyncio.Task] = []
+        if self.config.harvest_interval:
+            tasks.append(
+                asyncio.create_task(self.harvest(interval=self.config.harvest_interval))
+            )
+        if self.refresher is not None and self.config.cache_refresh_interval:
+            tasks.append(
+                asyncio.create_task(
+                    self.refresh_hot_entries(self.config.cache_refresh_interval)
+                )
+            )
+        try:
+            yield {}
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.drain(self.config.shutdown_timeout)
+            if self.refresher is not None:
+                await self.refresher.aclose()
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait for in-flight upstream requests before shutting down.
+
+        Background cache refreshes bypass the drain tracker, so they are
+        awaited separately within the same timeout.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            True if all upstream requests and refreshes finished in time.
+        """
+        deadline = time.monotonic() + timeout
+        refreshes = self.refresher.pending if self.refresher is not None else 0
+        if self.in_flight.count or refreshes:
+            logger.info(
+                f"Waiting for {self.in_flight.count} in-flight upstream requests "
+                f"and {refreshes} cache refreshes"
+            )
+        drained = await self.in_flight.drain(timeout)
+        # Requests finishing above may have scheduled further refreshes
+        if self.refresher is not None:
+            remaining = max(deadline - time.monotonic(), 0.0)
+            drained = await self.refresher.drain(remaining) and drained
+        if not drained:
+            refreshes = self.refresher.pending if self.refresher is not None else 0
+            logger.warning(
+                f"Shutting down with {self.in_flight.count} upstream requests "
+                f"and {refreshes} cache refreshes still in flight"
+            )
+        return drained
+
+    async def refresh_hot_entries(self, interval: float) -> None:
+        """Periodically refresh hot cache entries before they expire.
+
+        Args:
+            interval: Seconds between two sweeps over the hot entries.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            # Look one sweep further ahead, so that slow refreshes still
+            # finish before the entries expire
+            scheduled = sum(
+                transport.refresh_expiring(within=2 * interval)
+                for transport in self._caching_transports
+            )
+            if scheduled:
+                logger.debug(f"Scheduled {scheduled} background cache refreshes")
+
+    def _create_guard(self) -> Optional[UpstreamGuard]:
+        """Create the rate limiters, retry policy and circuit breakers.
+
+        Returns:
+            Guard shared by all HTTP clients, or None if rate limiting,
+            retries and circuit breaking are all disabled.
+        """
+        config = self.config
+        if (
+            not config.rate_limit
+            and config.retry_max_attempts <= 1
+            and config.circuit_failure_threshold <= 0
+        ):
+            return None
+        return UpstreamGuard(
+            rate_limit=config.rate_limit,
+            burst=config.rate_limit_burst,
+            max_attempts=max(config.retry_max_attempts, 1),
+            backoff=config.retry_backoff,
+            max_backoff=config.retry_max_backoff,
+            deadline=config.retry_deadline,
+            failure_threshold=config.circuit_failure_threshold,
+            reset_timeout=config.circuit_reset_timeout,
+        )
+
+    def _create_cache(self) -> ResponseCache:
+        """Create the response cache.
+
+        Returns:
+            Cache shared with other processes through ``cache_path`` if it
+            is set, otherwise an in-memory cache.
+        """
+        config = self.config
+        if config.cache_path:
+            return SharedResponseCache(
+                path=config.cache_path,
+                max_entries=config.cache_max_entries,
+                max_bytes=config.cache_max_bytes,
+                default_ttl=config.cache_default_ttl,
+                local_entries=config.cache_local_entries,
+            )
+        return ResponseCache(
+            max_entries=config.cache_max_entries,
+            max_bytes=config.cache_max_bytes,
+            default_ttl=config.cache_default_ttl,
+        )
+
+    def _create_http_client(
+        self, base_url: Optional[str] = None, system: str = "default"
+    ) -> httpx.AsyncClient:
         """Create HTTP client for OParl API.
 
+        Args:
+            base_url: Base URL of the API. If None, uses the configured base URL.
+            system: Name of the OParl system, used to label metrics.
+
         Returns:
             Configured HTTP client.
         """
@@ -84,10 +549,116 @@ class OParlMCPServer:
         if self.config.api_key:
             headers["Authorization"] = f"Bearer {self.config.api_key}"
 
+        base_url = base_url or self.config.base_url
         return httpx.AsyncClient(
-            base_url=self.config.base_url, headers=headers, timeout=self.config.timeout
+            base_url=base_url,
+            headers=headers,
+            timeout=self._create_timeout(),
+            transport=self._create_transport(system, urlparse(base_url).path),
+        )
+
+    def _create_timeout(self) -> httpx.Timeout:
+        """Create the timeout settings for the HTTP client.
+
+        Returns:
+            Timeout using ``timeout`` for every phase not configured separately.
+        """
+        phases = {
+            "connect": self.config.connect_timeout,
+            "read": self.config.read_timeout,
+            "pool": self.config.pool_timeout,
+        }
+        return httpx.Timeout(
+            self.config.timeout,
+            **{phase: value for phase, value in phases.items() if value is not None},
+        )
+
+    def _create_transport(
+        self, system: str = "default", base_path: str = ""
+    ) -> httpx.AsyncBaseTransport:
+        """Create the transport stack used by the HTTP client.
+
+        Args:
+            system: Name of the OParl system, used to label metrics.
+            base_path: Path of the API base URL, stripped from metric routes.
+
+        Returns:
+            Transport, wrapped in the rate limiting and retry layer, in a
+            response cache if caching is enabled and in a coalescing layer if
+            request coalescing is enabled.
+        """
+        http2 = self.config.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed, "
+                "falling back to HTTP/1.1"
+            )
+            http2 = False
+
+        # Loading the CA bundle is slow, so all transports share one context
+        if self._ssl_context is None:
+            self._ssl_context = httpx.create_ssl_context()
+
+        transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+            verify=self._ssl_context,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
+            http2=http2,
         )
 
+        # Metrics sit directly on the connection pool to see only upstream
+        # traffic
+        if self.metrics is not None:
+            self._http_transports.append((system, transport))
+            transport = MetricsTransport(
+                transport, self.metrics, self._routes, system, base_path
+            )
+
+        # Below the cache, so that it can serve stale entries when retries
+        # are exhausted or the circuit is open
+        if self.resilience is not None:
+            transport = ResilientTransport(transport, self.resilience)
+
+        if self.config.cache_enabled:
+            # Cache and store are shared by the clients of all OParl systems
+            if self.config.store_path and self.store is None:
+                self.store = ObjectStore(
+                    self.config.store_path, max_bytes=self.config.store_max_bytes
+                )
+            if self.cache is None:
+                self.cache = self._create_cache()
+            caching = CachingTransport(
+                transport,
+                cache=self.cache,
+                revalidate=self.config.cache_revalidate,
+                store=self.store,
+                stale_if_error=self.config.cache_stale_if_error,
+                refresher=self.refresher,
+                max_stale=self.config.cache_max_stale,
+                refresh_ahead=self.config.cache_refresh_ahead,
+            )
+            self._caching_transports.append(caching)
+            if self.search_index is not None:
+                caching.add_listener(self.search_index.add_many)
+            if self.analytics is not None:
+                caching.add_listener(self.analytics.add_many)
+            if self.graph is not None:
+                caching.add_listener(self.graph.add_many)
+            transport = caching
+
+        # Coalesce on top of the cache so concurrent misses share one lookup
+        if self.coalescing is not None:
+            transport = CoalescingTransport(transport, self.coalescing)
+
+        # Count requests of all clients, so that shutdown can wait for them
+        if self.config.transport != "stdio":
+            transport = DrainingTransport(transport, self.in_flight)
+
+        return transport
+
     def _create_route_maps(self) -> list[RouteMap]:
         """Create route mappings for OParl API endpoints.
 
@@ -121,13 +692,65 @@ class OParlMCPServer:
             RouteMap(pattern=r".*/internal/.*", mcp_type=MCPType.EXCLUDE),
         ]
 
+    def http_app(self) -> Any:
+        """Create the ASGI application serving the MCP server over HTTP.
+
+        Returns:
+            Starlette application for the configured HTTP transport.
+        """
+        if self.mcp is None:
+            raise RuntimeError("MCP server not initialized")
+
+        config = self.config
+        return self.mcp.http_app(
+            path=config.http_path,
+            transport="sse" if config.transport == "sse" else "http",
+            # Requests of one session may reach different worker processes
+            stateless_http=config.stateless_http or config.workers > 1 or None,
+        )
+
     def run(self) -> None:
         """Run the MCP server."""
         if self.mcp is None:
             raise RuntimeError("MCP server not initialized")
 
-        logger.info(f"Starting OParl MCP Server on {self.config.base_url}")
-        self.mcp.run()
+        config = self.config
+        logger.info(f"Starting OParl MCP Server on {config.base_url}")
+        if config.transport == "stdio":
+            self.mcp.run()
+            return
+
+        logger.info(
+            f"Serving {config.transport} on {config.host}:{config.port} "
+            f"with {config.workers} worker(s)"
+        )
+        uvicorn_config: Dict[str, Any] = {
+            "timeout_graceful_shutdown": config.shutdown_timeout,
+            "log_level": config.log_level.lower(),
+        }
+        if config.workers == 1:
+            # The transport was checked by validate_transport on init
+            self.mcp.run(
+                transport=cast(Transport, config.transport),
+                host=config.host,
+                port=config.port,
+                path=config.http_path,
+                stateless_http=config.stateless_http or None,
+                uvicorn_config=uvicorn_config,
+            )
+            return
+
+        import uvicorn
+
+        # Each worker process builds its own server from the environment
+        uvicorn.run(
+            APP_FACTORY,
+            factory=True,
+            host=config.host,
+            port=config.port,
+            workers=config.workers,
+            **uvicorn_config,
+        )
 
     def get_server_info(self) -> dict:
         """Get information about the MCP server.
@@ -135,7 +758,7 @@ class OParlMCPServer:
         Returns:
             Server information dictionary.
         """
-        return {
+        info: Dict[str, Any] = {
             "name": self.config.server_name,
             "version": self.config.server_version,
             "base_url": self.config.base_url,
@@ -149,12 +772,79 @@ class OParlMCPServer:
                 "Document access",
                 "Agenda items",
                 "Search functionality",
+                "Full collection pagination",
+                "Local full-text search",
+                "Reference expansion",
+                "Prometheus metrics",
+                "Upstream rate limiting and retries",
+                "Stale-while-revalidate caching",
+                "Local aggregation over fetched objects",
+                "Reference graph traversal",
             ],
         }
 
+        if self.config.systems:
+            info["systems"] = dict(self.config.systems)
+        if self.cache is not None:
+            info["cache"] = self.cache.stats.as_dict()
+        if self.refresher is not None:
+            info["cache_refresh"] = self.refresher.stats.as_dict()
+        if self.coalescing is not None:
+            info["coalescing"] = self.coalescing.as_dict()
+        if self.resilience is not None:
+            info["resilience"] = self.resilience.stats.as_dict()
+        if self.store is not None:
+            info["store"] = self.store.stats()
+        if self.search_index is not None:
+            info["search_index"] = {"documents": len(self.search_index)}
+        if self.analytics is not None:
+            info["analytics"] = self.analytics.counts()
+        if self.graph is not None:
+            info["graph"] = {"objects": len(self.graph), "nodes": self.graph.node_count}
+
+        return info
+
+
+def create_app() -> Any:
+    """Create the ASGI application of an HTTP worker process.
+
+    Used by uvicorn when serving with several workers. The configuration is
+    read from the environment and scaled down to a single worker.
+
+    Returns:
+        Starlette application serving the MCP server.
+    """
+    return OParlMCPServer(worker_config(OParlConfig())).http_app()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the OParl MCP Server.
+
+    Args:
+        argv: Command line arguments. If None, uses ``sys.argv``.
+    """
+    parser = argparse.ArgumentParser(prog="oparl-mcp", description="OParl MCP Server")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("serve", help="Run the MCP server (default)")
+    commands.add_parser("check", help="Initialize the server and exit")
+    harvest = commands.add_parser(
+        "harvest", help="Fetch objects changed since the last harvest"
+    )
+    harvest.add_argument(
+        "--body", action="append", dest="bodies", help="Body ID (repeatable)"
+    )
+    harvest.add_argument(
+        "--interval", type=float, help="Keep harvesting every INTERVAL seconds"
+    )
+    export = commands.add_parser(
+        "export", help="Write the analytics tables of stored objects to files"
+    )
+    export.add_argument("--output", default="export", help="Output directory")
+    export.add_argument(
+        "--format", choices=("parquet", "csv"), default="parquet", dest="file_format"
+    )
+    args = parser.parse_args(argv)
 
-def main() -> None:
-    """Main entry point for the OParl MCP Server."""
     try:
         # Load configuration
         config = OParlConfig()
@@ -162,6 +852,21 @@ def main() -> None:
         # Create and run server
         server = OParlMCPServer(config)
 
+        if args.command == "harvest":
+            report = asyncio.run(server.harvest(args.bodies, args.interval))
+            print(json.dumps(report, indent=2))
+            return
+
+        if args.command == "export":
+            if server.analytics is None or server.store is None:
+                raise RuntimeError(
+                    "Exporting requires OPARL_STORE_PATH and OPARL_ANALYTICS_ENABLED"
+                )
+            paths = server.analytics.export(Path(args.output), args.file_format)
+            for path in paths:
+                print(path)
+            return
+
         # Print server information
         info = server.get_server_info()
         print(f"🚀 {info['name']} v{info['version']}")
@@ -170,6 +875,10 @@ def main() -> None:
         print(f"✨ Features: {', '.join(info['features'])}")
         print("-" * 50)
 
+        if args.command == "check":
+            print("✅ OParl MCP Server initialized successfully")
+            return
+
         # Run the server
         server.run()
 
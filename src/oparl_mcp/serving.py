@@ -0,0 +1,132 @@
+"""Serving the MCP server over HTTP with several worker processes."""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Literal, Optional
+
+import httpx
+
+from .config import OParlConfig
+
+logger = logging.getLogger(__name__)
+
+# MCP transports supported by ``OParlConfig.transport``
+Transport = Literal["stdio", "http", "sse"]
+TRANSPORTS = ("stdio", "http", "sse")
+
+# Import string of the ASGI application factory used by worker processes
+APP_FACTORY = "oparl_mcp.server:create_app"
+
+
+def validate_transport(config: OParlConfig) -> None:
+    """Check the transport settings of a configuration.
+
+    Args:
+        config: Configuration to check.
+
+    Raises:
+        ValueError: If the transport is unknown, or if several workers are
+            configured for a transport that keeps sessions in memory.
+    """
+    if config.transport not in TRANSPORTS:
+        raise ValueError(
+            f"Unknown transport {config.transport!r}, "
+            f"expected one of {', '.join(TRANSPORTS)}"
+        )
+    if config.workers < 1:
+        raise ValueError("workers must be at least 1")
+    if config.workers > 1 and config.transport != "http":
+        raise ValueError(
+            "Several workers require the http transport, since stdio and SSE "
+            "sessions are bound to one process"
+        )
+
+
+def worker_config(config: OParlConfig) -> OParlConfig:
+    """Derive the configuration of one of several worker processes.
+
+    The rate limit and connection pool are per process, so they are divided
+    by the number of workers to keep the upstream budget of the whole node.
+    Periodic harvesting is disabled, since every worker would harvest the
+    same objects; run ``oparl-mcp harvest --interval`` alongside instead.
+
+    Args:
+        config: Configuration of the node.
+
+    Returns:
+        Configuration of a single worker.
+    """
+    workers = config.workers
+    if workers <= 1:
+        return config
+
+    if config.harvest_interval:
+        logger.warning(
+            "Periodic harvesting is disabled with several workers; "
+            "run 'oparl-mcp harvest --interval' as a separate process"
+        )
+    return config.model_copy(
+        update={
+            "rate_limit": config.rate_limit / workers if config.rate_limit else None,
+            "rate_limit_burst": math.ceil(config.rate_limit_burst / workers),
+            "max_connections": math.ceil(config.max_connections / workers),
+            "max_keepalive_connections": math.ceil(
+                config.max_keepalive_connections / workers
+            ),
+            "harvest_interval": None,
+        }
+    )
+
+
+class InFlightTracker:
+    """Counter of upstream requests that are waiting for a response."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    async def drain(self, timeout: float, interval: float = 0.05) -> bool:
+        """Wait until no request is in flight.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+            interval: Seconds between two checks.
+
+        Returns:
+            True if all requests finished in time.
+        """
+        deadline = time.monotonic() + timeout
+        while self.count and time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+        return self.count == 0
+
+
+class DrainingTransport(httpx.AsyncBaseTransport):
+    """HTTP transport that counts in-flight requests for a graceful shutdown."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        tracker: Optional[InFlightTracker] = None,
+    ):
+        """Wrap a transport.
+
+        Args:
+            transport: Transport that sends the requests.
+            tracker: Counter to update. If None, creates a new counter.
+        """
+        self._transport = transport
+        self.tracker = tracker or InFlightTracker()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, counting it while it is in flight."""
+        self.tracker.count += 1
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            self.tracker.count -= 1
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self._transport.aclose()
@@ -0,0 +1,319 @@
+"""Response cache shared by several server processes."""
+
+import asyncio
+import logging
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .cache import CacheEntry, ResponseCache
+from .codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Reads only refresh an entry's access time if it is older than this, so that
+# readers rarely need the write lock.
+_TOUCH_INTERVAL = 30.0
+
+# Writes between two checks of the size caps; eviction is approximate anyway.
+_CHECK_INTERVAL = 64
+
+# After eviction the cache is shrunk to this fraction of its caps, so that
+# eviction does not run again on the next check.
+_EVICT_TARGET = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    headers BLOB NOT NULL,
+    content BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+@dataclass
+class SharedResponseCache(ResponseCache):
+    """Response cache in a SQLite file that several processes share.
+
+    The database runs in WAL mode, so worker processes and containers on one
+    host read each other's entries and the hit rate is global. Entries are
+    inserted atomically and the least recently used ones are evicted once
+    ``max_entries`` or ``max_bytes`` is exceeded; access times are only
+    updated every few seconds, so eviction order is approximate.
+
+    Each process keeps the entries it served last in a small in-memory LRU
+    cache, so hot entries are returned without a query or any decoding.
+    Entries read from there are never older than their TTL allows, but may
+    miss an earlier refresh by another process. The asynchronous methods
+    used by :class:`CachingTransport` only touch that in-memory cache on the
+    event loop and query the file in a worker thread.
+    """
+
+    path: str = "cache.sqlite3"
+    local_entries: int = 256
+    local_bytes: int = 16 * 1024 * 1024
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._local = ResponseCache(
+            max_entries=self.local_entries,
+            max_bytes=self.local_bytes,
+            ttl_rules=self.ttl_rules,
+        )
+        self._writes = 0
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        # Number and size of the shared entries at the last size check, kept
+        # up to date with the writes of this process
+        self._count = 0
+        self._size = 0
+        self._recount()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return int(row[0])
+
+    @property
+    def current_bytes(self) -> int:
+        """Total size of all shared entries in bytes."""
+        with self._lock:
+            return self._total_bytes()
+
+    def usage(self) -> Dict[str, int]:
+        """Get the number and size of the shared entries without a query.
+
+        The values are those of the last size check plus the writes of this
+        process since, so they may lag behind writes of other processes.
+        """
+        return {"entries": self._count, "bytes": self._size}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Look up a fresh entry, first in memory and then in the shared file.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached entry, or None if missing or expired.
+        """
+        entry = self._local.get(key)
+        if entry is None:
+            return self._loaded(key, self._load(key))
+        self.stats.hits += 1
+        return entry
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        """Look up a fresh entry, reading the shared file in a worker thread."""
+        entry = self._local.get(key)
+        if entry is None:
+            return self._loaded(key, await asyncio.to_thread(self._load, key))
+        self.stats.hits += 1
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry regardless of freshness without touching stats.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached entry, or None if missing. An expired entry in memory
+            is only returned if the shared file has no newer one.
+        """
+        entry = self._local.peek(key)
+        if entry is not None and entry.is_fresh():
+            return entry
+        return self._load(key) or entry
+
+    async def apeek(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry regardless of freshness in a worker thread."""
+        entry = self._local.peek(key)
+        if entry is not None and entry.is_fresh():
+            return entry
+        return await asyncio.to_thread(self._load, key) or entry
+
+    def peek_local(self, key: str) -> Optional[CacheEntry]:
+        """Look up an entry in this process's memory only."""
+        return self._local.peek(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry for all processes, evicting old entries if needed.
+
+        Args:
+            key: Cache key.
+            entry: Entry to store.
+        """
+        if entry.size > self.max_bytes:
+            return
+        self._store(key, entry)
+        self._local.set(key, entry)
+        self.stats.stores += 1
+
+    async def aset(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry for all processes, writing in a worker thread."""
+        if entry.size > self.max_bytes:
+            return
+        await asyncio.to_thread(self._store, key, entry)
+        self._local.set(key, entry)
+        self.stats.stores += 1
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        self._local.delete(key)
+        with self._lock:
+            size = self._stored_size(key)
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            if size is not None:
+                self._count -= 1
+                self._size -= size
+
+    def clear(self) -> None:
+        """Remove all entries of all processes."""
+        self._local.clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._count = 0
+            self._size = 0
+
+    def evict(self) -> None:
+        """Evict least recently used entries down to the caps."""
+        with self._lock:
+            self._evict()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _loaded(self, key: str, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        """Count a lookup in the shared file and keep a fresh entry in memory."""
+        if entry is None or not entry.is_fresh():
+            self.stats.misses += 1
+            return None
+        self._local.set(key, entry)
+        entry.hits += 1
+        self.stats.hits += 1
+        return entry
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        offset = time.time() - time.monotonic()
+        row = (
+            key,
+            entry.status_code,
+            dumps(entry.headers),
+            entry.content,
+            entry.etag,
+            entry.last_modified,
+            entry.size,
+            entry.stored_at + offset,
+            entry.expires_at + offset,
+            time.time(),
+        )
+        with self._lock:
+            replaced = self._stored_size(key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, status_code, headers, "
+                "content, etag, last_modified, size, stored_at, expires_at, "
+                "accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._conn.commit()
+            if replaced is None:
+                self._count += 1
+            self._size += entry.size - (replaced or 0)
+            self._writes += 1
+            if self._writes % _CHECK_INTERVAL == 0:
+                self._evict()
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, content, etag, last_modified, "
+                "stored_at, expires_at, accessed_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            if now - row[7] > _TOUCH_INTERVAL:
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+
+        offset = now - time.monotonic()
+        headers: Any = loads(row[1])
+        return CacheEntry(
+            status_code=row[0],
+            headers=[(name, value) for name, value in headers],
+            content=row[2],
+            stored_at=row[5] - offset,
+            expires_at=row[6] - offset,
+            etag=row[3],
+            last_modified=row[4],
+        )
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return int(row[0])
+
+    def _recount(self) -> None:
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        self._count = int(count)
+        self._size = int(total)
+
+    def _stored_size(self, key: str) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else int(row[0])
+
+    def _evict(self) -> None:
+        self._recount()
+        count, total = self._count, self._size
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        # Remove the oldest rows, assuming entries of about average size
+        excess = count - int(self.max_entries * _EVICT_TARGET)
+        if total > self.max_bytes:
+            excess = max(
+                excess, math.ceil(count * (1 - self.max_bytes * _EVICT_TARGET / total))
+            )
+        cursor = self._conn.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        )
+        self._conn.commit()
+        # Another process may have evicted some of the rows already
+        self.stats.evictions += cursor.rowcount
+        logger.debug(f"Shared response cache evicted {cursor.rowcount} entries")
+        self._recount()
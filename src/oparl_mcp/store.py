@@ -0,0 +1,318 @@
+"""Persistent on-disk object store for OParl MCP Server."""
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# OParl object types kept in the store, by the last segment of their type URL.
+STORED_TYPES = {"Body", "Organization", "Person", "Meeting", "Paper", "AgendaItem"}
+
+# Reads only refresh an object's access time if it is older than this, so that
+# readers rarely need the write lock.
+_TOUCH_INTERVAL = 300.0
+
+# After compaction the store is shrunk to this fraction of its size cap, so
+# that compaction does not run again on the very next write.
+_COMPACT_TARGET = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    url TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    modified TEXT,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_accessed_at ON objects (accessed_at);
+CREATE INDEX IF NOT EXISTS objects_type ON objects (type);
+"""
+
+
+@dataclass
+class StoredObject:
+    """An OParl object loaded from the store."""
+
+    url: str
+    type: str
+    data: bytes
+    modified: Optional[str]
+    stored_at: float
+
+
+def oparl_type_name(obj: Dict[str, Any]) -> Optional[str]:
+    """Get the short OParl type name of an object.
+
+    Args:
+        obj: OParl object.
+
+    Returns:
+        Type name such as ``Paper``, or None if the object has no type.
+    """
+    obj_type = obj.get("type")
+    if not isinstance(obj_type, str) or not obj_type:
+        return None
+    return obj_type.rstrip("/").split("/")[-1]
+
+
+class ObjectStore:
+    """SQLite-backed store of OParl objects keyed by their ``id`` URL.
+
+    The database runs in WAL mode, so several server processes can share one
+    file: readers never block each other and writers are serialized by SQLite.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 256 * 1024 * 1024):
+        """Open or create the store.
+
+        Args:
+            path: Path of the SQLite database file.
+            max_bytes: Size cap for stored object data. Least recently used
+                objects are removed once it is exceeded.
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30.0, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        # Number and size of the objects at the last check, kept up to date
+        # with the writes of this process. The table is only summed again
+        # once the size exceeds the cap, so that writes and stats stay cheap
+        # however large the store grows.
+        self._objects = 0
+        self._bytes = 0
+        self._recount()
+
+    def get(self, url: str) -> Optional[StoredObject]:
+        """Load an object by its URL.
+
+        Args:
+            url: Canonical ``id`` URL of the object.
+
+        Returns:
+            The stored object, or None if it is not in the store.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT type, data, modified, stored_at, accessed_at "
+                "FROM objects WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            if now - row[4] > _TOUCH_INTERVAL:
+                self._conn.execute(
+                    "UPDATE objects SET accessed_at = ? WHERE url = ?", (now, url)
+                )
+                self._conn.commit()
+
+        self.hits += 1
+        return StoredObject(
+            url=url, type=row[0], data=row[1], modified=row[2], stored_at=row[3]
+        )
+
+    def put_many(self, objects: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace OParl objects.
+
+        Objects without an ``id`` or of a type outside ``STORED_TYPES`` are
+        ignored.
+
+        Args:
+            objects: OParl objects as decoded from the API.
+
+        Returns:
+            Number of objects written.
+        """
+        now = time.time()
+        rows = []
+        for obj in objects:
+            obj_type = oparl_type_name(obj)
+            url = obj.get("id")
+            if obj_type not in STORED_TYPES or not isinstance(url, str):
+                continue
+            data = dumps(obj)
+            rows.append((url, obj_type, obj.get("modified"), data, len(data), now, now))
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            replaced = self._sizes(row[0] for row in rows)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO objects "
+                "(url, type, modified, data, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self.writes += len(rows)
+            written = {row[0]: row[4] for row in rows}
+            self._objects += len(written) - len(replaced)
+            self._bytes += sum(written.values()) - sum(replaced.values())
+
+            if self._bytes > self.max_bytes:
+                self._recount()
+                if self._bytes > self.max_bytes:
+                    self._compact()
+
+        return len(rows)
+
+    def put(self, obj: Dict[str, Any]) -> bool:
+        """Insert or replace a single OParl object.
+
+        Args:
+            obj: OParl object as decoded from the API.
+
+        Returns:
+            True if the object was written.
+        """
+        return self.put_many([obj]) == 1
+
+    def iter_objects(
+        self, types: Optional[Iterable[str]] = None, batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over stored objects, decoded.
+
+        Args:
+            types: Only yield objects of these type names. If None, yields all.
+            batch_size: Number of rows loaded per query.
+
+        Yields:
+            Stored OParl objects.
+        """
+        query = "SELECT url, data FROM objects WHERE url > ?"
+        args: List[Any] = []
+        if types is not None:
+            names = list(types)
+            query += f" AND type IN ({', '.join('?' for _ in names)})"
+            args = names
+        query += " ORDER BY url LIMIT ?"
+
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, [last, *args, batch_size]).fetchall()
+            if not rows:
+                return
+            for url, data in rows:
+                yield loads(data)
+            last = rows[-1][0]
+
+    def delete(self, url: str) -> None:
+        """Remove an object if present."""
+        with self._lock:
+            removed = self._sizes([url])
+            self._conn.execute("DELETE FROM objects WHERE url = ?", (url,))
+            self._conn.commit()
+            self._objects -= len(removed)
+            self._bytes -= sum(removed.values())
+
+    def count(self) -> int:
+        """Get the number of stored objects."""
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0])
+
+    def size(self) -> int:
+        """Get the total size of stored object data in bytes."""
+        with self._lock:
+            return self._total_bytes()
+
+    def compact(self) -> None:
+        """Evict least recently used objects down to the size cap and reclaim space."""
+        with self._lock:
+            self._compact()
+
+    def stats(self) -> Dict[str, int]:
+        """Get store counters without querying the database.
+
+        The number and size of the objects are those of the last size check
+        plus the writes of this process since, so they may lag behind writes
+        of other processes sharing the file.
+
+        Returns:
+            Dictionary with hit, miss and write counters and the current size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "objects": self._objects,
+            "bytes": self._bytes,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM objects"
+        ).fetchone()
+        return int(row[0])
+
+    def _recount(self) -> None:
+        objects, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects"
+        ).fetchone()
+        self._objects = int(objects)
+        self._bytes = int(total)
+
+    def _sizes(self, urls: Iterable[str]) -> Dict[str, int]:
+        """Get the sizes of the stored objects among some URLs."""
+        sizes = {}
+        for url in urls:
+            row = self._conn.execute(
+                "SELECT size FROM objects WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None:
+                sizes[url] = int(row[0])
+        return sizes
+
+    def _compact(self) -> None:
+        self._recount()
+        total = self._bytes
+        target = int(self.max_bytes * _COMPACT_TARGET)
+
+        if total > self.max_bytes:
+            excess = total - target
+            removed = 0
+            for url, size in self._conn.execute(
+                "SELECT url, size FROM objects ORDER BY accessed_at"
+            ).fetchall():
+                if removed >= excess:
+                    break
+                self._conn.execute("DELETE FROM objects WHERE url = ?", (url,))
+                removed += size
+                self._objects -= 1
+            self._conn.commit()
+            self._bytes -= removed
+            logger.info(f"Object store compacted, removed {removed} bytes")
+
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
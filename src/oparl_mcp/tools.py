@@ -0,0 +1,593 @@
+"""Custom MCP tools for OParl MCP Server."""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote, urlparse
+
+import httpx
+from fastmcp import Context, FastMCP
+
+from .analytics import TIME_BUCKETS, AnalyticsEngine
+from .batch import fetch_objects
+from .codec import response_json
+from .config import OParlConfig
+from .expansion import EXPANSION_MODES, ReferenceExpander
+from .graph import NAMED_RELATIONS, EntityGraph
+from .pagination import (
+    CollectionResult,
+    PageFetcher,
+    collect_collection,
+    is_collection_path,
+)
+from .projection import project, project_all, validate_profile
+from .schema import ObjectRoute, OParlSchema
+from .search import SearchIndex, in_date_range
+from .utils import build_query_params, create_oparl_summary, validate_oparl_url
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_api_path(path_or_url: str, base_url: str) -> str:
+    """Turn a path or an absolute OParl URL into a path relative to the API.
+
+    Args:
+        path_or_url: Path such as ``/body/1/paper`` or a URL below ``base_url``.
+        base_url: Base URL of the OParl API.
+
+    Returns:
+        Path relative to the base URL, starting with ``/``.
+
+    Raises:
+        ValueError: If an absolute URL does not belong to the configured API.
+    """
+    if "://" not in path_or_url:
+        return "/" + path_or_url.lstrip("/")
+
+    if not validate_oparl_url(path_or_url, base_url):
+        raise ValueError(f"URL {path_or_url} does not belong to {base_url}")
+
+    base_path = urlparse(base_url).path.rstrip("/")
+    path = urlparse(path_or_url).path
+    return "/" + path[len(base_path) :].lstrip("/")
+
+
+def register_tools(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    config: OParlConfig,
+    search_index: Optional[SearchIndex] = None,
+    schema: Optional[OParlSchema] = None,
+    analytics: Optional[AnalyticsEngine] = None,
+    graph: Optional[EntityGraph] = None,
+) -> None:
+    """Register the OParl tools that go beyond the plain OpenAPI routes.
+
+    Args:
+        mcp: MCP server to register the tools on.
+        client: HTTP client for the OParl API.
+        config: Server configuration.
+        search_index: Local search index. If None, the search tool always
+            queries the upstream API.
+        schema: Schema of the OParl objects. If None, the reference
+            expansion tool and resources are not registered.
+        analytics: Column tables of fetched objects. If None, the
+            aggregation tool is not registered.
+        graph: Reference graph of fetched objects. If None, the traversal
+            tool is not registered.
+    """
+    fetcher = PageFetcher(
+        client,
+        prefetch=config.prefetch_pages,
+        max_concurrency=config.max_concurrent_requests,
+        per_host_limit=config.per_host_concurrency,
+    )
+
+    @mcp.tool(
+        name="fetch_collection",
+        tags={"oparl", "data", "collection", "read-only"},
+    )
+    async def fetch_collection(
+        path: str,
+        max_items: int = config.collection_max_items,
+        max_bytes: int = config.collection_max_bytes,
+        page_size: Optional[int] = None,
+        search: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        profile: str = config.response_profile,
+        fields: Optional[List[str]] = None,
+        ctx: Optional[Context] = None,
+    ) -> Dict[str, Any]:
+        """Fetch every page of an OParl collection in a single call.
+
+        Fetches the pages of the collection concurrently where the server's
+        pagination allows it and reports progress after each page.
+        Stops early once max_items items or max_bytes bytes of JSON have been
+        collected, in which case the result is marked as truncated.
+
+        Args:
+            path: Collection path such as /body/{bodyId}/paper, or its full URL.
+            max_items: Maximum number of items to return.
+            max_bytes: Maximum JSON size of the returned items.
+            page_size: Items requested per upstream page.
+            search: Search term, for endpoints that support it.
+            start_date: Start date filter, for endpoints that support it.
+            end_date: End date filter, for endpoints that support it.
+            profile: "summary", "standard" or "full" representation of items.
+            fields: Item fields to return instead of a profile.
+        """
+        validate_profile(profile)
+        api_path = resolve_api_path(path, config.base_url)
+        if not is_collection_path(api_path):
+            raise ValueError(f"{api_path} is not a paginated OParl collection")
+
+        params = build_query_params(
+            limit=page_size, search=search, start_date=start_date, end_date=end_date
+        )
+
+        async def report(result: CollectionResult) -> None:
+            if ctx is not None:
+                await ctx.report_progress(
+                    progress=len(result.items),
+                    total=result.total,
+                    message=f"Fetched page {result.pages} of {api_path}",
+                )
+
+        result = await collect_collection(
+            client,
+            api_path,
+            params,
+            max_items=max_items,
+            max_bytes=max_bytes,
+            on_page=report,
+            fetcher=fetcher,
+        )
+        logger.info(
+            f"Collected {len(result.items)} items from {result.pages} pages "
+            f"of {api_path}"
+        )
+        output = result.to_dict()
+        output["items"] = project_all(
+            result.items, profile, fields, config.projection_max_items
+        )
+        return output
+
+    @mcp.tool(
+        name="fetch_objects",
+        tags={"oparl", "data", "read-only"},
+    )
+    async def fetch_objects_tool(
+        urls: List[str],
+        profile: str = config.response_profile,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch many OParl objects by URL in a single call.
+
+        Use this instead of reading the objects one by one, for example for
+        the members of an organization or the related papers of a paper.
+        URLs that fail are reported in errors; the others are still returned.
+
+        Args:
+            urls: Object URLs, or paths such as /person/{personId}.
+            profile: "summary", "standard" or "full" representation of objects.
+            fields: Object fields to return instead of a profile.
+        """
+        validate_profile(profile)
+        if len(urls) > config.batch_max_urls:
+            raise ValueError(f"At most {config.batch_max_urls} URLs per call")
+
+        base = str(client.base_url).rstrip("/")
+        resolved = [
+            url if "://" in url else base + resolve_api_path(url, config.base_url)
+            for url in urls
+        ]
+        result = await fetch_objects(
+            client, resolved, config.base_url, config.max_concurrent_requests
+        )
+        logger.info(
+            f"Fetched {result.count} of {len(set(resolved))} objects "
+            f"({len(result.errors)} failed)"
+        )
+        output = result.to_dict()
+        output["objects"] = {
+            kind: {
+                url: project(obj, profile, fields, config.projection_max_items)
+                for url, obj in objects.items()
+            }
+            for kind, objects in result.objects.items()
+        }
+        return output
+
+    @mcp.tool(
+        name="search_oparl",
+        tags={"oparl", "search", "read-only"},
+    )
+    async def search_oparl(
+        query: str,
+        object_type: Optional[str] = None,
+        body_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Search papers and meetings by name, reference and paper type.
+
+        Results come from a local ranked index of the papers and meetings the
+        server has already fetched. While that index holds nothing of this
+        system or body, papers are searched through the upstream API instead,
+        which requires body_id; the date filters then apply to the first page
+        of upstream results.
+
+        Args:
+            query: Search terms.
+            object_type: Restrict results to "Paper" or "Meeting".
+            body_id: Restrict results to one body.
+            start_date: Only return items dated on or after this date (YYYY-MM-DD).
+            end_date: Only return items dated on or before this date (YYYY-MM-DD).
+            limit: Maximum number of results.
+        """
+        types = [object_type] if object_type else ["Paper", "Meeting"]
+
+        # Other systems or bodies may be indexed while this one is still cold
+        if search_index is not None and search_index.has_documents(
+            types, body=body_id, url_prefix=config.base_url
+        ):
+            hits = search_index.search(
+                query,
+                types=types,
+                start_date=start_date,
+                end_date=end_date,
+                body=body_id,
+                url_prefix=config.base_url,
+                limit=limit,
+            )
+            return {"source": "index", "results": [hit.to_dict() for hit in hits]}
+
+        if body_id is None or "Paper" not in types:
+            return {
+                "source": "index",
+                "results": [],
+                "message": "The local index holds nothing for this search; pass "
+                "body_id to search papers through the upstream API.",
+            }
+
+        params = build_query_params(limit=limit, search=query)
+        response = await client.get(
+            f"/body/{quote(body_id, safe='')}/paper", params=params
+        )
+        response.raise_for_status()
+        items = response_json(response).get("data") or []
+        # OParl has no date filter on paper collections, so filter the page
+        return {
+            "source": "upstream",
+            "results": [
+                {"id": item.get("id"), "summary": create_oparl_summary(item)}
+                for item in items
+                if isinstance(item, dict)
+                and in_date_range(item.get("date"), start_date, end_date)
+            ][:limit],
+        }
+
+    if schema is not None:
+        register_expansion(mcp, client, config, schema)
+    if analytics is not None:
+        register_analytics(mcp, config, analytics)
+    if graph is not None:
+        register_graph(mcp, config, graph, schema)
+
+
+def register_analytics(
+    mcp: FastMCP, config: OParlConfig, analytics: AnalyticsEngine
+) -> None:
+    """Register the aggregation tool over the local column tables.
+
+    Args:
+        mcp: MCP server to register the tool on.
+        config: Server configuration.
+        analytics: Column tables of fetched and harvested objects.
+    """
+
+    @mcp.tool(
+        name="aggregate_oparl",
+        tags={"oparl", "analytics", "read-only"},
+    )
+    async def aggregate_oparl(
+        object_type: str,
+        group_by: Optional[List[str]] = None,
+        bucket: Optional[str] = None,
+        time_field: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        order: str = "count",
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        """Count papers, meetings, persons or agenda items per group.
+
+        Runs locally over the objects the server has already fetched or
+        harvested, so use it instead of reading whole collections to answer
+        questions such as "papers per paperType per month" or "meetings per
+        organization". Counts only cover objects known to the server; see
+        the "known" field.
+
+        Fields available for group_by and filters, by object_type:
+
+        * Paper: body, name, reference, paperType, date, underDirectionOf,
+          originatorPerson, originatorOrganization, modified
+        * Meeting: name, meetingState, cancelled, start, end, organization,
+          modified
+        * Person: body, name, familyName, givenName, formOfAddress, gender,
+          status, modified
+        * AgendaItem: meeting, number, name, public, result, start, modified
+
+        Args:
+            object_type: "Paper", "Meeting", "Person" or "AgendaItem".
+            group_by: Fields to group by, e.g. ["paperType"] or
+                ["organization"]. List fields count each of their values.
+            bucket: Also group by "day", "week", "month" or "year".
+            time_field: Date field for bucket and the date range; defaults
+                to date (Paper), start (Meeting, AgendaItem) or modified.
+            filters: Only count objects whose field equals the value, or
+                whose list field contains it, e.g. {"paperType": "Antrag"}
+                for papers or {"organization": "<organization URL>"} for
+                meetings.
+            start_date: Only count objects dated on or after this date
+                (YYYY-MM-DD).
+            end_date: Only count objects dated on or before this date.
+            order: Sort groups by descending "count" or ascending "key".
+            limit: Maximum number of groups.
+        """
+        if bucket is not None and bucket not in TIME_BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(TIME_BUCKETS)}")
+
+        result = analytics.aggregate(
+            object_type,
+            group_by=group_by or [],
+            time_field=time_field,
+            bucket=bucket,
+            filters=filters,
+            start_date=start_date,
+            end_date=end_date,
+            url_prefix=config.base_url,
+            order=order,
+            limit=limit,
+        )
+        result["known"] = len(analytics.table(object_type))
+        return result
+
+
+def register_graph(
+    mcp: FastMCP,
+    config: OParlConfig,
+    graph: EntityGraph,
+    schema: Optional[OParlSchema] = None,
+) -> None:
+    """Register the traversal tool and relation resources of the local graph.
+
+    Besides the ``traverse_oparl`` tool, every templated object resource
+    such as ``resource://getPaper/{paperId}`` gets a variant per named
+    reverse relation of its type, e.g. ``/consultedIn``.
+
+    Args:
+        mcp: MCP server to register the tool and resources on.
+        config: Server configuration.
+        graph: Reference graph of fetched and harvested objects.
+        schema: Schema of the OParl objects. If None, the relation resources
+            are not registered.
+    """
+
+    @mcp.tool(
+        name="traverse_oparl",
+        tags={"oparl", "graph", "read-only"},
+    )
+    async def traverse_oparl(
+        start: str, path: List[str], limit: int = 50
+    ) -> Dict[str, Any]:
+        """Follow references between OParl objects the server already knows.
+
+        Answers questions such as "all papers consulted in meetings of
+        organization X" locally instead of reading whole collections. Each
+        step either follows a reference field forward, such as
+        "organization" or "paper", or is written "<-Type.field" to go to the
+        objects of that type referencing the current ones. For example,
+        start=<organization URL> with path ["<-Meeting.organization",
+        "<-Consultation.meeting", "paper"] lists the papers consulted in
+        the organization's meetings. Only objects fetched or harvested so
+        far are followed.
+
+        Args:
+            start: Object URL or path such as /organization/{organizationId}.
+            path: Traversal steps.
+            limit: Maximum number of objects returned.
+        """
+        if "://" not in start:
+            start = config.base_url.rstrip("/") + resolve_api_path(
+                start, config.base_url
+            )
+
+        urls = graph.traverse([start], path)
+        return {
+            "start": start,
+            "path": path,
+            "results": [graph.summary(url) for url in urls[:limit]],
+            "count": len(urls),
+            "truncated": len(urls) > limit,
+        }
+
+    for route in schema.object_routes if schema is not None else ():
+        for name, path in NAMED_RELATIONS.get(route.type, {}).items():
+            try:
+                graph.check_path(path)
+            except ValueError as e:
+                logger.debug(f"Skipping relation {route.type}.{name}: {e}")
+                continue
+            _register_relation_resource(mcp, config, graph, route, name, path)
+
+
+def _register_relation_resource(
+    mcp: FastMCP,
+    config: OParlConfig,
+    graph: EntityGraph,
+    route: ObjectRoute,
+    name: str,
+    path: Sequence[str],
+) -> None:
+    """Register a resource listing the objects in a reverse relation."""
+
+    async def read_relation(**params: str) -> Dict[str, Any]:
+        url = config.base_url.rstrip("/") + route.path.replace(
+            f"{{{route.parameter}}}", quote(params[route.parameter], safe="")
+        )
+        urls = graph.traverse([url], path)
+        limit = config.collection_max_items
+        return {
+            "id": url,
+            "relation": name,
+            "results": [graph.summary(target) for target in urls[:limit]],
+            "count": len(urls),
+            "truncated": len(urls) > limit,
+        }
+
+    mcp.resource(
+        f"resource://{route.operation_id}/{{{route.parameter}}}/{name}",
+        name=f"{route.operation_id}{name[0].upper()}{name[1:]}",
+        description=(
+            f"Objects related to a {route.type} as {name}, found by "
+            f"following {', '.join(path)} over the objects fetched so far"
+        ),
+        mime_type="application/json",
+        tags={"oparl", "graph", "read-only"},
+    )(read_relation)
+
+
+def register_expansion(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    config: OParlConfig,
+    schema: OParlSchema,
+) -> None:
+    """Register the tool and resources that expand object references.
+
+    Besides the ``expand_object`` tool, every templated object resource such
+    as ``resource://getMeeting/{meetingId}`` gets an ``/expanded`` variant
+    returning the object with its references embedded.
+
+    Args:
+        mcp: MCP server to register the tool and resources on.
+        client: HTTP client for the OParl API.
+        config: Server configuration.
+        schema: Schema of the OParl objects.
+    """
+    expander = ReferenceExpander(
+        client,
+        schema,
+        config.base_url,
+        fan_out=config.expand_fan_out,
+        max_objects=config.expand_max_objects,
+        max_concurrency=config.max_concurrent_requests,
+    )
+
+    @mcp.tool(
+        name="expand_object",
+        tags={"oparl", "data", "read-only"},
+    )
+    async def expand_object(
+        path: str,
+        depth: int = config.expand_default_depth,
+        fan_out: int = config.expand_fan_out,
+        mode: str = "bundle",
+        profile: str = config.response_profile,
+    ) -> Dict[str, Any]:
+        """Fetch an OParl object together with the objects it references.
+
+        Follows references such as the organizations, participants and
+        agenda items of a meeting, or the consultations, originators and
+        files of a paper, concurrently and returns them in one result.
+
+        Args:
+            path: Object path such as /meeting/{meetingId}, or its full URL.
+            depth: Number of reference levels to follow.
+            fan_out: Maximum references followed per field, and items per
+                referenced collection.
+            mode: "bundle" returns the object and the referenced objects keyed
+                by URL; "embedded" replaces the references with the objects.
+            profile: "summary", "standard" or "full" representation of the
+                object and the referenced objects.
+        """
+        validate_profile(profile)
+        if mode not in EXPANSION_MODES:
+            raise ValueError(f"mode must be one of {', '.join(EXPANSION_MODES)}")
+        if not 0 <= depth <= config.expand_max_depth:
+            raise ValueError(f"depth must be between 0 and {config.expand_max_depth}")
+
+        api_path = resolve_api_path(path, config.base_url)
+        if is_collection_path(api_path):
+            raise ValueError(f"{api_path} is a collection; use fetch_collection")
+
+        expansion = await expander.expand(
+            str(client.base_url).rstrip("/") + api_path, depth, fan_out
+        )
+        max_items = config.projection_max_items
+        if mode == "embedded":
+            return _project_embedded(expansion.to_embedded(schema), profile, max_items)
+
+        bundle = expansion.to_bundle()
+        if isinstance(expansion.object, dict):
+            bundle["object"] = project(expansion.object, profile, max_items=max_items)
+        bundle["included"] = {
+            url: (
+                project_all(target, profile, max_items=max_items)
+                if isinstance(target, list)
+                else project(target, profile, max_items=max_items)
+            )
+            for url, target in expansion.included.items()
+        }
+        return bundle
+
+    for route in schema.object_routes:
+        _register_expanded_resource(mcp, client, config, schema, expander, route)
+
+
+def _register_expanded_resource(
+    mcp: FastMCP,
+    client: httpx.AsyncClient,
+    config: OParlConfig,
+    schema: OParlSchema,
+    expander: ReferenceExpander,
+    route: ObjectRoute,
+) -> None:
+    """Register the expanded variant of a templated object resource."""
+
+    async def read_expanded(**params: str) -> Dict[str, Any]:
+        path = route.path.replace(
+            f"{{{route.parameter}}}", quote(params[route.parameter], safe="")
+        )
+        expansion = await expander.expand(
+            str(client.base_url).rstrip("/") + path, config.expand_default_depth
+        )
+        return _project_embedded(
+            expansion.to_embedded(schema),
+            config.response_profile,
+            config.projection_max_items,
+        )
+
+    mcp.resource(
+        f"resource://{route.operation_id}/{{{route.parameter}}}/expanded",
+        name=f"{route.operation_id}Expanded",
+        description=(
+            f"{route.type} with its references embedded "
+            f"up to depth {config.expand_default_depth}"
+        ),
+        mime_type="application/json",
+        tags={"oparl", "data", "read-only"},
+    )(read_expanded)
+
+
+def _project_embedded(
+    embedded: Dict[str, Any], profile: str, max_items: int
+) -> Dict[str, Any]:
+    """Project an object with embedded references."""
+    # A one-line summary would drop the embedded objects
+    if profile == "summary":
+        profile = "standard"
+    return project(embedded, profile, max_items=max_items)
@@ -1,12 +1,16 @@
 """Utility functions for OParl MCP Server."""
 
 import logging
-from datetime import date, datetime
-from typing import Any, Dict, Optional
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, Optional
 from urllib.parse import urlparse
 
+from .normalize import ResponseNormalizer
+
 logger = logging.getLogger(__name__)
 
+_normalizer = ResponseNormalizer()
+
 
 def format_oparl_date(date_obj: Optional[Any]) -> Optional[str]:
     """Format date object for OParl API.
@@ -29,6 +33,27 @@ def format_oparl_date(date_obj: Optional[Any]) -> Optional[str]:
     return str(date_obj)
 
 
+def parse_oparl_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an OParl date-time such as a ``modified`` stamp.
+
+    Args:
+        value: ISO 8601 date-time; timestamps without an offset are taken
+            as UTC.
+
+    Returns:
+        Timezone-aware date-time, or None if the value is not a date-time.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 def build_query_params(
     limit: Optional[int] = None,
     offset: Optional[int] = None,
@@ -114,34 +139,40 @@ def extract_resource_id(url: str) -> Optional[str]:
 def format_oparl_response(data: Any) -> Any:
     """Format OParl API response for better readability.
 
+    Normalizes the dates of all objects in the response, including nested
+    objects and collection items, and adds a ``_meta`` block to a top-level
+    object. The input is not modified.
+
     Args:
         data: Raw response data from OParl API.
 
     Returns:
         Formatted response data.
     """
-    if isinstance(data, dict):
-        # Add metadata if not present
-        if "_meta" not in data:
-            data["_meta"] = {
-                "oparl_version": "1.1",
-                "formatted_at": datetime.now().isoformat(),
-                "source": "oparl-mcp-server",
-            }
-
-        # Format dates in the response
-        for key, value in data.items():
-            if isinstance(value, str) and key.endswith(
-                ("Date", "Time", "created", "modified")
-            ):
-                try:
-                    # Try to parse and reformat the date
-                    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                    data[key] = parsed.isoformat()
-                except (ValueError, AttributeError):
-                    pass  # Keep original value if parsing fails
-
-    return data
+    return _normalizer.normalize(data)
+
+
+def iter_oparl_objects(data: Any) -> Iterator[Dict[str, Any]]:
+    """Iterate over the OParl objects contained in a response.
+
+    Args:
+        data: Decoded response, either a single object or a collection page
+            with a ``data`` list.
+
+    Yields:
+        Every object that has an ``id`` and a ``type``.
+    """
+    if not isinstance(data, dict):
+        return
+
+    if "id" in data and "type" in data:
+        yield data
+
+    items = data.get("data")
+    if isinstance(items, list):
+        for item in items:
+            if isinstance(item, dict) and "id" in item and "type" in item:
+                yield item
 
 
 def get_oparl_object_type(url: str) -> Optional[str]:
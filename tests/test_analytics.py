@@ -0,0 +1,186 @@
+"""Tests for the local analytics tables."""
+
+import csv
+import json
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from oparl_mcp.analytics import TABLE_FIELDS, AnalyticsEngine
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.tools import register_analytics
+
+BASE = "https://oparl.example.org"
+TYPE = "https://schema.oparl.org/1.1/"
+
+
+def paper(n, paper_type, day, body="1"):
+    """Create a paper."""
+    return {
+        "id": f"{BASE}/paper/{n}",
+        "type": f"{TYPE}Paper",
+        "body": f"{BASE}/body/{body}",
+        "name": f"Paper {n}",
+        "paperType": paper_type,
+        "date": day,
+        "originatorPerson": [f"{BASE}/person/{n % 2}"],
+    }
+
+
+def meeting(n, start, organizations):
+    """Create a meeting with one embedded agenda item."""
+    return {
+        "id": f"{BASE}/meeting/{n}",
+        "type": f"{TYPE}Meeting",
+        "start": start,
+        "organization": [f"{BASE}/organization/{o}" for o in organizations],
+        "agendaItem": [
+            {
+                "id": f"{BASE}/agendaItem/{n}",
+                "type": f"{TYPE}AgendaItem",
+                "public": True,
+            }
+        ],
+    }
+
+
+PAPERS = [
+    paper(1, "Antrag", "2024-01-15"),
+    paper(2, "Antrag", "2024-01-20"),
+    paper(3, "Anfrage", "2024-02-03"),
+    paper(4, "Antrag", "2024-02-28", body="2"),
+    paper(5, "Mitteilung", None),
+]
+
+MEETINGS = [
+    meeting(1, "2024-01-15T18:00:00+01:00", [1, 2]),
+    meeting(2, "2024-01-22T18:00:00+01:00", [1]),
+    meeting(3, "2024-01-29T18:00:00+01:00", []),
+]
+
+
+@pytest.fixture
+def engine():
+    """Create an engine holding the test papers and meetings."""
+    engine = AnalyticsEngine()
+    engine.add_many(PAPERS + MEETINGS)
+    return engine
+
+
+class TestAnalyticsEngine:
+    """Test cases for AnalyticsEngine."""
+
+    def test_group_by_field_and_month(self, engine):
+        """Test counting per field value and time bucket."""
+        result = engine.aggregate(
+            "Paper", group_by=["paperType"], bucket="month", order="key"
+        )
+
+        assert result["groups"] == [
+            {"paperType": "Anfrage", "month": "2024-02", "count": 1},
+            {"paperType": "Antrag", "month": "2024-01", "count": 2},
+            {"paperType": "Antrag", "month": "2024-02", "count": 1},
+            {"paperType": "Mitteilung", "month": None, "count": 1},
+        ]
+        assert result["matched"] == 5
+        assert not result["truncated"]
+
+    def test_filters_and_dates(self, engine):
+        """Test filters, list containment and date ranges."""
+        by_body = engine.aggregate("Paper", filters={"body": f"{BASE}/body/1"})
+        by_person = engine.aggregate(
+            "Paper", filters={"originatorPerson": f"{BASE}/person/0"}
+        )
+        in_february = engine.aggregate(
+            "Paper", start_date="2024-02-01", end_date="2024-02-29"
+        )
+
+        assert by_body["groups"] == [{"count": 4}]
+        assert by_person["matched"] == 2
+        assert in_february["matched"] == 2
+
+    def test_list_fields_and_weeks(self, engine):
+        """Test that list fields count every value."""
+        per_organization = engine.aggregate("Meeting", group_by=["organization"])
+        per_week = engine.aggregate("Meeting", bucket="week", order="key")
+
+        assert per_organization["groups"] == [
+            {"organization": f"{BASE}/organization/1", "count": 2},
+            {"organization": f"{BASE}/organization/2", "count": 1},
+            {"organization": None, "count": 1},
+        ]
+        assert [group["week"] for group in per_week["groups"]] == [
+            "2024-W03",
+            "2024-W04",
+            "2024-W05",
+        ]
+
+    def test_updates_and_deletions(self, engine):
+        """Test that objects are replaced, removed and embedded items added."""
+        engine.add({**PAPERS[0], "paperType": "Anfrage"})
+        engine.add({**PAPERS[1], "deleted": True})
+
+        result = engine.aggregate("Paper", group_by=["paperType"])
+        counts = {group["paperType"]: group["count"] for group in result["groups"]}
+
+        assert counts == {"Anfrage": 2, "Antrag": 1, "Mitteilung": 1}
+        assert engine.counts()["AgendaItem"] == 3
+        assert engine.aggregate("AgendaItem", group_by=["meeting"])["total_groups"] == 3
+
+    def test_invalid_queries(self, engine):
+        """Test errors for unknown types, fields and buckets."""
+        with pytest.raises(ValueError, match="object_type"):
+            engine.aggregate("File")
+        with pytest.raises(ValueError, match="Unknown Paper field"):
+            engine.aggregate("Paper", group_by=["secret"])
+        with pytest.raises(ValueError, match="bucket"):
+            engine.aggregate("Paper", bucket="quarter")
+
+    def test_csv_export(self, engine, tmp_path):
+        """Test exporting the tables as CSV files."""
+        paths = engine.export(tmp_path, file_format="csv")
+
+        with open(tmp_path / "Paper.csv", newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        assert len(paths) == 4
+        assert len(rows) == 5
+        assert rows[0]["originatorPerson"] == f"{BASE}/person/1"
+
+
+class TestAggregateTool:
+    """Test cases for the aggregate_oparl tool."""
+
+    @pytest.mark.asyncio
+    async def test_tool(self, engine):
+        """Test that the tool aggregates objects of its own system."""
+        engine.add({**PAPERS[0], "id": "https://other.example.org/paper/1"})
+        mcp = FastMCP("test")
+        register_analytics(mcp, OParlConfig(base_url=BASE), engine)
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "aggregate_oparl", {"object_type": "Paper", "bucket": "year"}
+            )
+
+        data = json.loads(result.content[0].text)
+        assert data["groups"][0] == {"year": "2024", "count": 4}
+        assert data["matched"] == 5
+        assert data["known"] == 6
+
+    @pytest.mark.asyncio
+    async def test_description_lists_fields(self, engine):
+        """Test that the tool documents the fields of every table."""
+        mcp = FastMCP("test")
+        register_analytics(mcp, OParlConfig(base_url=BASE), engine)
+
+        async with Client(mcp) as client:
+            tools = {tool.name: tool for tool in await client.list_tools()}
+
+        description = " ".join(tools["aggregate_oparl"].description.split())
+        for object_type, fields in TABLE_FIELDS.items():
+            assert f"{object_type}: {', '.join(fields)}" in description
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
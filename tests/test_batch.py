@@ -0,0 +1,127 @@
+"""Tests for fetching OParl objects in batches."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from oparl_mcp.batch import fetch_objects
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.tools import register_tools
+
+BASE_URL = "https://oparl.example.org"
+TYPE = "https://schema.oparl.org/1.1/"
+
+
+def make_client(delay: float = 0.0):
+    """Create an HTTP client for a mock API serving persons and papers."""
+    calls = []
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        calls.append(request)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(delay)
+        active -= 1
+
+        kind, _, number = request.url.path.strip("/").partition("/")
+        if number == "404":
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(
+            200,
+            json={
+                "id": str(request.url),
+                "type": f"{TYPE}{kind.capitalize()}",
+                "name": f"{kind} {number}",
+            },
+        )
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url=BASE_URL
+    )
+    return client, calls, lambda: peak
+
+
+class TestFetchObjects:
+    """Test cases for fetch_objects."""
+
+    @pytest.mark.asyncio
+    async def test_groups_by_type(self):
+        """Test that objects are fetched once and grouped by type."""
+        client, calls, _ = make_client()
+        urls = [
+            f"{BASE_URL}/person/1",
+            f"{BASE_URL}/paper/1",
+            f"{BASE_URL}/person/2",
+            f"{BASE_URL}/person/1",
+        ]
+
+        result = await fetch_objects(client, urls, BASE_URL)
+
+        assert result.count == 3
+        assert set(result.objects["Person"]) == {urls[0], urls[2]}
+        assert result.objects["Paper"][urls[1]]["name"] == "paper 1"
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_partial_results(self):
+        """Test that failing and rejected URLs do not fail the batch."""
+        client, calls, _ = make_client()
+        urls = [
+            f"{BASE_URL}/person/1",
+            f"{BASE_URL}/person/404",
+            "https://other.example.org/person/1",
+            f"{BASE_URL}/body/1/paper",
+        ]
+
+        result = await fetch_objects(client, urls, BASE_URL)
+
+        assert result.to_dict()["count"] == 1
+        assert set(result.errors) == set(urls[1:])
+        assert "404" in result.errors[urls[1]]
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test that requests run concurrently up to the limit."""
+        client, _, peak = make_client(delay=0.01)
+        urls = [f"{BASE_URL}/person/{n}" for n in range(20)]
+
+        result = await fetch_objects(client, urls, BASE_URL, max_concurrency=4)
+
+        assert result.count == 20
+        assert peak() == 4
+
+
+class TestFetchObjectsTool:
+    """Test cases for the fetch_objects MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_objects_tool(self):
+        """Test fetching objects by URL and path through MCP."""
+        client, _, _ = make_client()
+        mcp = FastMCP("test")
+        config = OParlConfig(base_url=BASE_URL, batch_max_urls=3)
+        register_tools(mcp, client, config)
+
+        async with Client(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "fetch_objects", {"urls": [f"{BASE_URL}/person/1", "/paper/404"]}
+            )
+            too_many = await mcp_client.call_tool(
+                "fetch_objects",
+                {"urls": [f"/person/{n}" for n in range(4)]},
+                raise_on_error=False,
+            )
+
+        assert result.data["count"] == 1
+        assert list(result.data["errors"]) == [f"{BASE_URL}/paper/404"]
+        assert too_many.is_error
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,343 @@
+"""Tests for OParl response caching."""
+
+import httpx
+import pytest
+
+from oparl_mcp.cache import CacheEntry, CachingTransport, ResponseCache
+from oparl_mcp.refresh import RefreshScheduler
+
+
+def make_transport(cache=None):
+    """Create a caching transport over a mock upstream that counts calls."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"id": str(request.url)})
+
+    transport = CachingTransport(httpx.MockTransport(handler), cache=cache)
+    return transport, calls
+
+
+def make_entry(size: int, expires_at: float = float("inf")) -> CacheEntry:
+    """Create a cache entry with a body of the given size."""
+    return CacheEntry(
+        status_code=200,
+        headers=[],
+        content=b"x" * size,
+        stored_at=0.0,
+        expires_at=expires_at,
+    )
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    def test_ttl_rules(self):
+        """Test per-path TTL lookup."""
+        cache = ResponseCache(default_ttl=10.0)
+
+        assert cache.ttl_for_path("/system") == 3600.0
+        assert cache.ttl_for_path("/oparl/v1/body") == 3600.0
+        assert cache.ttl_for_path("/body/1") == 3600.0
+        assert cache.ttl_for_path("/body/1/meeting") == 60.0
+        assert cache.ttl_for_path("/paper/1") == 10.0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", make_entry(1))
+        cache.set("b", make_entry(1))
+        cache.get("a")
+        cache.set("c", make_entry(1))
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.stats.evictions == 1
+
+    def test_byte_limit(self):
+        """Test that the cache stays within its byte budget."""
+        cache = ResponseCache(max_bytes=100)
+        cache.set("a", make_entry(60))
+        cache.set("b", make_entry(60))
+        cache.set("c", make_entry(200))
+
+        assert len(cache) == 1
+        assert cache.current_bytes == 60
+        assert cache.get("b") is not None
+
+    def test_expired_entry_is_miss(self):
+        """Test that expired entries are not served."""
+        cache = ResponseCache()
+        cache.set("a", make_entry(1, expires_at=0.0))
+
+        assert cache.get("a") is None
+        assert cache.stats.misses == 1
+
+
+class TestCachingTransport:
+    """Test cases for CachingTransport."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_is_served_from_cache(self):
+        """Test that a repeated GET hits the upstream only once."""
+        transport, calls = make_transport()
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            first = await client.get("/system")
+            second = await client.get("/system")
+
+        assert len(calls) == 1
+        assert first.json() == second.json()
+        assert transport.cache.stats.hits == 1
+        assert transport.cache.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_authorization_is_part_of_key(self):
+        """Test that responses are not shared between credentials."""
+        transport, calls = make_transport()
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/system", headers={"Authorization": "Bearer a"})
+            await client.get("/system", headers={"Authorization": "Bearer b"})
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_non_get_and_errors_are_not_cached(self):
+        """Test that only successful GET responses are cached."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(404 if request.method == "GET" else 200)
+
+        transport = CachingTransport(httpx.MockTransport(handler))
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/paper/1")
+            await client.get("/paper/1")
+            await client.post("/paper")
+            await client.post("/paper")
+
+        assert len(calls) == 4
+        assert len(transport.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_listeners_receive_fetched_objects(self):
+        """Test that listeners see the objects of upstream responses."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200, json={"data": [{"id": "p1", "type": "Paper"}, {"id": "x"}]}
+            )
+
+        received = []
+        transport = CachingTransport(httpx.MockTransport(handler))
+        transport.add_listener(received.extend)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/body/1/paper")
+            await client.get("/body/1/paper")
+
+        assert received == [{"id": "p1", "type": "Paper"}]
+
+
+class TestRevalidation:
+    """Test cases for conditional revalidation of expired entries."""
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation_serves_cached_body(self):
+        """Test that a 304 answer renews the cached body."""
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers)
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json={"name": "Rat"}, headers={"ETag": '"v1"'})
+
+        cache = ResponseCache(default_ttl=0.0)
+        transport = CachingTransport(httpx.MockTransport(handler), cache=cache)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/paper/1")
+            response = await client.get("/paper/1")
+
+        assert response.status_code == 200
+        assert response.json() == {"name": "Rat"}
+        assert seen_headers[1]["if-none-match"] == '"v1"'
+        assert cache.stats.not_modified == 1
+
+    @pytest.mark.asyncio
+    async def test_modified_field_fallback(self):
+        """Test that the OParl modified field is used without HTTP validators."""
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers)
+            if "if-modified-since" in request.headers:
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json={
+                    "data": [
+                        {"id": "p1", "modified": "2024-01-01T10:00:00+01:00"},
+                        {"id": "p2", "modified": "2024-03-05T08:30:00Z"},
+                    ]
+                },
+            )
+
+        cache = ResponseCache(default_ttl=0.0)
+        transport = CachingTransport(httpx.MockTransport(handler), cache=cache)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/body/1/paper")
+            response = await client.get("/body/1/paper")
+
+        assert len(response.json()["data"]) == 2
+        assert seen_headers[1]["if-modified-since"] == "Tue, 05 Mar 2024 08:30:00 GMT"
+
+    @pytest.mark.asyncio
+    async def test_revalidation_disabled(self):
+        """Test that expired entries are refetched when revalidation is off."""
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers)
+            return httpx.Response(200, json={}, headers={"ETag": '"v1"'})
+
+        cache = ResponseCache(default_ttl=0.0)
+        transport = CachingTransport(
+            httpx.MockTransport(handler), cache=cache, revalidate=False
+        )
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/paper/1")
+            await client.get("/paper/1")
+
+        assert "if-none-match" not in seen_headers[1]
+        assert cache.stats.revalidations == 0
+
+
+def make_versioned_transport(cache, **kwargs):
+    """Create a caching transport over an upstream that counts its answers."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"version": len(calls)})
+
+    refresher = RefreshScheduler(workers=2)
+    transport = CachingTransport(
+        httpx.MockTransport(handler), cache=cache, refresher=refresher, **kwargs
+    )
+    return transport, refresher, calls
+
+
+class TestStaleWhileRevalidate:
+    """Test cases for serving stale entries while refreshing them."""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_refreshed_in_background(self):
+        """Test that an expired entry is served at once and then refreshed."""
+        cache = ResponseCache(default_ttl=0.0)
+        transport, refresher, calls = make_versioned_transport(cache)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/paper/1")
+            stale = await client.get("/paper/1")
+            await refresher.join()
+            refreshed = await client.get("/paper/1")
+            await refresher.aclose()
+
+        assert stale.json() == {"version": 1}
+        assert "stale" in stale.headers["warning"].lower()
+        assert refreshed.json() == {"version": 2}
+        assert calls[1].headers["cache-control"] == "no-cache"
+        assert refresher.stats.completed >= 1
+
+    @pytest.mark.asyncio
+    async def test_max_stale(self):
+        """Test that entries past the maximum staleness are fetched directly."""
+        cache = ResponseCache(default_ttl=0.0)
+        transport, refresher, calls = make_versioned_transport(cache, max_stale=0.0)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/paper/1")
+            response = await client.get("/paper/1")
+
+        assert response.json() == {"version": 2}
+        assert refresher.stats.scheduled == 0
+
+    @pytest.mark.asyncio
+    async def test_hot_entries_are_refreshed_ahead(self):
+        """Test refreshing hot entries before they expire."""
+        cache = ResponseCache()
+        transport, refresher, calls = make_versioned_transport(cache, refresh_ahead=0.0)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            await client.get("/system")
+            await client.get("/paper/1")
+
+            assert transport.refresh_expiring(within=7200.0) == 1
+            await refresher.join()
+            response = await client.get("/system")
+
+            # Paper entries become hot once they are read repeatedly
+            for _ in range(3):
+                await client.get("/paper/1")
+            assert transport.refresh_expiring(within=7200.0) == 2
+            await refresher.join()
+            await refresher.aclose()
+
+        assert response.json() == {"version": 3}
+        assert len(calls) == 5
+
+    @pytest.mark.asyncio
+    async def test_scheduler_limits(self):
+        """Test that refreshes are deduplicated and dropped when queued up."""
+        refresher = RefreshScheduler(workers=1, queue_size=1)
+        ran = []
+
+        async def refresh() -> None:
+            ran.append(1)
+
+        assert refresher.schedule("a", refresh)
+        assert not refresher.schedule("a", refresh)
+        assert not refresher.schedule("b", refresh)
+        await refresher.join()
+        await refresher.aclose()
+
+        assert ran == [1]
+        assert refresher.stats.as_dict() == {
+            "scheduled": 1,
+            "completed": 1,
+            "failed": 0,
+            "dropped": 1,
+        }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
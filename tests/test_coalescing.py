@@ -0,0 +1,116 @@
+"""Tests for request coalescing."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from oparl_mcp.coalescing import CoalescingTransport
+
+BASE_URL = "https://oparl.example.org"
+
+
+def make_transport(delay: float = 0.05, status_code: int = 200):
+    """Create a coalescing transport over a slow mock API."""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        await asyncio.sleep(delay)
+        return httpx.Response(
+            status_code, json={"id": str(request.url), "call": len(calls)}
+        )
+
+    return CoalescingTransport(httpx.MockTransport(handler)), calls
+
+
+class TestCoalescingTransport:
+    """Test cases for CoalescingTransport."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests(self):
+        """Test that concurrent identical GETs share one upstream request."""
+        transport, calls = make_transport()
+        client = httpx.AsyncClient(transport=transport, base_url=BASE_URL)
+
+        responses = await asyncio.gather(*(client.get("/meeting/1") for _ in range(10)))
+
+        assert len(calls) == 1
+        assert all(
+            r.json() == {"id": f"{BASE_URL}/meeting/1", "call": 1} for r in responses
+        )
+        assert len({id(r) for r in responses}) == 10
+        assert transport.stats.as_dict() == {
+            "requests": 10,
+            "coalesced": 9,
+            "upstream": 1,
+            "max_waiters": 10,
+        }
+
+    @pytest.mark.asyncio
+    async def test_distinct_requests(self):
+        """Test that different URLs, queries and credentials are not shared."""
+        transport, calls = make_transport()
+        client = httpx.AsyncClient(transport=transport, base_url=BASE_URL)
+
+        await asyncio.gather(
+            client.get("/body/1"),
+            client.get("/body/2"),
+            client.get("/body/1", params={"limit": 5}),
+            client.get("/body/1", headers={"Authorization": "Bearer other"}),
+        )
+
+        assert len(calls) == 4
+        assert transport.stats.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests(self):
+        """Test that only requests in flight at the same time are coalesced."""
+        transport, calls = make_transport(delay=0)
+        client = httpx.AsyncClient(transport=transport, base_url=BASE_URL)
+
+        first = await client.get("/body/1")
+        second = await client.get("/body/1")
+
+        assert len(calls) == 2
+        assert first.json()["call"] == 1
+        assert second.json()["call"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self):
+        """Test that upstream errors reach every waiting caller."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("unreachable", request=request)
+
+        client = httpx.AsyncClient(
+            transport=CoalescingTransport(httpx.MockTransport(handler)),
+            base_url=BASE_URL,
+        )
+
+        results = await asyncio.gather(
+            *(client.get("/system") for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, httpx.ConnectError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller(self):
+        """Test that a cancelled caller does not cancel the shared request."""
+        transport, calls = make_transport()
+        client = httpx.AsyncClient(transport=transport, base_url=BASE_URL)
+
+        first = asyncio.create_task(client.get("/body/1"))
+        second = asyncio.create_task(client.get("/body/1"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        response = await second
+
+        assert response.status_code == 200
+        assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
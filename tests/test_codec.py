@@ -0,0 +1,70 @@
+"""Tests for the JSON codec."""
+
+import importlib.util
+
+import httpx
+import pytest
+
+from oparl_mcp import codec
+
+DOCUMENT = {
+    "id": "https://oparl.example.org/paper/1",
+    "name": "Änderung der Straßenreinigungssatzung",
+    "auxiliaryFile": [{"size": 12345, "public": True}],
+    "date": None,
+    "score": 0.5,
+}
+
+AVAILABLE = [
+    name
+    for name in codec.BACKENDS
+    if name == "json" or importlib.util.find_spec(name) is not None
+]
+
+
+@pytest.fixture
+def restore_backend():
+    """Restore the selected backend after a test."""
+    previous = codec.backend
+    yield
+    codec.use_backend(previous)
+
+
+class TestCodec:
+    """Test cases for the JSON codec."""
+
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_round_trip(self, name, restore_backend):
+        """Test that every backend decodes and encodes the same objects."""
+        codec.use_backend(name)
+
+        encoded = codec.dumps(DOCUMENT)
+
+        assert isinstance(encoded, bytes)
+        assert b'", "' not in encoded and b'": ' not in encoded
+        assert "Straßen".encode("utf-8") in encoded
+        assert codec.loads(encoded) == DOCUMENT
+        assert codec.loads(encoded.decode("utf-8")) == DOCUMENT
+
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_invalid_json(self, name, restore_backend):
+        """Test that invalid documents raise ValueError."""
+        codec.use_backend(name)
+
+        with pytest.raises(ValueError):
+            codec.loads(b'{"id": ')
+
+    def test_response_json(self):
+        """Test decoding response bodies."""
+        response = httpx.Response(200, json=DOCUMENT)
+
+        assert codec.response_json(response) == response.json()
+
+    def test_unknown_backend(self):
+        """Test selecting an unknown backend."""
+        with pytest.raises(ValueError):
+            codec.use_backend("yaml")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
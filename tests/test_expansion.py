@@ -0,0 +1,230 @@
+"""Tests for OParl reference expansion."""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.expansion import ReferenceExpander
+from oparl_mcp.schema import OParlSchema
+from oparl_mcp.tools import register_tools
+
+BASE_URL = "https://oparl.example.org"
+SPEC_PATH = Path(__file__).parent.parent / "oparl_openapi.json"
+TYPE = "https://schema.oparl.org/1.1/"
+
+
+def load_schema() -> OParlSchema:
+    """Load the schema of the bundled OpenAPI specification."""
+    return OParlSchema.from_spec(json.loads(SPEC_PATH.read_text(encoding="utf-8")))
+
+
+OBJECTS = {
+    "/meeting/1": {
+        "id": f"{BASE_URL}/meeting/1",
+        "type": f"{TYPE}Meeting",
+        "name": "Council meeting",
+        "body": f"{BASE_URL}/body/1",
+        "organization": [f"{BASE_URL}/organization/1"],
+        "participant": [f"{BASE_URL}/person/1", f"{BASE_URL}/person/2"],
+        "agendaItem": f"{BASE_URL}/meeting/1/agendaItem",
+        "invitation": "https://files.other.org/invitation.pdf",
+    },
+    "/meeting/1/agendaItem": {
+        "data": [
+            {
+                "id": f"{BASE_URL}/agendaItem/1",
+                "type": f"{TYPE}AgendaItem",
+                "meeting": f"{BASE_URL}/meeting/1",
+                "consultation": [f"{BASE_URL}/consultation/1"],
+            },
+            {
+                "id": f"{BASE_URL}/agendaItem/2",
+                "type": f"{TYPE}AgendaItem",
+                "meeting": f"{BASE_URL}/meeting/1",
+            },
+        ],
+        "links": {},
+    },
+    "/organization/1": {
+        "id": f"{BASE_URL}/organization/1",
+        "type": f"{TYPE}Organization",
+        "member": [f"{BASE_URL}/person/1"],
+    },
+    "/person/1": {
+        "id": f"{BASE_URL}/person/1",
+        "type": f"{TYPE}Person",
+        "name": "Jane Doe",
+        "affiliation": [f"{BASE_URL}/organization/1"],
+    },
+}
+
+
+def make_client():
+    """Create an HTTP client for a mock API with a meeting and its references."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        obj = OBJECTS.get(request.url.path)
+        if obj is None:
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(200, json=obj)
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url=BASE_URL
+    )
+    return client, calls
+
+
+class TestOParlSchema:
+    """Test cases for OParlSchema."""
+
+    def test_from_spec(self):
+        """Test deriving reference fields and object routes."""
+        schema = load_schema()
+
+        assert "agendaItem" in schema.reference_fields["Meeting"]
+        assert "originatorPerson" in schema.reference_fields["Paper"]
+        assert "id" not in schema.reference_fields["Meeting"]
+        routes = {route.operation_id: route for route in schema.object_routes}
+        assert routes["getMeeting"].path == "/meeting/{meetingId}"
+        assert routes["getMeeting"].parameter == "meetingId"
+        assert routes["getPaper"].type == "Paper"
+
+
+class TestReferenceExpander:
+    """Test cases for ReferenceExpander."""
+
+    @pytest.mark.asyncio
+    async def test_expand_bundle(self):
+        """Test that references are fetched once and collections resolved."""
+        client, calls = make_client()
+        expander = ReferenceExpander(client, load_schema(), BASE_URL)
+
+        expansion = await expander.expand("/meeting/1", depth=2)
+        bundle = expansion.to_bundle()
+
+        assert bundle["object"] == OBJECTS["/meeting/1"]
+        included = bundle["included"]
+        assert included[f"{BASE_URL}/person/1"]["name"] == "Jane Doe"
+        assert len(included[f"{BASE_URL}/meeting/1/agendaItem"]) == 2
+        assert f"{BASE_URL}/agendaItem/2" in included
+        # Missing objects are reported, not raised
+        assert f"{BASE_URL}/person/2" in bundle["errors"]
+        assert f"{BASE_URL}/consultation/1" in bundle["errors"]
+        # Upward and foreign references are not followed
+        paths = [request.url.path for request in calls]
+        assert "/body/1" not in paths
+        assert "/invitation.pdf" not in paths
+        assert len(paths) == len(set(paths))
+
+    @pytest.mark.asyncio
+    async def test_expand_depth_and_fan_out(self):
+        """Test that depth and fan-out limit the followed references."""
+        client, calls = make_client()
+        expander = ReferenceExpander(client, load_schema(), BASE_URL, fan_out=1)
+
+        expansion = await expander.expand("/meeting/1", depth=1)
+
+        assert f"{BASE_URL}/person/1" in expansion.included
+        assert f"{BASE_URL}/person/2" not in expansion.included
+        assert f"{BASE_URL}/consultation/1" not in expansion.errors
+        collection = [r for r in calls if r.url.path == "/meeting/1/agendaItem"]
+        assert collection[0].url.params["limit"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_expand_embedded(self):
+        """Test embedding references without following cycles."""
+        client, _ = make_client()
+        schema = load_schema()
+        expander = ReferenceExpander(client, schema, BASE_URL)
+
+        embedded = (await expander.expand("/meeting/1", depth=2)).to_embedded(schema)
+
+        organization = embedded["organization"][0]
+        assert organization["member"][0]["name"] == "Jane Doe"
+        assert embedded["participant"][1] == f"{BASE_URL}/person/2"
+        agenda_item = embedded["agendaItem"][0]
+        assert agenda_item["meeting"] == f"{BASE_URL}/meeting/1"
+        assert "expansionErrors" in embedded
+        assert OBJECTS["/meeting/1"]["participant"][0] == f"{BASE_URL}/person/1"
+
+    @pytest.mark.asyncio
+    async def test_max_objects(self):
+        """Test that the number of fetched references is capped."""
+        client, calls = make_client()
+        expander = ReferenceExpander(client, load_schema(), BASE_URL, max_objects=2)
+
+        expansion = await expander.expand("/meeting/1", depth=2)
+
+        assert expansion.truncated
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_non_object_body(self):
+        """Test that a body that is not an object is returned unexpanded."""
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=["not", "an", "object"])
+            ),
+            base_url=BASE_URL,
+        )
+        schema = load_schema()
+        expander = ReferenceExpander(client, schema, BASE_URL)
+
+        expansion = await expander.expand("/meeting/1", depth=2)
+
+        assert expansion.object == ["not", "an", "object"]
+        assert expansion.included == {}
+        assert expansion.to_embedded(schema)["object"] == ["not", "an", "object"]
+
+
+class TestExpansionTools:
+    """Test cases for the expansion tool and resources."""
+
+    @pytest.mark.asyncio
+    async def test_expand_object_tool(self):
+        """Test expanding an object through MCP."""
+        client, _ = make_client()
+        mcp = FastMCP("test")
+        register_tools(mcp, client, OParlConfig(base_url=BASE_URL), None, load_schema())
+
+        async with Client(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "expand_object", {"path": f"{BASE_URL}/meeting/1", "mode": "embedded"}
+            )
+            too_deep = await mcp_client.call_tool(
+                "expand_object",
+                {"path": "/meeting/1", "depth": 5},
+                raise_on_error=False,
+            )
+
+        assert result.data["organization"][0]["id"] == f"{BASE_URL}/organization/1"
+        assert too_deep.is_error
+
+    @pytest.mark.asyncio
+    async def test_expanded_resource(self):
+        """Test reading the expanded variant of a templated resource."""
+        client, _ = make_client()
+        mcp = FastMCP("test")
+        register_tools(mcp, client, OParlConfig(base_url=BASE_URL), None, load_schema())
+
+        async with Client(mcp) as mcp_client:
+            templates = await mcp_client.list_resource_templates()
+            contents = await mcp_client.read_resource(
+                "resource://getMeeting/1/expanded"
+            )
+
+        assert "resource://getPaper/{paperId}/expanded" in [
+            template.uriTemplate for template in templates
+        ]
+        meeting = json.loads(contents[0].text)
+        assert meeting["participant"][0]["name"] == "Jane Doe"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,213 @@
+"""Tests for the compact reference graph."""
+
+import json
+from pathlib import Path
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.graph import EntityGraph
+from oparl_mcp.schema import OParlSchema
+from oparl_mcp.tools import register_graph
+
+BASE = "https://oparl.example.org"
+TYPE = "https://schema.oparl.org/1.1/"
+
+SPEC = json.loads(
+    (Path(__file__).parent.parent / "oparl_openapi.json").read_text(encoding="utf-8")
+)
+
+
+def meeting(n, organizations):
+    """Create a meeting of some organizations."""
+    return {
+        "id": f"{BASE}/meeting/{n}",
+        "type": f"{TYPE}Meeting",
+        "name": f"Meeting {n}",
+        "start": "2024-01-15T18:00:00+01:00",
+        "organization": [f"{BASE}/organization/{o}" for o in organizations],
+        "created": "2024-01-01T00:00:00+01:00",
+    }
+
+
+def paper(n, meetings):
+    """Create a paper with embedded consultations in some meetings."""
+    return {
+        "id": f"{BASE}/paper/{n}",
+        "type": f"{TYPE}Paper",
+        "name": f"Paper {n}",
+        "originatorPerson": [f"{BASE}/person/1"],
+        "consultation": [
+            {
+                "id": f"{BASE}/consultation/{n}-{m}",
+                "type": f"{TYPE}Consultation",
+                "meeting": f"{BASE}/meeting/{m}",
+                "role": "Beratung",
+            }
+            for m in meetings
+        ],
+    }
+
+
+@pytest.fixture
+def graph():
+    """Create a graph with meetings of two organizations and papers."""
+    graph = EntityGraph(OParlSchema.from_spec(SPEC))
+    graph.add_many(
+        [
+            meeting(1, [1]),
+            meeting(2, [1, 2]),
+            meeting(3, [2]),
+            paper(1, [1]),
+            paper(2, [2, 3]),
+            paper(3, [3]),
+            paper(4, []),
+        ]
+    )
+    return graph
+
+
+class TestEntityGraph:
+    """Test cases for EntityGraph."""
+
+    def test_records(self, graph):
+        """Test that objects become slotted records with interned URLs."""
+        record = graph.get(f"{BASE}/meeting/2")
+
+        assert type(record).__name__ == "Meeting"
+        assert not hasattr(record, "__dict__")
+        assert not hasattr(record, "created")
+        assert record.name == "Meeting 2"
+        assert graph.references(f"{BASE}/meeting/2", "organization") == [
+            f"{BASE}/organization/1",
+            f"{BASE}/organization/2",
+        ]
+        assert graph.node(f"{BASE}/organization/2") is not None
+        assert graph.get(f"{BASE}/organization/2") is None
+        assert graph.counts() == {"Meeting": 3, "Paper": 4, "Consultation": 4}
+
+    def test_embedded_objects(self, graph):
+        """Test that embedded objects get a reference back to their parent."""
+        consultation = f"{BASE}/consultation/2-3"
+
+        assert graph.summary(consultation) == {
+            "id": consultation,
+            "type": "Consultation",
+        }
+        assert graph.references(consultation, "paper") == [f"{BASE}/paper/2"]
+        assert graph.get(consultation).role == "Beratung"
+
+    def test_traverse(self, graph):
+        """Test following references forward and backward."""
+        papers = graph.traverse(
+            [f"{BASE}/organization/1"],
+            ["<-Meeting.organization", "<-Consultation.meeting", "paper"],
+        )
+        organizations = graph.traverse(
+            [f"{BASE}/paper/3"], ["consultation", "meeting", "organization"]
+        )
+
+        assert papers == [f"{BASE}/paper/1", f"{BASE}/paper/2"]
+        assert organizations == [f"{BASE}/organization/2"]
+        assert graph.traverse([f"{BASE}/unknown/1"], ["paper"]) == []
+
+    def test_updates_and_deletions(self, graph):
+        """Test that objects are replaced and removed."""
+        graph.add(meeting(1, [2]))
+        graph.add({**meeting(3, []), "deleted": True})
+
+        assert graph.traverse(
+            [f"{BASE}/organization/2"], ["<-Meeting.organization"]
+        ) == [f"{BASE}/meeting/1", f"{BASE}/meeting/2"]
+        assert graph.get(f"{BASE}/meeting/3") is None
+        assert len(graph) == 10
+
+    def test_reverse_index(self, graph):
+        """Test that references are indexed by target and relation."""
+        organization = f"{BASE}/organization/2"
+
+        assert graph.relations(organization) == {
+            "Meeting.organization": [f"{BASE}/meeting/2", f"{BASE}/meeting/3"]
+        }
+        assert graph.referrers(f"{BASE}/meeting/3", "Consultation.meeting") == [
+            f"{BASE}/consultation/2-3",
+            f"{BASE}/consultation/3-3",
+        ]
+
+        graph.add(meeting(2, [1]))
+        graph.add({**paper(3, [3]), "deleted": True})
+
+        assert graph.referrers(organization, "Meeting.organization") == [
+            f"{BASE}/meeting/3"
+        ]
+        assert graph.referrers(f"{BASE}/person/1", "Paper.originatorPerson") == [
+            f"{BASE}/paper/1",
+            f"{BASE}/paper/2",
+            f"{BASE}/paper/4",
+        ]
+        assert graph.relations(f"{BASE}/paper/3") == {
+            "Consultation.paper": [f"{BASE}/consultation/3-3"]
+        }
+
+    def test_invalid_steps(self, graph):
+        """Test errors for unknown fields and types."""
+        with pytest.raises(ValueError, match="Unknown reference field"):
+            graph.traverse([f"{BASE}/paper/1"], ["name"])
+        with pytest.raises(ValueError, match="reverse steps"):
+            graph.traverse([f"{BASE}/paper/1"], ["<-File.paper"])
+
+
+class TestTraverseTool:
+    """Test cases for the traverse_oparl tool."""
+
+    @pytest.mark.asyncio
+    async def test_tool(self, graph):
+        """Test that the tool resolves paths and summarizes results."""
+        mcp = FastMCP("test")
+        register_graph(mcp, OParlConfig(base_url=BASE), graph)
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "traverse_oparl",
+                {
+                    "start": "/organization/2",
+                    "path": ["<-Meeting.organization"],
+                    "limit": 1,
+                },
+            )
+
+        data = json.loads(result.content[0].text)
+        assert data["results"] == [
+            {"id": f"{BASE}/meeting/2", "type": "Meeting", "name": "Meeting 2"}
+        ]
+        assert data["count"] == 2
+        assert data["truncated"]
+
+
+class TestRelationResources:
+    """Test cases for the reverse relation resources."""
+
+    @pytest.mark.asyncio
+    async def test_resources(self, graph):
+        """Test reading the meetings a paper was consulted in."""
+        mcp = FastMCP("test")
+        register_graph(
+            mcp, OParlConfig(base_url=BASE), graph, OParlSchema.from_spec(SPEC)
+        )
+
+        async with Client(mcp) as client:
+            templates = [t.uriTemplate for t in await client.list_resource_templates()]
+            contents = await client.read_resource("resource://getPaper/2/consultedIn")
+
+        data = json.loads(contents[0].text)
+        assert "resource://getPerson/{personId}/papers" in templates
+        assert data["relation"] == "consultedIn"
+        assert [result["id"] for result in data["results"]] == [
+            f"{BASE}/meeting/2",
+            f"{BASE}/meeting/3",
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,243 @@
+"""Tests for the incremental harvester."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.harvester import CheckpointStore, Harvester
+from oparl_mcp.server import OParlMCPServer, main
+
+BASE_URL = "https://oparl.example.org"
+
+
+class MockOParl:
+    """Mock OParl API with one body whose objects carry ``modified`` stamps."""
+
+    def __init__(self, honor_filters: bool = True):
+        self.honor_filters = honor_filters
+        self.requests = []
+        self.objects = {
+            collection: [
+                {
+                    "id": f"{BASE_URL}/{collection}/{i}",
+                    "type": f"https://schema.oparl.org/1.1/{collection.title()}",
+                    "name": f"{collection} {i}",
+                    "modified": f"2024-01-0{i}T12:00:00+00:00",
+                }
+                for i in range(1, 4)
+            ]
+            for collection in ("organization", "person", "meeting", "paper")
+        }
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        parts = request.url.path.strip("/").split("/")
+        if parts == ["body"]:
+            items = [{"id": f"{BASE_URL}/body/1", "type": "Body"}]
+        else:
+            items = self.objects[parts[-1]]
+            since = request.url.params.get("modified_since")
+            if since and self.honor_filters:
+                items = [item for item in items if item["modified"] > since]
+        return httpx.Response(
+            200, json={"data": items, "pagination": {"hasNext": False}}
+        )
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handler), base_url=BASE_URL
+        )
+
+    def touch(self, collection: str, index: int, modified: str) -> None:
+        self.objects[collection][index]["modified"] = modified
+
+
+class TestCheckpointStore:
+    """Test cases for harvest checkpoints."""
+
+    def test_persistence(self, tmp_path):
+        """Test that checkpoints survive a restart."""
+        path = tmp_path / "state" / "harvest.json"
+        CheckpointStore(path).set("a", "2024-01-01T00:00:00+00:00")
+
+        assert CheckpointStore(path).get("a") == "2024-01-01T00:00:00+00:00"
+        assert not path.with_suffix(".json.tmp").exists()
+
+    def test_corrupt_file(self, tmp_path):
+        """Test that an unreadable checkpoint file starts a full harvest."""
+        path = tmp_path / "harvest.json"
+        path.write_text("not json")
+
+        assert CheckpointStore(path).as_dict() == {}
+
+
+class TestHarvester:
+    """Test cases for the harvester."""
+
+    @pytest.mark.asyncio
+    async def test_incremental_runs(self, tmp_path):
+        """Test that later runs only fetch objects changed since the last."""
+        api = MockOParl()
+        path = tmp_path / "harvest.json"
+        received = []
+        harvester = Harvester(
+            api.client(), CheckpointStore(path), on_objects=received.extend
+        )
+
+        first = await harvester.run_once()
+        assert first == {
+            "/body/1/organization": 3,
+            "/body/1/person": 3,
+            "/body/1/meeting": 3,
+            "/body/1/paper": 3,
+        }
+        assert len(received) == 12
+
+        api.touch("paper", 0, "2024-02-01T08:00:00+00:00")
+        api.requests.clear()
+        harvester = Harvester(api.client(), CheckpointStore(path))
+
+        second = await harvester.run_once()
+
+        assert second["/body/1/paper"] == 1
+        assert sum(second.values()) == 1
+        paper_request = next(r for r in api.requests if r.url.path.endswith("paper"))
+        assert paper_request.url.params["modified_since"] == (
+            "2024-01-03T12:00:00+00:00"
+        )
+        marks = json.loads(path.read_text())
+        assert marks[f"{BASE_URL}/body/1/paper"] == "2024-02-01T08:00:00+00:00"
+
+    @pytest.mark.asyncio
+    async def test_meeting_start_filter(self):
+        """Test that meeting lists are narrowed with the start filter."""
+        api = MockOParl()
+        harvester = Harvester(api.client(), bodies=["1"], meeting_lookback_days=30)
+
+        await harvester.run_once()
+        api.requests.clear()
+        await harvester.run_once()
+
+        params = {r.url.path: r.url.params for r in api.requests}
+        assert params["/body/1/meeting"]["start"] == "2023-12-04"
+        assert "start" not in params["/body/1/paper"]
+
+    @pytest.mark.asyncio
+    async def test_server_ignores_filters(self):
+        """Test that unchanged objects are skipped when filters are ignored."""
+        api = MockOParl(honor_filters=False)
+        harvester = Harvester(api.client(), bodies=["1"])
+
+        await harvester.run_once()
+        api.touch("person", 2, "2024-03-01T00:00:00Z")
+        report = await harvester.run_once()
+
+        assert report["/body/1/person"] == 1
+        assert sum(report.values()) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_collection(self):
+        """Test that a failing collection does not stop the harvest."""
+        api = MockOParl()
+        del api.objects["organization"]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("organization"):
+                return httpx.Response(500)
+            return api.handler(request)
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url=BASE_URL
+        )
+        report = await Harvester(client, bodies=["1"]).run_once()
+
+        assert "/body/1/organization" not in report
+        assert report["/body/1/paper"] == 3
+
+
+class TestHarvestCommand:
+    """Test cases for running the harvester from the server."""
+
+    def test_cli_feeds_store(self, tmp_path, monkeypatch, capsys):
+        """Test that the harvest subcommand persists objects and checkpoints."""
+        api = MockOParl()
+        monkeypatch.setenv("OPARL_BASE_URL", BASE_URL)
+        monkeypatch.setenv("OPARL_STORE_PATH", str(tmp_path / "objects.db"))
+
+        with patch(
+            "oparl_mcp.server.httpx.AsyncHTTPTransport",
+            side_effect=lambda **kwargs: httpx.MockTransport(api.handler),
+        ):
+            main(["harvest", "--body", "1"])
+
+        report = json.loads(capsys.readouterr().out)
+        assert report[f"{BASE_URL}/body/1/paper"] == 3
+        assert (tmp_path / "objects.db.harvest.json").exists()
+
+        server = OParlMCPServer(
+            OParlConfig(base_url=BASE_URL, store_path=str(tmp_path / "objects.db"))
+        )
+        assert server.store is not None
+        assert server.store.count() == 12
+        assert server.search_index is not None
+        assert len(server.search_index) == 6
+        assert server.analytics is not None
+        assert server.analytics.counts()["Paper"] == 3
+        assert server.graph is not None
+        assert server.graph.counts()["Paper"] == 3
+
+    @pytest.mark.asyncio
+    async def test_harvest_releases_transports(self):
+        """Test that closed harvester clients are no longer tracked."""
+        api = MockOParl()
+
+        with patch(
+            "oparl_mcp.server.httpx.AsyncHTTPTransport",
+            side_effect=lambda **kwargs: httpx.MockTransport(api.handler),
+        ):
+            server = OParlMCPServer(OParlConfig(base_url=BASE_URL))
+            transports = list(server._http_transports)
+            caching = list(server._caching_transports)
+
+            report = await server.harvest(bodies=["1"])
+
+        assert report[f"{BASE_URL}/body/1/paper"] == 3
+        assert server._http_transports == transports
+        assert server._caching_transports == caching
+        assert server._harvester_transports == {}
+
+    @pytest.mark.asyncio
+    async def test_background_task(self):
+        """Test that the server harvests while it is running."""
+        api = MockOParl()
+        config = OParlConfig(
+            base_url=BASE_URL, harvest_interval=3600, harvest_bodies=["1"]
+        )
+
+        with patch(
+            "oparl_mcp.server.httpx.AsyncHTTPTransport",
+            side_effect=lambda **kwargs: httpx.MockTransport(api.handler),
+        ):
+            server = OParlMCPServer(config)
+
+            async with Client(server.mcp):
+                for _ in range(100):
+                    if len(server.search_index or ()) == 6:
+                        break
+                    await asyncio.sleep(0.01)
+
+        assert {r.url.path for r in api.requests} >= {
+            "/body/1/meeting",
+            "/body/1/paper",
+        }
+        assert server.search_index is not None
+        assert len(server.search_index) == 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,185 @@
+"""Tests for server metrics."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.metrics import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    MetricsTransport,
+    RouteMatcher,
+    stats_collector,
+)
+from oparl_mcp.server import OParlMCPServer
+
+BASE_URL = "https://oparl.example.org"
+
+ROUTES = RouteMatcher(
+    ["/system", "/body/{bodyId}", "/body/{bodyId}/paper", "/paper/{paperId}"]
+)
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    """Answer every request with a small JSON object."""
+    if request.url.path.endswith("/missing"):
+        return httpx.Response(404, json={"error": "Not found"})
+    return httpx.Response(200, json={"id": str(request.url), "type": "Body"})
+
+
+class TestMetricTypes:
+    """Test cases for counters, histograms and rendering."""
+
+    def test_counter_render(self):
+        """Test rendering a labelled counter."""
+        counter = Counter("requests_total", "Requests.", ("route",))
+        counter.inc("/body")
+        counter.inc("/body", amount=2)
+
+        assert counter.render() == [
+            "# HELP requests_total Requests.",
+            "# TYPE requests_total counter",
+            'requests_total{route="/body"} 3',
+        ]
+
+    def test_histogram_buckets(self):
+        """Test that histogram buckets are cumulative and bounds inclusive."""
+        histogram = Histogram("duration", "Duration.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        lines = histogram.render()
+
+        assert 'duration_bucket{le="0.1"} 2' in lines
+        assert 'duration_bucket{le="1.0"} 3' in lines
+        assert 'duration_bucket{le="+Inf"} 4' in lines
+        assert "duration_count 4" in lines
+        assert "duration_sum 3.65" in lines
+
+    def test_collectors(self):
+        """Test values read from collectors when rendering."""
+        metrics = MetricsRegistry()
+        metrics.add_collector(
+            stats_collector(
+                "oparl_cache", "Cache.", lambda: {"hits": 4, "entries": 2}, ("entries",)
+            )
+        )
+
+        text = metrics.render()
+
+        assert "# TYPE oparl_cache_hits_total counter\noparl_cache_hits_total 4" in text
+        assert "# TYPE oparl_cache_entries gauge\noparl_cache_entries 2" in text
+
+    def test_route_matcher(self):
+        """Test mapping request paths to OpenAPI routes."""
+        assert ROUTES.match("/body/1") == "/body/{bodyId}"
+        assert ROUTES.match("/body/1/paper/") == "/body/{bodyId}/paper"
+        assert ROUTES.match("/paper/abc") == "/paper/{paperId}"
+        assert ROUTES.match("/file/1") == "other"
+
+
+class TestMetricsTransport:
+    """Test cases for upstream request metrics."""
+
+    @pytest.mark.asyncio
+    async def test_records_requests(self):
+        """Test latency, status, bytes and in-flight metrics per route."""
+        metrics = MetricsRegistry()
+        transport = MetricsTransport(
+            httpx.MockTransport(handler), metrics, ROUTES, base_path="/oparl"
+        )
+        client = httpx.AsyncClient(transport=transport, base_url=f"{BASE_URL}/oparl")
+
+        response = await client.get("/body/1")
+        await client.get("/body/2")
+        await client.get("/missing")
+
+        key = ("default", "/body/{bodyId}")
+        assert metrics.upstream_duration.values[key + ("GET",)][2] == 2
+        assert metrics.upstream_responses.values[key + ("200",)] == 2
+        assert metrics.upstream_responses.values[("default", "other", "404")] == 1
+        assert metrics.upstream_bytes.values[key] > len(response.content)
+        assert metrics.upstream_in_flight.values[("default",)] == 0
+
+    @pytest.mark.asyncio
+    async def test_records_errors(self):
+        """Test that transport errors are counted."""
+
+        def failing(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("unreachable", request=request)
+
+        metrics = MetricsRegistry()
+        client = httpx.AsyncClient(
+            transport=MetricsTransport(httpx.MockTransport(failing), metrics, ROUTES),
+            base_url=BASE_URL,
+        )
+
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/system")
+
+        assert metrics.upstream_errors.values == {
+            ("default", "/system", "ConnectError"): 1
+        }
+        assert metrics.upstream_in_flight.values[("default",)] == 0
+
+
+class TestServerMetrics:
+    """Test cases for metrics exposed by the server."""
+
+    def create_server(self) -> OParlMCPServer:
+        with patch(
+            "oparl_mcp.server.httpx.AsyncHTTPTransport",
+            return_value=httpx.MockTransport(handler),
+        ):
+            return OParlMCPServer(OParlConfig(base_url=BASE_URL))
+
+    @pytest.mark.asyncio
+    async def test_metrics_resource(self):
+        """Test reading metrics as an MCP resource."""
+        server = self.create_server()
+
+        async with Client(server.mcp) as client:
+            await client.read_resource("resource://getBody/1")
+            await client.read_resource("resource://getBody/1")
+            result = await client.read_resource("resource://metrics")
+
+        text = result[0].text
+        assert (
+            'oparl_upstream_responses_total{system="default",route="/body/{bodyId}",'
+            'status="200"} 1'
+        ) in text
+        assert "oparl_cache_hits_total 1" in text
+        assert (
+            'oparl_mcp_request_duration_seconds_count{method="resources/read"' in text
+        )
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        """Test the /metrics route of the HTTP app."""
+        server = self.create_server()
+        app = server.mcp.http_app()
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE oparl_upstream_request_duration_seconds histogram" in (
+            response.text
+        )
+
+    def test_metrics_disabled(self):
+        """Test that no metrics are collected when disabled."""
+        server = OParlMCPServer(OParlConfig(metrics_enabled=False))
+
+        assert server.metrics is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,118 @@
+"""Tests for OParl response normalization."""
+
+import copy
+
+import pytest
+
+from oparl_mcp.normalize import ResponseNormalizer
+from oparl_mcp.utils import format_oparl_response
+
+TYPE = "https://schema.oparl.org/1.1/"
+
+PAGE = {
+    "data": [
+        {
+            "id": "https://oparl.example.org/paper/1",
+            "type": f"{TYPE}Paper",
+            "date": "2024-01-15",
+            "modified": "2024-01-15T10:00:00Z",
+            "originatorPerson": ["https://oparl.example.org/person/1"],
+            "auxiliaryFile": [
+                {
+                    "id": "https://oparl.example.org/file/1",
+                    "type": f"{TYPE}File",
+                    "date": "2024-01-14",
+                    "created": "2024-01-14T09:00:00.5+01:00",
+                }
+            ],
+        },
+        {
+            "id": "https://oparl.example.org/paper/2",
+            "type": f"{TYPE}Paper",
+            "date": "2024-01-16",
+            "modified": "2024-01-16T10:00:00+01:00",
+        },
+    ],
+    "pagination": {"totalElements": 2},
+}
+
+
+class TestResponseNormalizer:
+    """Test cases for ResponseNormalizer."""
+
+    def test_nested_objects(self):
+        """Test that dates of items and nested objects are normalized."""
+        original = copy.deepcopy(PAGE)
+
+        result = ResponseNormalizer().normalize(PAGE, formatted_at="now")
+
+        first, second = result["data"]
+        assert first["modified"] == "2024-01-15T10:00:00+00:00"
+        assert first["date"] == "2024-01-15"
+        assert first["auxiliaryFile"][0]["created"] == (
+            "2024-01-14T09:00:00.500000+01:00"
+        )
+        assert result["_meta"]["formatted_at"] == "now"
+        assert "_meta" not in first
+        assert PAGE == original
+
+    def test_unchanged_objects_are_shared(self):
+        """Test that objects without changes are not copied."""
+        result = ResponseNormalizer().normalize(PAGE)
+
+        assert result is not PAGE
+        assert result["data"][1] is PAGE["data"][1]
+        assert result["data"][0]["originatorPerson"] is (
+            PAGE["data"][0]["originatorPerson"]
+        )
+
+    def test_unknown_fields(self):
+        """Test field name heuristics and invalid values."""
+        data = {
+            "type": "https://example.org/Custom",
+            "reviewDate": "2024-01-15T08:00:00Z",
+            "created": "yesterday",
+            "name": "2024-01-15T08:00:00Z",
+        }
+
+        result = ResponseNormalizer().normalize(data)
+
+        assert result["reviewDate"] == "2024-01-15T08:00:00+00:00"
+        assert result["created"] == "yesterday"
+        assert result["name"] == data["name"]
+
+    def test_field_becomes_container(self):
+        """Test that nested objects are found in a field first seen empty."""
+        normalizer = ResponseNormalizer()
+        normalizer.normalize({"type": f"{TYPE}Paper", "auxiliaryFile": None})
+        paper = {
+            "type": f"{TYPE}Paper",
+            "auxiliaryFile": [{"type": f"{TYPE}File", "date": "20240114"}],
+        }
+
+        result = normalizer.normalize(paper)
+
+        assert result["auxiliaryFile"][0]["date"] == "2024-01-14"
+
+    def test_custom_date_fields(self):
+        """Test using date fields other than the OParl 1.1 ones."""
+        obj = {"type": f"{TYPE}Paper", "date": "2024-01-15T18:00:00Z"}
+
+        result = ResponseNormalizer({"Paper": {"date": "date-time"}}).normalize(obj)
+
+        assert result["date"] == "2024-01-15T18:00:00+00:00"
+
+    def test_format_oparl_response(self):
+        """Test the format_oparl_response wrapper."""
+        data = {"id": "x", "modified": "2024-01-15T10:00:00Z"}
+
+        result = format_oparl_response(data)
+
+        assert result["modified"] == "2024-01-15T10:00:00+00:00"
+        assert result["_meta"]["source"] == "oparl-mcp-server"
+        assert "_meta" not in data
+        assert format_oparl_response([1, 2]) == [1, 2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
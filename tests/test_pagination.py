@@ -0,0 +1,254 @@
+"""Tests for the OParl pagination engine."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.pagination import (
+    PageFetcher,
+    collect_collection,
+    is_collection_path,
+    iter_pages,
+)
+from oparl_mcp.tools import register_tools, resolve_api_path
+
+BASE_URL = "https://oparl.example.org"
+
+
+def make_client(total: int = 25, page_size: int = 10, use_links: bool = False):
+    """Create a client for a mock collection of ``total`` papers."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        offset = int(request.url.params.get("offset", 0))
+        items = [
+            {"id": f"{BASE_URL}/paper/{i}", "type": "Paper", "name": f"Paper {i}"}
+            for i in range(offset, min(offset + page_size, total))
+        ]
+        body = {
+            "data": items,
+            "pagination": {
+                "totalElements": total,
+                "totalPages": -(-total // page_size),
+                "pageSize": page_size,
+                "hasNext": offset + page_size < total,
+            },
+        }
+        if use_links and offset + page_size < total:
+            next_offset = offset + page_size
+            body["links"] = {"next": f"{BASE_URL}/body/1/paper?offset={next_offset}"}
+        return httpx.Response(200, json=body)
+
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url=BASE_URL
+    )
+    return client, calls
+
+
+class TestPagination:
+    """Test cases for the pagination engine."""
+
+    def test_is_collection_path(self):
+        """Test recognition of collection endpoints."""
+        assert is_collection_path("/body")
+        assert is_collection_path("/body/1/paper")
+        assert is_collection_path("/meeting/5/agendaItem")
+        assert not is_collection_path("/paper/1")
+        assert not is_collection_path("/system")
+
+    @pytest.mark.asyncio
+    async def test_offset_pagination(self):
+        """Test walking pages with pagination.hasNext and offset."""
+        client, calls = make_client()
+
+        pages = [page async for page in iter_pages(client, "/body/1/paper")]
+
+        assert [len(page.items) for page in pages] == [10, 10, 5]
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_link_pagination(self):
+        """Test walking pages with links.next."""
+        client, calls = make_client(use_links=True)
+
+        result = await collect_collection(client, "/body/1/paper")
+
+        assert len(result.items) == 25
+        assert result.total == 25
+        assert not result.truncated
+        assert str(calls[1].url) == f"{BASE_URL}/body/1/paper?offset=10"
+
+    @pytest.mark.asyncio
+    async def test_foreign_next_link_is_not_followed(self):
+        """Test that next links to another origin end the walk."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(
+                200,
+                json={
+                    "data": [{"id": f"{BASE_URL}/paper/1", "type": "Paper"}],
+                    "links": {"next": "https://evil.example.com/body/1/paper"},
+                },
+            )
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            base_url=BASE_URL,
+            headers={"Authorization": "Bearer secret"},
+        )
+
+        pages = [page async for page in iter_pages(client, "/body/1/paper")]
+        fetched = [
+            page async for page in PageFetcher(client).iter_pages("/body/1/paper")
+        ]
+
+        assert len(pages) == len(fetched) == 1
+        assert {request.url.host for request in calls} == {"oparl.example.org"}
+
+    @pytest.mark.asyncio
+    async def test_item_budget_stops_early(self):
+        """Test that the item budget stops fetching further pages."""
+        client, calls = make_client()
+
+        result = await collect_collection(client, "/body/1/paper", max_items=12)
+
+        assert len(result.items) == 12
+        assert result.truncated
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_byte_budget(self):
+        """Test that the byte budget limits the collected JSON size."""
+        client, _ = make_client()
+
+        result = await collect_collection(client, "/body/1/paper", max_bytes=300)
+
+        size = sum(len(json.dumps(i, separators=(",", ":"))) for i in result.items)
+        assert size <= 300
+        assert result.truncated
+
+
+class TestPageFetcher:
+    """Test cases for concurrent page prefetching."""
+
+    @staticmethod
+    def make_slow_client(total: int = 100, page_size: int = 10):
+        """Create a client whose pages take a while and track concurrency."""
+        state = {"in_flight": 0, "max_in_flight": 0, "calls": 0}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            state["calls"] += 1
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            offset = int(request.url.params.get("offset", 0))
+            # Later pages answer faster to exercise in-order reassembly.
+            await asyncio.sleep(0.02 - offset / 10000)
+            state["in_flight"] -= 1
+            items = [
+                {"id": f"p{i}", "type": "Paper"}
+                for i in range(offset, min(offset + page_size, total))
+            ]
+            return httpx.Response(
+                200,
+                json={
+                    "data": items,
+                    "pagination": {
+                        "totalPages": -(-total // page_size),
+                        "pageSize": page_size,
+                        "hasNext": offset + page_size < total,
+                    },
+                },
+            )
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url=BASE_URL
+        )
+        return client, state
+
+    @pytest.mark.asyncio
+    async def test_pages_are_fetched_concurrently_in_order(self):
+        """Test that prefetched pages are reassembled in server order."""
+        client, state = self.make_slow_client()
+        fetcher = PageFetcher(client, prefetch=4, per_host_limit=8)
+
+        result = await collect_collection(client, "/body/1/paper", fetcher=fetcher)
+
+        assert [item["id"] for item in result.items] == [f"p{i}" for i in range(100)]
+        assert state["max_in_flight"] > 1
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        """Test that the per-host limit bounds concurrent requests."""
+        client, state = self.make_slow_client()
+        fetcher = PageFetcher(client, prefetch=8, per_host_limit=2)
+
+        result = await collect_collection(client, "/body/1/paper", fetcher=fetcher)
+
+        assert len(result.items) == 100
+        assert state["max_in_flight"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_budget_cancels_prefetches(self):
+        """Test that stopping early does not fetch the whole collection."""
+        client, state = self.make_slow_client()
+        fetcher = PageFetcher(client, prefetch=2)
+
+        result = await collect_collection(
+            client, "/body/1/paper", max_items=15, fetcher=fetcher
+        )
+
+        assert len(result.items) == 15
+        assert state["calls"] < 10
+
+
+class TestFetchCollectionTool:
+    """Test cases for the fetch_collection MCP tool."""
+
+    def test_resolve_api_path(self):
+        """Test turning URLs into API paths."""
+        base = "https://oparl.example.org/oparl/v1"
+
+        assert resolve_api_path("body/1/paper", base) == "/body/1/paper"
+        assert resolve_api_path(f"{base}/body/1/paper", base) == "/body/1/paper"
+        with pytest.raises(ValueError):
+            resolve_api_path("https://other.example.org/body", base)
+
+    @pytest.mark.asyncio
+    async def test_fetch_collection(self):
+        """Test fetching a full collection through MCP."""
+        client, _ = make_client()
+        mcp = FastMCP("test")
+        register_tools(mcp, client, OParlConfig(base_url=BASE_URL))
+
+        async with Client(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "fetch_collection", {"path": "/body/1/paper"}
+            )
+
+        assert result.data["count"] == 25
+        assert result.data["pages"] == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_collection_rejects_objects(self):
+        """Test that non-collection paths are rejected."""
+        client, _ = make_client()
+        mcp = FastMCP("test")
+        register_tools(mcp, client, OParlConfig(base_url=BASE_URL))
+
+        async with Client(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "fetch_collection", {"path": "/paper/1"}, raise_on_error=False
+            )
+
+        assert result.is_error
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,83 @@
+"""Tests for projecting OParl objects."""
+
+import copy
+
+import pytest
+
+from oparl_mcp.projection import project, project_all, validate_profile
+
+PAPER = {
+    "id": "https://oparl.example.org/paper/1",
+    "type": "https://schema.oparl.org/1.1/Paper",
+    "name": "Radweg Hauptstraße",
+    "reference": "2024/0815",
+    "created": "2024-01-01T10:00:00+01:00",
+    "modified": "2024-01-02T10:00:00+01:00",
+    "license": "https://creativecommons.org/licenses/by/4.0/",
+    "web": "https://ris.example.org/paper/1",
+    "deleted": False,
+    "keyword": [],
+    "subordinatePaper": None,
+    "originatorPerson": [f"https://oparl.example.org/person/{n}" for n in range(8)],
+    "mainFile": {
+        "id": "https://oparl.example.org/file/1",
+        "type": "https://schema.oparl.org/1.1/File",
+        "name": "Antrag",
+        "modified": "2024-01-02T10:00:00+01:00",
+    },
+}
+
+
+class TestProjection:
+    """Test cases for object projection."""
+
+    def test_standard_profile(self):
+        """Test dropping metadata and empty values and cutting arrays."""
+        original = copy.deepcopy(PAPER)
+
+        result = project(PAPER, "standard", max_items=3)
+
+        assert result["name"] == PAPER["name"]
+        for field in ("created", "modified", "license", "web", "deleted", "keyword"):
+            assert field not in result
+        assert "subordinatePaper" not in result
+        assert result["originatorPerson"] == PAPER["originatorPerson"][:3]
+        assert result["originatorPersonCount"] == 8
+        assert result["mainFile"] == {
+            "id": "https://oparl.example.org/file/1",
+            "type": "https://schema.oparl.org/1.1/File",
+            "name": "Antrag",
+        }
+        assert PAPER == original
+
+    def test_summary_profile(self):
+        """Test the summary profile."""
+        assert project(PAPER, "summary") == {
+            "id": PAPER["id"],
+            "type": PAPER["type"],
+            "summary": "Paper: Radweg Hauptstraße (ref: 2024/0815)",
+        }
+
+    def test_full_profile_and_fields(self):
+        """Test the full profile and explicit fields."""
+        assert project(PAPER, "full") is PAPER
+        assert project(PAPER, fields=["name", "unknown", "id"]) == {
+            "id": PAPER["id"],
+            "type": PAPER["type"],
+            "name": PAPER["name"],
+        }
+
+    def test_project_all(self):
+        """Test projecting lists and validating profile names."""
+        objects = [PAPER, PAPER]
+
+        assert project_all(objects, "full") is objects
+        assert [obj["summary"] for obj in project_all(objects, "summary")] == [
+            "Paper: Radweg Hauptstraße (ref: 2024/0815)"
+        ] * 2
+        with pytest.raises(ValueError):
+            validate_profile("tiny")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
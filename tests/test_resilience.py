@@ -0,0 +1,215 @@
+"""Tests for upstream rate limiting, retries and circuit breaking."""
+
+import time
+
+import httpx
+import pytest
+
+from oparl_mcp.cache import CachingTransport, ResponseCache
+from oparl_mcp.resilience import (
+    CircuitBreaker,
+    ResilientTransport,
+    TokenBucket,
+    UpstreamGuard,
+    UpstreamUnavailable,
+)
+
+BASE_URL = "https://oparl.example.org"
+
+
+def make_client(statuses, guard=None, cache=None):
+    """Create a client for a mock API answering with the given statuses.
+
+    Statuses are consumed in order; the last one is repeated. An exception
+    class in the list is raised instead of answering.
+    """
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        if isinstance(status, type):
+            raise status("upstream down", request=request)
+        headers = {"Retry-After": "0"} if status == 429 else {}
+        return httpx.Response(
+            status, json={"id": str(request.url), "call": len(calls)}, headers=headers
+        )
+
+    guard = guard or UpstreamGuard(rate_limit=None, backoff=0.001)
+    transport = ResilientTransport(httpx.MockTransport(handler), guard)
+    if cache is not None:
+        transport = CachingTransport(transport, cache=cache)
+    return httpx.AsyncClient(transport=transport, base_url=BASE_URL), calls, guard
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_rate(self):
+        """Test that requests beyond the burst wait for the rate."""
+        bucket = TokenBucket(rate=10.0, burst=2)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.01)
+        assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+    def test_aimd(self):
+        """Test multiplicative decrease on throttling and additive increase."""
+        bucket = TokenBucket(rate=8.0, burst=1, min_rate=1.0)
+
+        bucket.on_throttle(retry_after=0.5)
+        assert bucket.rate == 4.0
+        assert bucket.reserve() >= 0.45
+
+        for _ in range(100):
+            bucket.on_success()
+        assert bucket.rate == 8.0
+
+        for _ in range(10):
+            bucket.on_throttle()
+        assert bucket.rate == 1.0
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_open_probe_close(self):
+        """Test opening after failures and closing after a successful probe."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.is_open
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert not breaker.allow()  # Only one probe at a time
+        breaker.record_success()
+        assert not breaker.is_open
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=0.05)
+        for _ in range(5):
+            breaker.record_failure()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_failure()
+
+        assert not breaker.allow()
+
+
+class TestResilientTransport:
+    """Test cases for ResilientTransport."""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        """Test that throttled and unavailable responses are retried."""
+        client, calls, guard = make_client([429, 503, 200])
+
+        response = await client.get("/paper/1")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert guard.stats.as_dict() == {
+            "retries": 2,
+            "throttled": 1,
+            "failures": 1,
+            "rejected": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_attempts(self):
+        """Test that the last response is returned once attempts run out."""
+        client, calls, _ = make_client([503])
+
+        response = await client.get("/paper/1")
+
+        assert response.status_code == 503
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_transport_errors(self):
+        """Test retrying connection errors and raising the last one."""
+        client, calls, _ = make_client([httpx.ConnectError, 200])
+        assert (await client.get("/paper/1")).status_code == 200
+
+        client, calls, _ = make_client([httpx.ConnectError])
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/paper/1")
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_no_retry_for_post(self):
+        """Test that non-idempotent requests are sent once."""
+        client, calls, _ = make_client([503])
+
+        response = await client.post("/paper/1")
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline(self):
+        """Test that retries stop at the deadline."""
+        guard = UpstreamGuard(rate_limit=None, backoff=10.0, deadline=0.5)
+        client, calls, _ = make_client([503], guard=guard)
+
+        start = time.monotonic()
+        response = await client.get("/paper/1")
+
+        assert response.status_code == 503
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_circuit_open(self):
+        """Test that an open circuit rejects requests without sending them."""
+        guard = UpstreamGuard(
+            rate_limit=None, max_attempts=1, failure_threshold=2, reset_timeout=60
+        )
+        client, calls, _ = make_client([500], guard=guard)
+
+        await client.get("/paper/1")
+        await client.get("/paper/2")
+        with pytest.raises(UpstreamUnavailable):
+            await client.get("/paper/3")
+
+        assert len(calls) == 2
+        assert guard.stats.rejected == 1
+        metrics = {
+            (name, labels["host"]): value
+            for name, _, _, labels, value in guard.collect()
+        }
+        assert metrics[("oparl_upstream_circuit_open", "oparl.example.org")] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_while_open(self):
+        """Test that the cache serves stale entries while the circuit is open."""
+        guard = UpstreamGuard(
+            rate_limit=None, max_attempts=1, failure_threshold=1, reset_timeout=60
+        )
+        cache = ResponseCache(default_ttl=0)
+        client, calls, _ = make_client([200, 500], guard=guard, cache=cache)
+
+        first = await client.get("/paper/1")
+        failed = await client.get("/paper/1")
+        rejected = await client.get("/paper/1")
+
+        assert failed.json() == first.json()
+        assert rejected.json() == first.json()
+        assert "stale" in rejected.headers["warning"].lower()
+        assert len(calls) == 2
+        assert cache.stats.stale == 2
+
+        with pytest.raises(UpstreamUnavailable):
+            await client.get("/paper/2")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,192 @@
+"""Tests for the local OParl search index."""
+
+import time
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.search import SearchIndex
+from oparl_mcp.tools import register_tools
+
+BASE_URL = "https://oparl.example.org"
+
+
+def paper(i, name, date="2024-01-15", paper_type="Antrag", body="1"):
+    """Build a Paper object."""
+    return {
+        "id": f"{BASE_URL}/paper/{i}",
+        "type": "https://schema.oparl.org/1.1/Paper",
+        "body": f"{BASE_URL}/body/{body}",
+        "name": name,
+        "reference": f"V-{i}",
+        "date": date,
+        "paperType": paper_type,
+    }
+
+
+class TestSearchIndex:
+    """Test cases for SearchIndex."""
+
+    def test_ranking(self):
+        """Test that documents matching more query terms rank first."""
+        index = SearchIndex()
+        index.add_many(
+            [
+                paper(1, "Radweg an der Hauptstraße"),
+                paper(2, "Sanierung Hauptstraße"),
+                paper(3, "Haushalt 2024"),
+                {
+                    "id": f"{BASE_URL}/meeting/1",
+                    "type": "Meeting",
+                    "name": "Verkehrsausschuss Radweg",
+                    "start": "2024-02-01T17:00:00+01:00",
+                },
+            ]
+        )
+
+        hits = index.search("radweg hauptstraße")
+
+        assert hits[0].url == f"{BASE_URL}/paper/1"
+        assert {hit.url for hit in hits} == {
+            f"{BASE_URL}/paper/1",
+            f"{BASE_URL}/paper/2",
+            f"{BASE_URL}/meeting/1",
+        }
+
+    def test_filters(self):
+        """Test type, date and body filters."""
+        index = SearchIndex()
+        index.add_many(
+            [
+                paper(1, "Radweg", date="2023-05-01"),
+                paper(2, "Radweg", date="2024-05-01"),
+                paper(3, "Radweg", date="2024-06-01", body="2"),
+                {"id": f"{BASE_URL}/meeting/1", "type": "Meeting", "name": "Radweg"},
+            ]
+        )
+
+        hits = index.search(
+            "radweg", types=["Paper"], start_date="2024-01-01", body="1"
+        )
+
+        assert [hit.url for hit in hits] == [f"{BASE_URL}/paper/2"]
+        assert index.has_documents(["Paper"], body="2")
+        assert not index.has_documents(["Paper"], body="3")
+        assert not index.has_documents(url_prefix="https://other.example.org")
+
+    def test_reindexing_replaces_document(self):
+        """Test that adding an object again replaces the old version."""
+        index = SearchIndex()
+        index.add(paper(1, "Radweg"))
+        index.add(paper(1, "Spielplatz"))
+
+        assert index.search("radweg") == []
+        assert len(index.search("spielplatz")) == 1
+        assert index.count(["Paper"]) == 1
+
+    def test_deleted_objects_are_removed(self):
+        """Test that an object marked deleted is dropped from the index."""
+        index = SearchIndex()
+        index.add_many([paper(1, "Radweg"), paper(2, "Radweg Hauptstraße")])
+        index.add({**paper(1, "Radweg"), "deleted": True})
+
+        assert [hit.url for hit in index.search("radweg")] == [f"{BASE_URL}/paper/2"]
+        assert index.count(["Paper"]) == 1
+
+    def test_query_speed(self):
+        """Test that queries over a large index stay fast."""
+        index = SearchIndex()
+        index.add_many(
+            paper(i, f"Antrag {i % 500} Straße Nummer {i}") for i in range(20000)
+        )
+
+        start = time.perf_counter()
+        hits = index.search("antrag 42", limit=10)
+        elapsed = time.perf_counter() - start
+
+        assert hits
+        assert elapsed < 0.1
+
+
+class TestSearchTool:
+    """Test cases for the search_oparl MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_upstream_when_cold(self):
+        """Test that a cold index searches through the upstream API."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"data": [paper(1, "Radweg")]})
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url=BASE_URL
+        )
+        mcp = FastMCP("test")
+        register_tools(mcp, client, OParlConfig(base_url=BASE_URL), SearchIndex())
+
+        async with Client(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "search_oparl", {"query": "Radweg", "body_id": "1"}
+            )
+
+        assert result.data["source"] == "upstream"
+        assert requests[0].url.params["search"] == "Radweg"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_for_unindexed_body(self):
+        """Test that the fallback is scoped to the body and applies dates."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(
+                200,
+                json={
+                    "data": [
+                        paper(1, "Radweg", date="2023-05-01", body="2 a"),
+                        paper(2, "Radweg", date="2024-05-01", body="2 a"),
+                    ]
+                },
+            )
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url=BASE_URL
+        )
+        index = SearchIndex()
+        index.add(paper(3, "Radweg"))
+        mcp = FastMCP("test")
+        register_tools(mcp, client, OParlConfig(base_url=BASE_URL), index)
+
+        async with Client(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "search_oparl",
+                {"query": "Radweg", "body_id": "2 a", "start_date": "2024-01-01"},
+            )
+
+        assert result.data["source"] == "upstream"
+        assert requests[0].url.raw_path.startswith(b"/body/2%20a/paper")
+        assert [item["id"] for item in result.data["results"]] == [
+            f"{BASE_URL}/paper/2"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_uses_warm_index(self):
+        """Test that a warm index answers without upstream requests."""
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+            base_url=BASE_URL,
+        )
+        index = SearchIndex()
+        index.add(paper(1, "Radweg"))
+        mcp = FastMCP("test")
+        register_tools(mcp, client, OParlConfig(base_url=BASE_URL), index)
+
+        async with Client(mcp) as mcp_client:
+            result = await mcp_client.call_tool("search_oparl", {"query": "radweg"})
+
+        assert result.data["source"] == "index"
+        assert result.data["results"][0]["reference"] == "V-1"
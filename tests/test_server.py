@@ -1,16 +1,19 @@
 """Tests for OParl MCP Server."""
 
 # Add the src directory to the Python path
+import json
 import sys
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
+from fastmcp import Client
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from oparl_mcp.config import OParlConfig
-from oparl_mcp.server import OParlMCPServer
+from oparl_mcp.server import OParlMCPServer, main
 
 
 class TestOParlMCPServer:
@@ -86,6 +89,94 @@ class TestOParlMCPServer:
             assert len(route_maps) >= 4  # Should have at least 4 route maps
             assert all(hasattr(route_map, "mcp_type") for route_map in route_maps)
 
+    def test_http_client_pool_settings(self):
+        """Test that pool and timeout settings reach the HTTP client."""
+        config = OParlConfig(
+            timeout=30.0,
+            connect_timeout=5.0,
+            pool_timeout=1.0,
+            max_connections=42,
+            max_keepalive_connections=7,
+            cache_enabled=False,
+            coalesce_requests=False,
+            metrics_enabled=False,
+            rate_limit=None,
+            retry_max_attempts=1,
+            circuit_failure_threshold=0,
+        )
+
+        with patch("oparl_mcp.server.FastMCP") as mock_fastmcp:
+            mock_fastmcp.from_openapi.return_value = Mock()
+
+            server = OParlMCPServer(config)
+            client = server._create_http_client()
+
+            assert client.timeout.connect == 5.0
+            assert client.timeout.read == 30.0
+            assert client.timeout.pool == 1.0
+            pool = client._transport._pool
+            assert pool._max_connections == 42
+            assert pool._max_keepalive_connections == 7
+
+    def test_invalid_system_namespace(self):
+        """Test that system namespaces must be URI-safe."""
+        config = OParlConfig(systems={"bad name": "https://oparl.example.org"})
+
+        with pytest.raises(ValueError, match="namespace"):
+            OParlMCPServer(config)
+
+    @pytest.mark.asyncio
+    async def test_federated_systems(self):
+        """Test serving several OParl systems from one server."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200, json={"host": request.url.host, "path": request.url.path}
+            )
+
+        config = OParlConfig(
+            base_url="https://main.example.org",
+            systems={"koeln": "https://koeln.example.org"},
+        )
+
+        with patch(
+            "oparl_mcp.server.httpx.AsyncHTTPTransport",
+            return_value=httpx.MockTransport(handler),
+        ):
+            server = OParlMCPServer(config)
+
+        async with Client(server.mcp) as client:
+            templates = [t.uriTemplate for t in await client.list_resource_templates()]
+            main = await client.read_resource("resource://getBody/1")
+            koeln = await client.read_resource("resource://koeln/getBody/1")
+            tools = [tool.name for tool in await client.list_tools()]
+
+        assert "resource://koeln/getPaper/{paperId}" in templates
+        assert json.loads(main[0].text)["host"] == "main.example.org"
+        assert json.loads(koeln[0].text) == {
+            "host": "koeln.example.org",
+            "path": "/body/1",
+        }
+        assert "koeln_fetch_collection" in tools
+        assert server.get_server_info()["systems"] == config.systems
+
+    def test_check_command(self, capsys):
+        """Test that the check command initializes the server without running it."""
+        with patch.object(OParlMCPServer, "run") as mock_run:
+            main(["check"])
+
+        assert "initialized successfully" in capsys.readouterr().out
+        mock_run.assert_not_called()
+
+    def test_shared_ssl_context(self):
+        """Test that all clients share one SSL context."""
+        config = OParlConfig(systems={"koeln": "https://koeln.example.org"})
+
+        with patch("oparl_mcp.server.httpx.create_ssl_context") as mock_context:
+            OParlMCPServer(config)
+
+        mock_context.assert_called_once()
+
     def test_run_without_initialization(self):
         """Test running server without proper initialization."""
         server = OParlMCPServer.__new__(OParlMCPServer)
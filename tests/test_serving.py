@@ -0,0 +1,156 @@
+"""Tests for serving the MCP server over HTTP."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from starlette.testclient import TestClient
+
+from oparl_mcp.config import OParlConfig
+from oparl_mcp.server import OParlMCPServer
+from oparl_mcp.serving import (
+    DrainingTransport,
+    InFlightTracker,
+    validate_transport,
+    worker_config,
+)
+
+MCP_HEADERS = {"accept": "application/json, text/event-stream"}
+
+
+class TestTransportSettings:
+    """Test cases for transport and worker settings."""
+
+    def test_validate_transport(self):
+        """Test rejecting unknown transports and stateful multi-worker setups."""
+        validate_transport(OParlConfig(transport="http", workers=4))
+
+        with pytest.raises(ValueError, match="Unknown transport"):
+            validate_transport(OParlConfig(transport="websocket"))
+        with pytest.raises(ValueError, match="http transport"):
+            validate_transport(OParlConfig(transport="sse", workers=2))
+        with pytest.raises(ValueError, match="at least 1"):
+            validate_transport(OParlConfig(transport="http", workers=0))
+
+    def test_worker_config(self):
+        """Test that upstream budgets are split between workers."""
+        config = OParlConfig(
+            transport="http",
+            workers=4,
+            rate_limit=50.0,
+            rate_limit_burst=20,
+            max_connections=100,
+            max_keepalive_connections=20,
+            harvest_interval=600.0,
+        )
+
+        worker = worker_config(config)
+
+        assert worker.rate_limit == 12.5
+        assert worker.rate_limit_burst == 5
+        assert worker.max_connections == 25
+        assert worker.max_keepalive_connections == 5
+        assert worker.harvest_interval is None
+        assert worker_config(OParlConfig()) == OParlConfig()
+
+
+class TestDraining:
+    """Test cases for waiting on in-flight upstream requests."""
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_requests(self):
+        """Test that drain returns once in-flight requests have finished."""
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await release.wait()
+            return httpx.Response(200, json={})
+
+        tracker = InFlightTracker()
+        transport = DrainingTransport(httpx.MockTransport(handler), tracker)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="https://oparl.example.org"
+        ) as client:
+            request = asyncio.create_task(client.get("/body/1"))
+            await asyncio.sleep(0.01)
+
+            assert tracker.count == 1
+            assert not await tracker.drain(timeout=0.05)
+            release.set()
+            assert await tracker.drain(timeout=1.0)
+            assert (await request).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_cache_refreshes(self):
+        """Test that the server drains background refreshes before closing."""
+        server = OParlMCPServer(OParlConfig())
+        release = asyncio.Event()
+
+        async def refresh():
+            await release.wait()
+
+        assert server.refresher.schedule("key", refresh)
+        await asyncio.sleep(0.01)
+
+        assert not await server.drain(timeout=0.05)
+        release.set()
+        assert await server.drain(timeout=1.0)
+        assert server.refresher.stats.completed == 1
+        await server.refresher.aclose()
+
+
+class TestHTTPApp:
+    """Test cases for the HTTP application."""
+
+    def test_stateless_http_app(self):
+        """Test serving MCP requests without sessions to several workers."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"path": request.url.path})
+
+        config = OParlConfig(transport="http", workers=2, http_path="/mcp")
+        with patch(
+            "oparl_mcp.server.httpx.AsyncHTTPTransport",
+            return_value=httpx.MockTransport(handler),
+        ):
+            server = OParlMCPServer(worker_config(config))
+
+        with TestClient(server.http_app()) as client:
+            response = client.post(
+                "/mcp",
+                headers=MCP_HEADERS,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "resources/read",
+                    "params": {"uri": "resource://getBody/1"},
+                },
+            )
+            metrics = client.get("/metrics")
+
+        data = response.text.split("data: ", 1)[1]
+        contents = json.loads(data)["result"]["contents"]
+        assert json.loads(contents[0]["text"]) == {"path": "/body/1"}
+        assert "oparl_upstream_responses_total" in metrics.text
+        assert server.in_flight.count == 0
+
+    def test_run_with_workers(self):
+        """Test that several workers are started through the app factory."""
+        config = OParlConfig(transport="http", workers=3, port=9000)
+        server = OParlMCPServer(config)
+
+        with patch("uvicorn.run") as mock_run:
+            server.run()
+
+        args, kwargs = mock_run.call_args
+        assert args == ("oparl_mcp.server:create_app",)
+        assert kwargs["factory"] is True
+        assert kwargs["workers"] == 3
+        assert kwargs["port"] == 9000
+        assert kwargs["timeout_graceful_shutdown"] == config.shutdown_timeout
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
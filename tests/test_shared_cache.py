@@ -0,0 +1,152 @@
+"""Tests for the response cache shared between processes."""
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from oparl_mcp.cache import CacheEntry, CachingTransport
+from oparl_mcp.shared_cache import SharedResponseCache
+
+
+def make_entry(content: bytes, ttl: float = 60.0) -> CacheEntry:
+    """Create a cache entry expiring after the given TTL."""
+    now = time.monotonic()
+    return CacheEntry(
+        status_code=200,
+        headers=[("content-type", "application/json"), ("etag", '"v1"')],
+        content=content,
+        stored_at=now,
+        expires_at=now + ttl,
+        etag='"v1"',
+    )
+
+
+class TestSharedResponseCache:
+    """Test cases for SharedResponseCache."""
+
+    def test_entries_are_shared(self, tmp_path):
+        """Test that entries stored by one process are read by another."""
+        path = str(tmp_path / "cache.sqlite3")
+        first = SharedResponseCache(path=path)
+        second = SharedResponseCache(path=path)
+
+        first.set("a", make_entry(b'{"id": 1}'))
+        entry = second.get("a")
+
+        assert entry is not None
+        assert entry.content == b'{"id": 1}'
+        assert entry.headers == [
+            ("content-type", "application/json"),
+            ("etag", '"v1"'),
+        ]
+        assert entry.etag == '"v1"'
+        assert 59.0 < entry.expires_at - time.monotonic() <= 60.0
+        assert second.get("a") is entry  # Served from memory
+        assert second.stats.hits == 2
+        assert len(second) == 1
+
+    def test_expired_entries(self, tmp_path):
+        """Test that expired entries are misses but can still be revalidated."""
+        cache = SharedResponseCache(path=str(tmp_path / "cache.sqlite3"))
+
+        cache.set("a", make_entry(b"{}", ttl=-1.0))
+
+        assert cache.get("a") is None
+        assert cache.peek("a") is not None
+        assert cache.stats.misses == 1
+
+    def test_newer_entry_replaces_expired_local_entry(self, tmp_path):
+        """Test that an entry refreshed by another process is picked up."""
+        path = str(tmp_path / "cache.sqlite3")
+        first = SharedResponseCache(path=path)
+        second = SharedResponseCache(path=path)
+
+        first.set("a", make_entry(b"old", ttl=-1.0))
+        assert first.peek("a").content == b"old"
+        second.set("a", make_entry(b"new"))
+
+        assert first.get("a").content == b"new"
+
+    def test_eviction(self, tmp_path):
+        """Test that the least recently stored entries are evicted first."""
+        cache = SharedResponseCache(
+            path=str(tmp_path / "cache.sqlite3"), max_entries=10
+        )
+        for i in range(20):
+            cache.set(str(i), make_entry(b"x" * 10))
+
+        cache.evict()
+
+        assert len(cache) == 9
+        assert cache.current_bytes == 9 * make_entry(b"x" * 10).size
+        assert cache.peek("19") is not None
+        assert SharedResponseCache(path=cache.path).peek("0") is None
+        assert cache.stats.evictions == 11
+        assert cache.usage() == {"entries": 9, "bytes": cache.current_bytes}
+
+    def test_usage_tracks_writes(self, tmp_path):
+        """Test that the entry count and size follow replacements and deletes."""
+        cache = SharedResponseCache(path=str(tmp_path / "cache.sqlite3"))
+        cache.set("a", make_entry(b"x"))
+        cache.set("b", make_entry(b"x"))
+        cache.set("a", make_entry(b"x" * 100))
+        cache.delete("b")
+
+        assert cache.usage() == {"entries": len(cache), "bytes": cache.current_bytes}
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_methods_use_worker_threads(self, tmp_path, monkeypatch):
+        """Test that the shared file is only queried off the event loop."""
+        path = str(tmp_path / "cache.sqlite3")
+        first = SharedResponseCache(path=path)
+        second = SharedResponseCache(path=path)
+        threads = []
+        for cache in (first, second):
+            for name in ("_load", "_store"):
+                method = getattr(cache, name)
+
+                def record(*args, method=method):
+                    threads.append(threading.get_ident())
+                    return method(*args)
+
+                monkeypatch.setattr(cache, name, record)
+
+        await first.aset("a", make_entry(b"{}"))
+        entry = await second.aget("a")
+
+        assert entry is not None
+        assert await second.aget("a") is entry  # Served from memory
+        assert await second.apeek("b") is None
+        assert len(threads) == 3
+        assert threading.get_ident() not in threads
+        assert second.stats.hits == 2
+
+    @pytest.mark.asyncio
+    async def test_caching_transports_share_hits(self, tmp_path):
+        """Test that a response fetched by one worker is a hit for another."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"id": str(request.url)})
+
+        path = str(tmp_path / "cache.sqlite3")
+        responses = []
+        for _ in range(2):
+            transport = CachingTransport(
+                httpx.MockTransport(handler), cache=SharedResponseCache(path=path)
+            )
+            async with httpx.AsyncClient(
+                transport=transport, base_url="https://oparl.example.org"
+            ) as client:
+                responses.append(await client.get("/paper/1"))
+
+        assert len(calls) == 1
+        assert responses[0].json() == responses[1].json()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,127 @@
+"""Tests for the persistent OParl object store."""
+
+import httpx
+import pytest
+
+from oparl_mcp.cache import CachingTransport, ResponseCache
+from oparl_mcp.store import ObjectStore
+
+PAPER = {
+    "id": "https://oparl.example.org/paper/1",
+    "type": "https://schema.oparl.org/1.1/Paper",
+    "name": "Antrag",
+    "modified": "2024-03-05T08:30:00Z",
+}
+
+
+def store_size(path):
+    """Get the size of the objects in a store file."""
+    store = ObjectStore(path)
+    size = store.size()
+    store.close()
+    return size
+
+
+class TestObjectStore:
+    """Test cases for ObjectStore."""
+
+    def test_put_and_get(self, tmp_path):
+        """Test storing and loading an object by its URL."""
+        store = ObjectStore(tmp_path / "store.sqlite3")
+
+        assert store.put(PAPER)
+        stored = store.get(PAPER["id"])
+
+        assert stored is not None
+        assert stored.type == "Paper"
+        assert stored.modified == PAPER["modified"]
+        assert b"Antrag" in stored.data
+        assert store.get("https://oparl.example.org/paper/2") is None
+
+    def test_ignores_unsupported_objects(self, tmp_path):
+        """Test that objects without id or of other types are skipped."""
+        store = ObjectStore(tmp_path / "store.sqlite3")
+
+        written = store.put_many(
+            [
+                {"type": "https://schema.oparl.org/1.1/Paper"},
+                {"id": "https://oparl.example.org/file/1", "type": "File"},
+            ]
+        )
+
+        assert written == 0
+        assert store.count() == 0
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """Test that compaction keeps the store below its size cap."""
+        store = ObjectStore(tmp_path / "store.sqlite3", max_bytes=2000)
+
+        for i in range(20):
+            store.put({**PAPER, "id": f"{PAPER['id']}{i}", "name": "x" * 200})
+
+        assert store.size() <= 2000
+        assert store.get(f"{PAPER['id']}19") is not None
+        assert store.get(f"{PAPER['id']}0") is None
+
+    def test_size_cap_counts_existing_objects(self, tmp_path):
+        """Test that a reopened store enforces its cap on earlier objects."""
+        path = tmp_path / "store.sqlite3"
+        first = ObjectStore(path)
+        for i in range(10):
+            first.put({**PAPER, "id": f"{PAPER['id']}{i}", "name": "x" * 200})
+        first.close()
+
+        store = ObjectStore(path, max_bytes=store_size(path))
+        store.put({**PAPER, "id": f"{PAPER['id']}10", "name": "x" * 200})
+
+        assert store.size() <= store.max_bytes
+        assert store.get(f"{PAPER['id']}0") is None
+
+    def test_stats_track_writes(self, tmp_path):
+        """Test that the object count and size follow replacements and deletes."""
+        store = ObjectStore(tmp_path / "store.sqlite3")
+        store.put_many([PAPER, {**PAPER, "id": f"{PAPER['id']}0"}])
+        store.put({**PAPER, "name": "x" * 200})
+        store.delete(f"{PAPER['id']}0")
+
+        stats = store.stats()
+
+        assert stats["objects"] == store.count() == 1
+        assert stats["bytes"] == store.size()
+        assert stats["writes"] == 3
+
+    def test_shared_between_connections(self, tmp_path):
+        """Test that a second process-level connection sees written objects."""
+        path = tmp_path / "store.sqlite3"
+        writer = ObjectStore(path)
+        reader = ObjectStore(path)
+
+        writer.put(PAPER)
+
+        assert reader.get(PAPER["id"]) is not None
+
+
+class TestStoreTransport:
+    """Test cases for the object store behind the caching transport."""
+
+    @pytest.mark.asyncio
+    async def test_warm_restart_serves_from_store(self, tmp_path):
+        """Test that a new transport serves objects fetched by a previous one."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json=PAPER)
+
+        path = tmp_path / "store.sqlite3"
+        for _ in range(2):
+            transport = CachingTransport(
+                httpx.MockTransport(handler),
+                cache=ResponseCache(),
+                store=ObjectStore(path),
+            )
+            async with httpx.AsyncClient(transport=transport) as client:
+                response = await client.get(PAPER["id"])
+                assert response.json()["name"] == "Antrag"
+
+        assert len(calls) == 1